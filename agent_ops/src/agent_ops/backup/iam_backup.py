@@ -4,11 +4,10 @@ load_env()
 
 import json
 import os
-import requests
+import httpx
 from datetime import datetime
 from integrator.iam.iam_db_model import Agent, User, Role, RoleDomain, RoleUser, RoleAgent, UserAgent, AuthProvider, Tenant, AgentProfile
 from integrator.iam.iam_keycloak_crud import get_admin_token, get_user, get_client, KC_CONFIG
-import requests
 from integrator.utils.db import get_db_cm
 from integrator.utils.logger import get_logger
 from sqlalchemy import select
@@ -148,7 +147,7 @@ def backup_keycloak_clients(kc_config, backup_dir):
                 try:
                     # Get all clients for this realm
                     clients_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/clients'
-                    clients_resp = requests.get(clients_url, headers=headers)
+                    clients_resp = httpx.get(clients_url, headers=headers)
                     
                     if clients_resp.status_code == 200:
                         all_clients = clients_resp.json()
@@ -163,7 +162,7 @@ def backup_keycloak_clients(kc_config, backup_dir):
                                 try:
                                     client_uuid = client["id"]
                                     mappers_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/clients/{client_uuid}/protocol-mappers/models'
-                                    mappers_resp = requests.get(mappers_url, headers=headers)
+                                    mappers_resp = httpx.get(mappers_url, headers=headers)
                                     
                                     if mappers_resp.status_code == 200:
                                         mappers_data = mappers_resp.json()
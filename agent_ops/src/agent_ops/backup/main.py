@@ -4,7 +4,6 @@ load_env()
 
 import json
 import os
-import requests
 from datetime import datetime
 from integrator.utils.logger import get_logger
 
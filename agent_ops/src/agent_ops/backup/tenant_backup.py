@@ -4,7 +4,6 @@ load_env()
 
 import json
 import os
-import requests
 from datetime import datetime
 from integrator.iam.iam_db_model import Tenant
 from integrator.iam.iam_keycloak_crud import get_admin_token, get_realm, KC_CONFIG
@@ -15,6 +15,7 @@ logger = get_logger(__name__)
 
 SQL_STATEMENTS = """
 CREATE EXTENSION IF NOT EXISTS vector;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- 1. Domain tables for dynamic, hierarchical, LLM-driven domains
 CREATE TABLE IF NOT EXISTS domains (
@@ -51,6 +52,11 @@ CREATE TABLE IF NOT EXISTS capabilities (
 -- Vector indexes
 CREATE INDEX IF NOT EXISTS cap_emb_ivf  ON capabilities        USING ivfflat (emb vector_cosine_ops) WITH (lists=100);
 
+-- Trigram indexes for ILIKE substring search on capabilities
+CREATE INDEX IF NOT EXISTS capabilities_label_trgm       ON capabilities USING gin (label gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS capabilities_description_trgm ON capabilities USING gin (description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS capabilities_outcome_trgm     ON capabilities USING gin (outcome gin_trgm_ops);
+
 
 -- 4. Relationship between Domain and Capability
 
@@ -96,6 +96,13 @@ CREATE TABLE IF NOT EXISTS roles (
 
 CREATE INDEX IF NOT EXISTS idx_roles_tenant_name ON roles(tenant_name);
 
+-- Embedding cache keyed by blake2b(model, input text)
+CREATE TABLE IF NOT EXISTS emb_cache (
+    hash BYTEA PRIMARY KEY,
+    emb vector(1536) NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now()
+);
+
 
 -- Relationship tables (fixed schema)
 CREATE TABLE IF NOT EXISTS role_domain (
@@ -119,6 +126,7 @@ CREATE TABLE IF NOT EXISTS role_user (
 );
 
 CREATE INDEX IF NOT EXISTS idx_role_user_tenant_name ON role_user(tenant_name);
+CREATE INDEX IF NOT EXISTS idx_role_user_username_tenant ON role_user(username, tenant_name);
 
 CREATE TABLE IF NOT EXISTS role_agent (
     role_name VARCHAR(255) NOT NULL,
@@ -130,6 +138,7 @@ CREATE TABLE IF NOT EXISTS role_agent (
 );
 
 CREATE INDEX IF NOT EXISTS idx_role_agent_tenant_name ON role_agent(tenant_name);
+CREATE INDEX IF NOT EXISTS idx_role_agent_agent_id_tenant ON role_agent(agent_id, tenant_name);
 
 CREATE TABLE IF NOT EXISTS user_agent (
     username TEXT NOT NULL,
@@ -143,6 +152,7 @@ CREATE TABLE IF NOT EXISTS user_agent (
 );
 
 CREATE INDEX IF NOT EXISTS idx_user_agent_tenant_name ON user_agent(tenant_name);
+CREATE INDEX IF NOT EXISTS idx_user_agent_agent_id_tenant ON user_agent(agent_id, tenant_name);
 
 
 
@@ -184,6 +194,9 @@ ALTER TABLE provider_tokens ALTER COLUMN agent_id SET NOT NULL;
 -- Drop and re-add uq_provider_agent_tenant to ensure it's correctly defined as per the latest schema
 ALTER TABLE provider_tokens DROP CONSTRAINT IF EXISTS uq_provider_agent_tenant;
 ALTER TABLE provider_tokens ADD CONSTRAINT uq_provider_agent_tenant UNIQUE (provider_id, agent_id, tenant_name);
+-- uq_provider_agent_tenant serves the (provider_id, agent_id, tenant_name) lookups; these cover the list filters
+CREATE INDEX IF NOT EXISTS idx_pt_username ON provider_tokens (username);
+CREATE INDEX IF NOT EXISTS idx_pt_agent_id ON provider_tokens (agent_id);
 
 -- Trigger to update 'updated_at' on provider_tokens
 CREATE OR REPLACE FUNCTION update_provider_tokens_modified_column()
@@ -9,9 +9,9 @@ import uuid
 from integrator.iam.iam_db_crud import (
     upsert_user, upsert_agent, upsert_role, insert_role_domain, 
     insert_role_user, insert_role_agent, upsert_auth_provider, 
-    upsert_tenant, insert_user_agent
+    upsert_tenant, insert_user_agent, prefetch_agents, role_embeddings
 )
-from integrator.iam.iam_keycloak_crud import get_admin_token, create_user, create_client, create_client_mapper, KC_CONFIG
+from integrator.iam.iam_keycloak_crud import get_admin_token, create_user, create_client, create_client_mappers, KC_CONFIG
 from integrator.utils.db import get_db_cm
 from integrator.utils.logger import get_logger
 from integrator.utils.crypto_utils import decrypt
@@ -142,6 +142,13 @@ def restore_agents_from_backup(sess, headers, kc_config, agents_backup_file, key
         for tenant_name, agents_data in tenant_agents.items():
             logger.info(f"Restoring {len(agents_data)} agents for tenant: {tenant_name}")
             
+            # Look up the tenant's existing agents once instead of once per agent
+            existing_agents = prefetch_agents(
+                sess,
+                [{"agent_id": a.get("agent_id"), "name": a.get("name")} for a in agents_data],
+                tenant_name
+            )
+            
             # Restore each agent
             for agent_info in agents_data:
                 agent_id = agent_info.get("agent_id")
@@ -170,7 +177,7 @@ def restore_agents_from_backup(sess, headers, kc_config, agents_backup_file, key
                         "tenant_name": tenant_name
                     }
                     
-                    upsert_agent(sess, agent_data_for_db, tenant_name)
+                    upsert_agent(sess, agent_data_for_db, tenant_name, existing=existing_agents)
                     logger.info(f"Successfully restored agent table data for: {agent_id}")
                 except Exception as e:
                     logger.error(f"Failed to restore agent table data for {agent_id}: {str(e)}")
@@ -287,12 +294,10 @@ def restore_keycloak_clients(headers, kc_config, keycloak_clients_backup_file):
                     # Restore client mappers if they exist
                     if client_data.get("mappers"):
                         logger.info(f"Restoring {len(client_data['mappers'])} mappers for client: {client_id}")
-                        for mapper in client_data["mappers"]:
-                            try:
-                                create_client_mapper(headers, tenant_name, client_id, mapper, kc_config)
-                                logger.info(f"Successfully restored mapper '{mapper.get('name')}' for client: {client_id}")
-                            except Exception as mapper_error:
-                                logger.error(f"Failed to restore mapper '{mapper.get('name')}' for client {client_id}: {str(mapper_error)}")
+                        try:
+                            create_client_mappers(headers, tenant_name, client_id, client_data["mappers"], kc_config)
+                        except Exception as mapper_error:
+                            logger.error(f"Failed to restore mappers for client {client_id}: {str(mapper_error)}")
                     
                     restored_clients.append(client_id)
                 except Exception as e:
@@ -391,12 +396,14 @@ def restore_roles_and_relationships(sess, emb, backup_dir, clear_existing=False)
             role_count = 0
             for tenant_name, roles_data in tenant_roles.items():
                 logger.info(f"Restoring {len(roles_data)} roles for tenant: {tenant_name}")
-                for role_data in roles_data:
+                # Embed all of the tenant's roles in one batched call
+                emb_vecs = role_embeddings(roles_data, emb, sess)
+                for role_data, emb_vec in zip(roles_data, emb_vecs):
                     # Convert embedding back to numpy array if present
                     if role_data.get("emb"):
                         role_data["emb"] = np.array(role_data["emb"], dtype=np.float32)
                     
-                    upsert_role(sess, role_data, tenant_name, emb)
+                    upsert_role(sess, role_data, tenant_name, emb, emb_vec=emb_vec)
                     role_count += 1
             sess.flush()
             logger.info(f"Restored {role_count} roles")
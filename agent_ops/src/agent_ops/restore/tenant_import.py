@@ -5,7 +5,7 @@ load_env()
 import sys
 import json
 import os
-import requests
+import httpx
 from integrator.iam.iam_db_crud import upsert_tenant
 from integrator.iam.iam_keycloak_crud import get_admin_token, create_realm, get_realm, KC_CONFIG
 from integrator.utils.db import get_db_cm
@@ -79,7 +79,7 @@ def restore_tenants_from_backup(sess, kc_config, tenant_backup_file, keycloak_ba
                             "ssoSessionMaxLifespan": realm_info.get("ssoSessionMaxLifespan", 28800)
                         }
                         
-                        response = requests.put(realm_url, headers=headers, json=realm_update_data)
+                        response = httpx.put(realm_url, headers=headers, json=realm_update_data)
                         if response.status_code == 204:
                             logger.info(f"Updated Keycloak realm settings for tenant: {tenant_name}")
                         else:
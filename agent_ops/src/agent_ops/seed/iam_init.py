@@ -6,21 +6,24 @@ load_env()
 import json
 import os
 from integrator.iam.iam_db_crud import upsert_role, insert_role_domain, insert_role_user, insert_role_agent, insert_user_agent
+from integrator.iam.iam_db_crud import insert_role_domains, insert_role_users, insert_role_agents
 import os
 from integrator.utils.db import get_db_cm
 from integrator.utils.llm import Embedder
 from integrator.utils.logger import get_logger
 from integrator.iam.iam_keycloak_crud import (
     get_admin_token,
-    create_realm, create_realm_roles, create_client, create_user, KC_CONFIG, create_client_mapper,
+    create_realm, create_realm_roles, create_client, create_user, create_users, KC_CONFIG, create_client_mapper,
     create_client_scope,
     assign_scope_to_client
 )
 from integrator.iam.iam_db_crud import (
-    upsert_tenant, upsert_agent, upsert_user,  upsert_auth_provider
+    upsert_tenant, upsert_agent, upsert_user,  upsert_auth_provider,
+    bulk_upsert_agents, bulk_upsert_users, bulk_upsert_roles, bulk_upsert_auth_providers
 )
 
 import numpy as np
+from sqlalchemy import text
 
 
 logger = get_logger(__name__)
@@ -44,16 +47,14 @@ def load_roles(sess, emb, json_path):
             # Iterate through each tenant in the data
             for tenant_name, roles in data.items():
                 logger.info(f"Loading roles for tenant: {tenant_name}")
-                for role_data in roles:
-                    # Upsert the role
-                    upsert_role(sess, role_data, tenant_name, emb)
-                    sess.flush()
-                    # Create role-domain relationships if domains are present
-                    domains = role_data.get("domains", [])
-                    if domains:
-                        role_name = role_data["name"]
-                        for domain_name in domains:
-                            insert_role_domain(sess, role_name, domain_name, tenant_name)
+                # Upsert all roles of the tenant in one statement per chunk
+                bulk_upsert_roles(sess, roles, tenant_name, emb)
+                # Create role-domain relationships for all roles at once
+                insert_role_domains(sess, [
+                    {"role_name": role_data["name"], "domain_name": domain_name}
+                    for role_data in roles
+                    for domain_name in role_data.get("domains", [])
+                ], tenant_name)
                 
                 sess.commit()
                 logger.info(f"Inserted/updated {len(roles)} roles with their domain relationships for tenant: {tenant_name}.")
@@ -77,8 +78,7 @@ def load_init_auth_providers(sess, json_path):
         # Iterate through each tenant in the data
         for tenant_name, auth_providers_data in data.items():
             logger.info(f"Loading auth providers for tenant: {tenant_name}")
-            for provider in auth_providers_data:
-                upsert_auth_provider(sess, provider, tenant_name)
+            bulk_upsert_auth_providers(sess, auth_providers_data, tenant_name)
             sess.commit()
             logger.info(f"Processed {len(auth_providers_data)} auth providers for tenant: {tenant_name}.")
     except Exception as e:
@@ -115,19 +115,17 @@ def load_init_users(sess, kc_config, iam_json_path):
             logger.info(f"--- Processing tenant: {tenant_name} ---")
             
             # Process agents
-            for agent_data in tenant_data.get("agents", []):
-                upsert_agent(sess, agent_data, tenant_name)
-                create_user(headers, tenant_name, agent_data, kc_config)
-                
-                logger.info(f"created agent with agent id: {agent_data.get('name') or agent_data.get('agent_id')}")
-                sess.flush()
+            agents_data = tenant_data.get("agents", [])
+            bulk_upsert_agents(sess, agents_data, tenant_name)
+            create_users(headers, tenant_name, agents_data, kc_config)
+            logger.info(f"created {len(agents_data)} agents in Keycloak")
                 
             # Process users
-            for user_data in tenant_data.get("users", []):
-                upsert_user(sess, user_data, tenant_name)
-                create_user(headers, tenant_name, user_data, kc_config)
-                sess.flush()
-                logger.info(f"created user with user name: {user_data.get('username')}")
+            users_data = tenant_data.get("users", [])
+            bulk_upsert_users(sess, users_data, tenant_name)
+            create_users(headers, tenant_name, users_data, kc_config)
+            logger.info(f"created {len(users_data)} users in Keycloak")
+            for user_data in users_data:
                 agents = user_data.get("agents", [])
                 for agent in agents:
                     insert_user_agent(sess, user_data.get("username"), agent.get("agent_id"), tenant_name, agent.get("role"), agent.get("context", {}))
@@ -162,17 +160,19 @@ def load_role_users(sess, json_path):
             logger.info(f"Loading role-users for tenant: {tenant_name}")
             user_count = 0
             agent_count = 0
+            role_users = []
+            role_agents = []
             for entry in role_user_data:
                 if "user" in entry:
                     username = entry["user"]
-                    for role_name in entry["roles"]:
-                        insert_role_user(sess, role_name, username, tenant_name)
+                    role_users.extend({"role_name": role_name, "username": username} for role_name in entry["roles"])
                     user_count += 1
                 elif "agent" in entry:
                     agent_id = entry["agent"]
-                    for role_name in entry["roles"]:
-                        insert_role_agent(sess, role_name, agent_id, tenant_name)
+                    role_agents.extend({"role_name": role_name, "agent_id": agent_id} for role_name in entry["roles"])
                     agent_count += 1
+            insert_role_users(sess, role_users, tenant_name)
+            insert_role_agents(sess, role_agents, tenant_name)
             sess.commit()
             logger.info(f"Inserted/updated {user_count} users and {agent_count} agents from {json_path} for tenant: {tenant_name}.")
     except Exception as e:
@@ -202,5 +202,9 @@ def seed_iam(seed_dir: str):
         # Load role-user and role-agent relationships (automatically reads tenant names from JSON)
         load_role_users(sess, role_user_path)
 
+        # Refresh planner statistics so lookups use the (key, tenant_name) indexes right away
+        sess.execute(text("ANALYZE agents, users, roles, role_domain, role_user, role_agent, user_agent, auth_providers"))
+        sess.commit()
+
 if __name__ == "__main__":
     seed_iam("/Users/jingnan.zhou/workspace/agentic-coworker/data/seed_data")
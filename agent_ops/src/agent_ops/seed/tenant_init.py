@@ -15,6 +15,7 @@ from integrator.iam.iam_keycloak_crud import (
     create_realm, create_realm_roles, create_client, create_user, KC_CONFIG, create_client_mapper,
     create_client_scope,
     assign_scope_to_client,
+    get_realm_scope_index,
     disable_keycloak_ssl
 )
 import numpy as np
@@ -62,12 +63,15 @@ def load_init_tenants(sess, kc_config, tenant_json_path):
             upsert_tenant(sess, tenant_data)
    
 
-            for scope in tenant_data.get("scopes", []):
-                create_client_scope(headers, tenant_name, scope, kc_config)
+            scopes = tenant_data.get("scopes", [])
+            existing_scopes = get_realm_scope_index(headers, tenant_name, kc_config) if scopes else {}
+            for scope in scopes:
+                create_client_scope(headers, tenant_name, scope, kc_config, scope_index=existing_scopes)
 
             if "roles" in tenant_data:
                 create_realm_roles( headers, tenant_name, tenant_data["roles"], kc_config)
 
+            scope_index = None
             for client_data in tenant_data.get("clients", []):
                 create_client( headers, tenant_name, client_data, kc_config)
                 logger.info(f"created client with client id: {client_data.get('name') or client_data.get('agent_id')}")
@@ -75,9 +79,12 @@ def load_init_tenants(sess, kc_config, tenant_json_path):
                 if mappers:
                     create_client_mapper(headers,tenant_name,client_data.get("name"),mappers, kc_config )
                 scopes=client_data.get("scopes",[])
+                if scopes and scope_index is None:
+                    # The realm's scopes are all created above; list them once per tenant
+                    scope_index = get_realm_scope_index(headers, tenant_name, kc_config)
 
                 for scope in scopes:
-                    assign_scope_to_client(headers, tenant_name, client_data.get("name"),scope, kc_config)
+                    assign_scope_to_client(headers, tenant_name, client_data.get("name"),scope, kc_config, scope_index=scope_index)
 
             sess.flush()    
         sess.commit()
@@ -1,7 +1,9 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware # Added for CORS
 import uvicorn
 from dotenv import load_dotenv
+from sqlalchemy.exc import SQLAlchemyError
 
 # --- Centralized Logging Setup ---
 from integrator.utils.logger import  get_logger
@@ -11,9 +13,21 @@ logger = get_logger(__name__) # Get a logger for this module
 app = FastAPI(
     title="AI Integration Services", # Renamed title
     description="Provides AI Integration Services supporting access to mcp service metadata stored in etcd and allowing registration/deletion.",
-    version="1.1.0"
+    version="1.1.0",
+    default_response_class=ORJSONResponse,
 )
 
+# --- Database errors ---
+# Endpoints on the transactional_db dependency let database errors propagate after the
+# rollback; they are reported here once instead of in per-handler try/except blocks.
+@app.exception_handler(SQLAlchemyError)
+async def sqlalchemy_error_handler(request: Request, exc: SQLAlchemyError):
+    logger.error(f"Database error on {request.method} {request.url.path}: {exc}")
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": f"An unexpected database error occurred: {str(exc)}"},
+    )
+
 # --- CORS Middleware ---
 # Define allowed origins. For development, this often includes your frontend's address.
 # For production, be more restrictive.
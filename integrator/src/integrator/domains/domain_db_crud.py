@@ -7,7 +7,7 @@ from integrator.domains.domain_db_model import (
 from integrator.tools.tool_db_model import Skill, CapabilitySkill
 from integrator.utils.db import get_db_cm
 from integrator.utils.llm import Embedder
-from sqlalchemy import  select, insert
+from sqlalchemy import  select, insert, cast, case, Float
 from integrator.utils.logger import get_logger
 import numpy as np
 from typing import List, Dict, Any
@@ -15,6 +15,15 @@ from typing import List, Dict, Any
 
 logger = get_logger(__name__)
 
+# step_order is free text: numeric orders sort numerically, and the cast is only applied to
+# values that look like numbers, so a label such as "final" sorts last instead of failing the query.
+_STEP_ORDER_KEY = (
+    case(
+        (WorkflowStep.step_order.regexp_match(r"^-?[0-9]+(\.[0-9]+)?$"), cast(WorkflowStep.step_order, Float)),
+    ).nulls_last(),
+    WorkflowStep.step_order,
+)
+
 
 def get_all_domains(sess, tenant_name: str) -> List[Dict[str, Any]]:
     """Return all domains for a specific tenant as a list of JSON-serializable dicts.
@@ -26,8 +35,14 @@ def get_all_domains(sess, tenant_name: str) -> List[Dict[str, Any]]:
         tenant_name: Name of the tenant to filter domains by
     """
     domains = sess.execute(
-        select(Domain).where(Domain.tenant_name == tenant_name)
-    ).scalars().all()
+        select(
+            Domain.name,
+            Domain.description,
+            Domain.scope,
+            Domain.domain_entities,
+            Domain.domain_purposes,
+        ).where(Domain.tenant_name == tenant_name)
+    ).all()
     return [
         {
             "name": d.name,
@@ -51,14 +66,22 @@ def get_capabilities_by_domain(sess, domain_name: str, tenant_name: str) -> List
         tenant_name: Name of the tenant to filter by
     """
     capabilities = sess.execute(
-        select(Capability)
+        select(
+            Capability.name,
+            Capability.label,
+            Capability.description,
+            Capability.business_context,
+            Capability.business_processes,
+            Capability.outcome,
+            Capability.business_intent,
+        )
         .join(DomainCapability, Capability.name == DomainCapability.capability_name)
         .where(
             (DomainCapability.domain_name == domain_name) &
             (DomainCapability.tenant_name == tenant_name) &
             (Capability.tenant_name == tenant_name)
         )
-    ).scalars().all()
+    ).all()
 
     return [
         {
@@ -558,12 +581,12 @@ def get_all_workflow_steps_grouped_by_workflow(sess, tenant_name: str) -> Dict[s
             "another_workflow": [...]
         }
     """
-    # Query all workflow steps joined with workflows, filtered by tenant, ordered by workflow_name and step_order
+    # Query all workflow steps joined with workflows, filtered by tenant, ordered by workflow_name and numeric step_order
     workflow_steps = sess.execute(
         select(WorkflowStep)
         .join(Workflow, (WorkflowStep.workflow_name == Workflow.name) & (WorkflowStep.tenant_name == Workflow.tenant_name))
         .where(WorkflowStep.tenant_name == tenant_name)
-        .order_by(WorkflowStep.workflow_name, WorkflowStep.step_order)
+        .order_by(WorkflowStep.workflow_name, *_STEP_ORDER_KEY)
     ).scalars().all()
     
     # Group workflow steps by workflow name
@@ -631,6 +654,52 @@ def get_capabilities_by_workflow_step(sess, workflow_step_name: str, tenant_name
     return list(capabilities)
 
 
+def get_domains_grouped_by_workflow_step(sess, tenant_name: str) -> Dict[str, List[str]]:
+    """Get domain names for every workflow step of a tenant in a single query.
+    
+    Args:
+        sess: Database session
+        tenant_name: Name of the tenant
+        
+    Returns:
+        Dict[str, List[str]]: Dictionary with workflow step names as keys and lists of
+        associated domain names as values. Steps without domains are omitted.
+    """
+    rows = sess.execute(
+        select(WorkflowStepDomain.workflow_step_name, WorkflowStepDomain.domain_name)
+        .where(WorkflowStepDomain.tenant_name == tenant_name)
+    ).all()
+    
+    grouped_domains: Dict[str, List[str]] = {}
+    for workflow_step_name, domain_name in rows:
+        grouped_domains.setdefault(workflow_step_name, []).append(domain_name)
+    
+    return grouped_domains
+
+
+def get_capabilities_grouped_by_workflow_step(sess, tenant_name: str) -> Dict[str, List[str]]:
+    """Get capability names for every workflow step of a tenant in a single query.
+    
+    Args:
+        sess: Database session
+        tenant_name: Name of the tenant
+        
+    Returns:
+        Dict[str, List[str]]: Dictionary with workflow step names as keys and lists of
+        associated capability names as values. Steps without capabilities are omitted.
+    """
+    rows = sess.execute(
+        select(WorkflowStepCapability.workflow_step_name, WorkflowStepCapability.capability_name)
+        .where(WorkflowStepCapability.tenant_name == tenant_name)
+    ).all()
+    
+    grouped_capabilities: Dict[str, List[str]] = {}
+    for workflow_step_name, capability_name in rows:
+        grouped_capabilities.setdefault(workflow_step_name, []).append(capability_name)
+    
+    return grouped_capabilities
+
+
 def get_avg_vector(emb, ins_outs):
     """
     Given an embedding model and a list of input/output elements,
@@ -953,7 +1022,7 @@ def get_workflows_with_tool_count(sess, tenant_name: str) -> Dict[str, Any]:
         workflow_steps = sess.execute(
             select(WorkflowStep)
             .where(WorkflowStep.workflow_name == workflow.name)
-            .order_by(WorkflowStep.step_order)
+            .order_by(*_STEP_ORDER_KEY)
         ).scalars().all()
         
         workflow_steps_data = []
@@ -19,8 +19,8 @@ from integrator.utils.logger import get_logger
 
 from integrator.domains.domain_db_crud import (
     get_all_workflow_steps_grouped_by_workflow,
-    get_domains_by_workflow_step,
-    get_capabilities_by_workflow_step,
+    get_domains_grouped_by_workflow_step,
+    get_capabilities_grouped_by_workflow_step,
     get_capabilities_by_domain
 )
 from sqlalchemy import select
@@ -416,6 +416,160 @@ def create_workflow_step_capability_edge(gsess, workflow_step_name: str, capabil
     )
 
 
+def bulk_create_workflow_nodes(gsess, workflows: list[Mapping[str, Any]]) -> None:
+    """Create or update many Workflow nodes in Neo4j with a single ``UNWIND`` query.
+
+    Each item accepts the same keys as ``create_workflow_node``.
+
+    Like the other ``bulk_create_*`` helpers, ``gsess`` may be a session or a
+    transaction (e.g. inside ``gsess.execute_write``) so several batches can be
+    committed together.
+    """
+    if not workflows:
+        return
+
+    rows = [
+        {
+            "name": w.get("name"),
+            "tenant_name": w.get("tenant_name", "default"),
+            "label": w.get("label", ""),
+            "description": w.get("description", ""),
+            "value_metrics": w.get("value_metrics", []),
+        }
+        for w in workflows
+    ]
+
+    cypher = """
+    UNWIND $rows AS r
+    MERGE (w:Workflow {name: r.name, tenant_name: r.tenant_name})
+    SET w.label = r.label,
+        w.description = r.description,
+        w.value_metrics = r.value_metrics
+    """
+
+    gsess.run(cypher, rows=rows)
+
+    logger.info("Upserted %d Workflow nodes in Neo4j", len(rows))
+
+
+def bulk_create_workflow_step_nodes(gsess, workflow_steps: list[Mapping[str, Any]]) -> None:
+    """Create or update many WorkflowStep nodes in Neo4j with a single ``UNWIND`` query.
+
+    Each item accepts the same keys as ``create_workflow_step_node``.
+    """
+    if not workflow_steps:
+        return
+
+    rows = [
+        {
+            "name": ws.get("name"),
+            "tenant_name": ws.get("tenant_name", "default"),
+            "label": ws.get("label", ""),
+            "step_order": ws.get("step_order", ""),
+            "intent": ws.get("intent", ""),
+            "description": ws.get("description", ""),
+            "workflow_name": ws.get("workflow_name"),
+        }
+        for ws in workflow_steps
+    ]
+
+    cypher = """
+    UNWIND $rows AS r
+    MERGE (ws:WorkflowStep {name: r.name, tenant_name: r.tenant_name})
+    SET ws.label = r.label,
+        ws.step_order = r.step_order,
+        ws.intent = r.intent,
+        ws.description = r.description,
+        ws.workflow_name = r.workflow_name
+    """
+
+    gsess.run(cypher, rows=rows)
+
+    logger.info("Upserted %d WorkflowStep nodes in Neo4j", len(rows))
+
+
+def bulk_create_workflow_has_step_edges(gsess, edges: list[Mapping[str, Any]]) -> None:
+    """Create or update many HAS_STEP edges with a single ``UNWIND`` query.
+
+    Each item must contain ``workflow_name``, ``workflow_step_name`` and ``tenant_name``.
+    """
+    if not edges:
+        return
+
+    cypher = """
+    UNWIND $rows AS r
+    MATCH (w:Workflow {name: r.workflow_name, tenant_name: r.tenant_name})
+    MATCH (ws:WorkflowStep {name: r.workflow_step_name, tenant_name: r.tenant_name})
+    MERGE (w)-[:HAS_STEP]->(ws)
+    """
+
+    gsess.run(cypher, rows=list(edges))
+
+    logger.info("Upserted %d HAS_STEP edges in Neo4j", len(edges))
+
+
+def bulk_create_workflow_step_next_edges(gsess, edges: list[Mapping[str, Any]]) -> None:
+    """Create or update many NEXT_STEP edges with a single ``UNWIND`` query.
+
+    Each item must contain ``from_step_name``, ``to_step_name``, ``workflow_name``
+    and ``tenant_name``.
+    """
+    if not edges:
+        return
+
+    cypher = """
+    UNWIND $rows AS r
+    MATCH (ws1:WorkflowStep {name: r.from_step_name, tenant_name: r.tenant_name})
+    MATCH (ws2:WorkflowStep {name: r.to_step_name, tenant_name: r.tenant_name})
+    MERGE (ws1)-[e:NEXT_STEP]->(ws2)
+    SET e.workflow_name = r.workflow_name
+    """
+
+    gsess.run(cypher, rows=list(edges))
+
+    logger.info("Upserted %d NEXT_STEP edges in Neo4j", len(edges))
+
+
+def bulk_create_workflow_step_domain_edges(gsess, edges: list[Mapping[str, Any]]) -> None:
+    """Create or update many USES_DOMAIN edges with a single ``UNWIND`` query.
+
+    Each item must contain ``workflow_step_name``, ``domain_name`` and ``tenant_name``.
+    """
+    if not edges:
+        return
+
+    cypher = """
+    UNWIND $rows AS r
+    MATCH (ws:WorkflowStep {name: r.workflow_step_name, tenant_name: r.tenant_name})
+    MATCH (d:Domain {name: r.domain_name, tenant_name: r.tenant_name})
+    MERGE (ws)-[:USES_DOMAIN]->(d)
+    """
+
+    gsess.run(cypher, rows=list(edges))
+
+    logger.info("Upserted %d USES_DOMAIN edges in Neo4j", len(edges))
+
+
+def bulk_create_workflow_step_capability_edges(gsess, edges: list[Mapping[str, Any]]) -> None:
+    """Create or update many USES_CAPABILITY edges with a single ``UNWIND`` query.
+
+    Each item must contain ``workflow_step_name``, ``capability_name`` and ``tenant_name``.
+    """
+    if not edges:
+        return
+
+    cypher = """
+    UNWIND $rows AS r
+    MATCH (ws:WorkflowStep {name: r.workflow_step_name, tenant_name: r.tenant_name})
+    MATCH (c:Capability {name: r.capability_name, tenant_name: r.tenant_name})
+    MERGE (ws)-[:USES_CAPABILITY]->(c)
+    """
+
+    gsess.run(cypher, rows=list(edges))
+
+    logger.info("Upserted %d USES_CAPABILITY edges in Neo4j", len(edges))
+
+
 def cleanup_domain_graph(gsess, domain_name: str | None = None, tenant_name: str | None = None) -> None:
     """Delete Domain/Capability/Tool/Skill nodes and their edges from Neo4j with tenant isolation.
 
@@ -642,22 +796,32 @@ def sync_workflows_from_db_to_graph(sess, gsess, tenant_name: str = None) -> Non
         # Get all workflow steps grouped by workflow for this tenant
         grouped_steps = get_all_workflow_steps_grouped_by_workflow(sess, current_tenant)
 
+        # Prefetch step -> domain/capability mappings for this tenant in two queries
+        step_domains = get_domains_grouped_by_workflow_step(sess, current_tenant)
+        step_capabilities = get_capabilities_grouped_by_workflow_step(sess, current_tenant)
+
         logger.info(f"Found {len(workflows)} workflows and {len(grouped_steps)} workflow groups for tenant: {current_tenant}")
 
+        # Collect nodes and edges for this tenant, then write them in batches
+        workflow_rows = []
+        step_rows = []
+        has_step_edges = []
+        next_step_edges = []
+        step_domain_edges = []
+        step_capability_edges = []
+
         # Process each workflow
         for workflow in workflows:
             workflow_name = workflow.name
             workflow_tenant = workflow.tenant_name
 
-            # Create workflow node
-            workflow_data = {
+            workflow_rows.append({
                 "name": workflow.name,
                 "tenant_name": workflow_tenant,
                 "label": workflow.label,
                 "description": workflow.description or "",
                 "value_metrics": workflow.value_metrics or [],
-            }
-            create_workflow_node(gsess, workflow_data)
+            })
 
             # Get steps for this workflow
             steps = grouped_steps.get(workflow_name, [])
@@ -668,51 +832,52 @@ def sync_workflows_from_db_to_graph(sess, gsess, tenant_name: str = None) -> Non
 
             logger.info(f"Processing {len(steps)} steps for workflow: {workflow_name}")
 
-            # Sort steps by step_order to ensure correct ordering
-            try:
-                sorted_steps = sorted(steps, key=lambda x: float(x.get("step_order", 0)))
-            except (ValueError, TypeError):
-                # If conversion fails, sort as strings
-                sorted_steps = sorted(steps, key=lambda x: str(x.get("step_order", "")))
-
-            # Create workflow step nodes and HAS_STEP edges
-            for step in sorted_steps:
+            for step in steps:
                 step_name = step["name"]
                 step["tenant_name"] = workflow_tenant  # Ensure tenant_name is set
 
-                # Create workflow step node
-                create_workflow_step_node(gsess, step)
-
-                # Create HAS_STEP edge from workflow to step
-                create_workflow_has_step_edge(gsess, workflow_name, step_name, workflow_tenant)
-
-                # Get and create domain relationships for this step
-                domains = get_domains_by_workflow_step(sess, step_name, workflow_tenant)
-                for domain_name in domains:
-                    create_workflow_step_domain_edge(gsess, step_name, domain_name, workflow_tenant)
-                    logger.info(f"Created USES_DOMAIN edge: {step_name} -> {domain_name} (tenant: {workflow_tenant})")
-
-                # Get and create capability relationships for this step
-                capabilities = get_capabilities_by_workflow_step(sess, step_name, workflow_tenant)
-                for capability_name in capabilities:
-                    create_workflow_step_capability_edge(gsess, step_name, capability_name, workflow_tenant)
-                    logger.info(f"Created USES_CAPABILITY edge: {step_name} -> {capability_name} (tenant: {workflow_tenant})")
-
-            # Create NEXT_STEP edges between consecutive steps
-            for i in range(len(sorted_steps) - 1):
-                current_step = sorted_steps[i]
-                next_step = sorted_steps[i + 1]
-
-                create_workflow_step_next_edge(
-                    gsess,
-                    from_step_name=current_step["name"],
-                    to_step_name=next_step["name"],
-                    workflow_name=workflow_name,
-                    tenant_name=workflow_tenant,
-                )
-
-            logger.info(f"Successfully synced workflow: {workflow_name} with {len(sorted_steps)} steps (tenant: {workflow_tenant})")
-        
+                step_rows.append(step)
+                has_step_edges.append({
+                    "workflow_name": workflow_name,
+                    "workflow_step_name": step_name,
+                    "tenant_name": workflow_tenant,
+                })
+
+                for domain_name in step_domains.get(step_name, []):
+                    step_domain_edges.append({
+                        "workflow_step_name": step_name,
+                        "domain_name": domain_name,
+                        "tenant_name": workflow_tenant,
+                    })
+
+                for capability_name in step_capabilities.get(step_name, []):
+                    step_capability_edges.append({
+                        "workflow_step_name": step_name,
+                        "capability_name": capability_name,
+                        "tenant_name": workflow_tenant,
+                    })
+
+            # NEXT_STEP edges between consecutive steps
+            for current_step, next_step in zip(steps, steps[1:]):
+                next_step_edges.append({
+                    "from_step_name": current_step["name"],
+                    "to_step_name": next_step["name"],
+                    "workflow_name": workflow_name,
+                    "tenant_name": workflow_tenant,
+                })
+
+        def _write_tenant_workflows(tx):
+            # Nodes must exist before edges are matched against them
+            bulk_create_workflow_nodes(tx, workflow_rows)
+            bulk_create_workflow_step_nodes(tx, step_rows)
+            bulk_create_workflow_has_step_edges(tx, has_step_edges)
+            bulk_create_workflow_step_next_edges(tx, next_step_edges)
+            bulk_create_workflow_step_domain_edges(tx, step_domain_edges)
+            bulk_create_workflow_step_capability_edges(tx, step_capability_edges)
+
+        # Commit all batched writes for the tenant in a single transaction
+        gsess.execute_write(_write_tenant_workflows)
+
         total_workflows_synced += len(workflows)
         logger.info(f"Completed workflow sync for tenant: {current_tenant} ({len(workflows)} workflows)")
     
@@ -1,32 +1,65 @@
 from fastapi import APIRouter, Depends, HTTPException, Path, Header, Request
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, raiseload, defer
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 from uuid import UUID
 
 from integrator.utils.db import get_db
 from integrator.utils.oauth import validate_token
 from integrator.utils.llm import Embedder
-from integrator.domains.domain_db_model import Domain, Capability, DomainCapability
+from integrator.domains.domain_db_model import Domain, Capability, DomainCapability, VECTOR_DIM
 from integrator.tools.tool_db_model import Skill, CapabilitySkill
 from integrator.iam.iam_db_model import AgentProfile, User, Agent, RoleAgent, Role, RoleDomain
 from integrator.iam.iam_db_crud import get_roles_by_username
 from integrator.iam.iam_auth import validate_tenant
-from sqlalchemy import func, text, bindparam
-import numpy as np
+from sqlalchemy import text, bindparam, select
+from pgvector.sqlalchemy import Vector
 
 # Create router for domain APIs
 domain_router = APIRouter(prefix="/domains", tags=["domains"])
 
+# Read queries never need the embedding column and must not lazy-load relationships
+DOMAIN_READ_OPTIONS = (defer(Domain.emb, raiseload=True), raiseload("*"))
+CAPABILITY_READ_OPTIONS = (defer(Capability.emb, raiseload=True), raiseload("*"))
+
 # === Tenant Helper Functions ===
 
 def validate_tenant_access(sess, payload: dict, tenant_name: str):
-    if not validate_tenant(sess,payload, tenant_name):
+    if not validate_tenant(sess, payload, tenant_name):
         raise HTTPException(
             status_code=403, 
             detail=f"Access denied to tenant '{tenant_name}'"
         )
 
+
+@dataclass(frozen=True)
+class AuthzCtx:
+    """Authorization context resolved once per request for tenant-scoped endpoints."""
+    username: Optional[str]
+    tenant_name: str
+
+
+def get_tenant_authz(
+    tenant_name: str = Path(...),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(validate_token)
+) -> AuthzCtx:
+    """Dependency validating access to the tenant given in the URL path."""
+    validate_tenant_access(db, current_user, tenant_name)
+    return AuthzCtx(username=current_user.get("preferred_username"), tenant_name=tenant_name)
+
+
+def get_header_tenant_authz(
+    x_tenant: str = Header(..., alias="X-Tenant"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(validate_token)
+) -> AuthzCtx:
+    """Dependency validating access to the tenant given in the X-Tenant header."""
+    validate_tenant_access(db, current_user, x_tenant)
+    return AuthzCtx(username=current_user.get("preferred_username"), tenant_name=x_tenant)
+
 # === API Models ===
 class DomainInfo(BaseModel):
     id: UUID
@@ -100,7 +133,7 @@ class CapabilitySearchResult(BaseModel):
 
 # === Helper Functions ===
 
-def get_capabilities_by_vector_query_for_user(db: Session, emb: Embedder, query: str, username: str, k: int = 10) -> List[CapabilitySearchResult]:
+def get_capabilities_by_vector_query_for_user(db: Session, emb: Embedder, query: str, username: str, k: int = 10) -> List[Dict[str, Any]]:
     """
     Get capabilities by vector search restricted to user's active agent roles.
     Uses single JOIN query: username → active agent → roles → domains → capabilities + vector search
@@ -113,9 +146,10 @@ def get_capabilities_by_vector_query_for_user(db: Session, emb: Embedder, query:
         k: number of results to return
     
     Returns:
-        List of CapabilitySearchResult with name, label, description, outcome, and similarity
+        List of dicts shaped like CapabilitySearchResult (name, label, description, outcome, similarity)
     """
-    vec = np.array(emb.encode([query])[0])
+    # float32 row view of the embedding; bound directly through pgvector's Vector type
+    vec = emb.encode([query])[0]
     
     sql = text(
         """
@@ -124,37 +158,28 @@ def get_capabilities_by_vector_query_for_user(db: Session, emb: Embedder, query:
             c.label,
             c.description,
             c.outcome,
-            1 - (c.emb <=> (:v)::vector) AS cosine_sim,
-            c.emb <=> (:v)::vector AS emb_distance
+            1 - (c.emb <=> (:v)::vector) AS similarity
         FROM capabilities c
         JOIN domain_capability dc ON c.name = dc.capability_name
         JOIN role_domain rd ON dc.domain_name = rd.domain_name
         JOIN role_agent ra ON rd.role_name = ra.role_name
         JOIN users u ON ra.agent_id = u.working_agent_id
         WHERE u.username = :username
-        ORDER BY emb_distance
+        ORDER BY similarity DESC
         LIMIT :k
         """
     )
     
     rows = db.execute(
         sql.bindparams(
-            bindparam("v", value=vec.tolist()),
+            bindparam("v", value=vec, type_=Vector(VECTOR_DIM)),
             bindparam("username", value=username),
             bindparam("k", value=k)
         )
     ).all()
     
-    return [
-        CapabilitySearchResult(
-            name=row[0],
-            label=row[1],
-            description=row[2],
-            outcome=row[3],
-            similarity=float(row[4])
-        )
-        for row in rows
-    ]
+    # Selected columns are exactly the CapabilitySearchResult fields
+    return [dict(row._mapping) for row in rows]
 
 def get_username_from_token(current_user: dict) -> str:
     """Extract username from the validated token."""
@@ -163,12 +188,16 @@ def get_username_from_token(current_user: dict) -> str:
         raise HTTPException(status_code=401, detail="Invalid token: preferred_username missing")
     return username
 
+def get_current_username(current_user: dict = Depends(validate_token)) -> str:
+    """Dependency returning the username of the validated token."""
+    return get_username_from_token(current_user)
+
 def get_user_capabilities(db: Session, username: str) -> List[CapabilityInfo]:
     """
     Fetches the complete role 0 domain 0 capability hierarchy for an agent.
     Returns a nested structure showing what the agent can access.
     """
-    capabilities = db.query(Capability).join(
+    capabilities = db.query(Capability).options(*CAPABILITY_READ_OPTIONS).join(
         DomainCapability, Capability.name == DomainCapability.capability_name
     ).join(
         RoleDomain, DomainCapability.domain_name == RoleDomain.domain_name
@@ -187,7 +216,7 @@ def get_user_domains_with_capabilities(db: Session, username: str) -> List[Domai
     Get domains with their capabilities for a user's active agent.
     """
     # Get domains accessible to the user's active agent (backed by Domain model)
-    domains = db.query(Domain).join(
+    domains = db.query(Domain).options(*DOMAIN_READ_OPTIONS).join(
         RoleDomain, Domain.name == RoleDomain.domain_name
     ).join(
         RoleAgent, RoleDomain.role_name == RoleAgent.role_name
@@ -200,7 +229,7 @@ def get_user_domains_with_capabilities(db: Session, username: str) -> List[Domai
     result = []
     for domain in domains:
         # Get capabilities for this domain
-        capabilities = db.query(Capability).join(
+        capabilities = db.query(Capability).options(*CAPABILITY_READ_OPTIONS).join(
             DomainCapability, Capability.name == DomainCapability.capability_name
         ).filter(
             DomainCapability.domain_name == domain.name
@@ -221,29 +250,26 @@ def get_user_domains_with_capabilities(db: Session, username: str) -> List[Domai
 
 @domain_router.get("/domains", response_model=List[DomainInfo])
 def get_all_domains(
-    x_tenant: str = Header(..., alias="X-Tenant"),
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(validate_token)
+    authz: AuthzCtx = Depends(get_header_tenant_authz),
+    db: Session = Depends(get_db)
 ):
     """
     Fetches all domains for a specific tenant.
     Tenant is specified via X-Tenant header.
     """
-    validate_tenant_access(db, current_user, x_tenant)
-    domains = db.query(Domain).filter(Domain.tenant_name == x_tenant).all()
+    domains = db.query(Domain).options(*DOMAIN_READ_OPTIONS).filter(Domain.tenant_name == authz.tenant_name).all()
     return [DomainInfo.from_orm(domain) for domain in domains]
 
 @domain_router.get("/capabilities", response_model=List[CapabilityInfo])
 def get_capabilities_by_user(
     db: Session = Depends(get_db),
-    current_user: dict = Depends(validate_token)
+    username: str = Depends(get_current_username)
 ):
     """
     Fetches capabilities available to the user's active agent.
     Uses access token to find active agent and filter based on agent's roles.
     Chain: username → active agent → roles → domains → capabilities
     """
-    username = get_username_from_token(current_user)
     return get_user_capabilities(db, username)
 
 
@@ -252,15 +278,13 @@ def get_capabilities_by_domain(
     tenant_name: str = Path(...),
     domain_name: str = Path(...),
     db: Session = Depends(get_db),
-    current_user: dict = Depends(validate_token)
+    authz: AuthzCtx = Depends(get_tenant_authz)
 ):
     """
     Fetches all capabilities for a specific domain in a tenant.
     """
-    validate_tenant_access(db, current_user, tenant_name)
-    
     # Verify domain exists for this tenant
-    domain = db.query(Domain).filter(
+    domain = db.query(Domain).options(*DOMAIN_READ_OPTIONS).filter(
         (Domain.name == domain_name) &
         (Domain.tenant_name == tenant_name)
     ).first()
@@ -268,7 +292,7 @@ def get_capabilities_by_domain(
         raise HTTPException(status_code=404, detail=f"Domain '{domain_name}' not found for tenant '{tenant_name}'")
     
     # Use JOIN to get capabilities for the domain
-    capabilities = db.query(Capability).join(
+    capabilities = db.query(Capability).options(*CAPABILITY_READ_OPTIONS).join(
         DomainCapability, 
         (Capability.name == DomainCapability.capability_name) &
         (Capability.tenant_name == DomainCapability.tenant_name)
@@ -284,20 +308,18 @@ def get_capabilities_by_domain(
 def get_domains_with_capabilities(
     tenant_name: str = Path(...),
     db: Session = Depends(get_db),
-    current_user: dict = Depends(validate_token)
+    authz: AuthzCtx = Depends(get_tenant_authz)
 ):
     """
     Fetches all domains with their associated capabilities for a specific tenant.
     """
-    validate_tenant_access(db, current_user, tenant_name)
-    
     # Get all domains for this tenant
-    domains = db.query(Domain).filter(Domain.tenant_name == tenant_name).all()
+    domains = db.query(Domain).options(*DOMAIN_READ_OPTIONS).filter(Domain.tenant_name == tenant_name).all()
     result = []
     
     for domain in domains:
         # Get capabilities for this domain
-        capabilities = db.query(Capability).join(
+        capabilities = db.query(Capability).options(*CAPABILITY_READ_OPTIONS).join(
             DomainCapability, 
             (Capability.name == DomainCapability.capability_name) &
             (Capability.tenant_name == DomainCapability.tenant_name)
@@ -313,9 +335,9 @@ def get_domains_with_capabilities(
             description=domain.description,
             capabilities=[CapabilityInfo.from_orm(cap) for cap in capabilities]
         )
-        result.append(domain_with_caps)
+        result.append(domain_with_caps.model_dump(mode="json"))
     
-    return result
+    return ORJSONResponse(result)
 
 
 @domain_router.get("/capabilities/query", response_model=List[CapabilitySearchResult])
@@ -323,55 +345,71 @@ def query_capabilities_by_vector(
     query: str,
     limit: int = 10,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(validate_token)
+    username: str = Depends(get_current_username)
 ):
     """
     Query capabilities using vector search, restricted to user's active agent roles.
     Uses access token to find active agent and filter based on agent's roles.
     Returns capabilities with similarity scores.
     """
-    username = get_username_from_token(current_user)
     emb = Embedder()  # Initialize embedder
-    return get_capabilities_by_vector_query_for_user(db, emb, query, username, limit)
+    return ORJSONResponse(get_capabilities_by_vector_query_for_user(db, emb, query, username, limit))
 
 @domain_router.get("/tenants/{tenant_name}/capabilities/search", response_model=List[CapabilityInfo])
 def search_capabilities(
     tenant_name: str = Path(...),
-    query: str = None,
+    query: Optional[str] = None,
     limit: int = 10,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(validate_token)
+    authz: AuthzCtx = Depends(get_tenant_authz)
 ):
     """
     Search capabilities by query string for a specific tenant.
     This is a simple text search - can be enhanced with vector search later.
+    An empty query matches nothing; `%` and `_` in the query are matched literally.
     """
-    validate_tenant_access(db, current_user, tenant_name)
+    if not query:
+        return []
+
+    # ILIKE is served by the pg_trgm GIN indexes on label/description/outcome
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{escaped}%"
     
-    capabilities = db.query(Capability).filter(
-        (Capability.tenant_name == tenant_name) &
-        (
-            func.lower(Capability.label).contains(func.lower(query)) |
-            func.lower(Capability.description).contains(func.lower(query)) |
-            func.lower(Capability.outcome).contains(func.lower(query))
-        )
-    ).limit(limit).all()
+    # Project only the columns exposed by CapabilityInfo (skips the emb vector)
+    rows = db.execute(
+        select(
+            Capability.id,
+            Capability.name,
+            Capability.label,
+            Capability.description,
+            Capability.business_context,
+            Capability.business_processes,
+            Capability.outcome,
+            Capability.business_intent,
+            Capability.created_at,
+        ).where(
+            (Capability.tenant_name == tenant_name) &
+            (
+                Capability.label.ilike(pattern, escape="\\") |
+                Capability.description.ilike(pattern, escape="\\") |
+                Capability.outcome.ilike(pattern, escape="\\")
+            )
+        ).limit(limit)
+    ).all()
     
-    return [CapabilityInfo.from_orm(capability) for capability in capabilities]
+    return [CapabilityInfo.from_orm(row) for row in rows]
 
 @domain_router.get("/tenants/{tenant_name}/capabilities/{capability_name}/domains", response_model=List[DomainInfo])
 def get_domains_by_capability(
     tenant_name: str = Path(...),
     capability_name: str = Path(...),
     db: Session = Depends(get_db),
-    current_user: dict = Depends(validate_token)
+    authz: AuthzCtx = Depends(get_tenant_authz)
 ):
     """Fetches all domains that contain a specific capability for a specific tenant."""
-    validate_tenant_access(db, current_user, tenant_name)
-    
     try:
         # Use JOIN to get domains for the capability within the tenant
-        domains = db.query(Domain).join(
+        domains = db.query(Domain).options(*DOMAIN_READ_OPTIONS).join(
             DomainCapability, 
             (Domain.name == DomainCapability.domain_name) &
             (Domain.tenant_name == DomainCapability.tenant_name)
@@ -417,7 +455,7 @@ def get_domains_tool_counts(
     tenant_name: str = Path(...),
     agent_id: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: dict = Depends(validate_token)
+    authz: AuthzCtx = Depends(get_tenant_authz)
 ):
     """
     Get all domains with their tool counts for a specific tenant.
@@ -436,12 +474,11 @@ def get_domains_tool_counts(
         tenant_name: Name of the tenant
         agent_id: Optional agent ID to filter domains by agent association
         db: Database session
-        current_user: Validated user from token
+        authz: Authorization context for the tenant
         
     Returns:
         List of domains with their tool counts
     """
-    validate_tenant_access(db, current_user, tenant_name)
     from integrator.domains.domain_db_crud import get_domains_with_tool_count
     
     results = get_domains_with_tool_count(db, tenant_name=tenant_name, agent_id=agent_id)
@@ -453,7 +490,7 @@ def get_capabilities_tool_skill_counts(
     tenant_name: str = Path(...),
     domain_name: str = Path(...),
     db: Session = Depends(get_db),
-    current_user: dict = Depends(validate_token)
+    authz: AuthzCtx = Depends(get_tenant_authz)
 ):
     """
     Get all capabilities for a domain with their tool and skill counts for a specific tenant.
@@ -468,16 +505,15 @@ def get_capabilities_tool_skill_counts(
         tenant_name: Name of the tenant
         domain_name: Name of the domain to get capabilities for
         db: Database session
-        current_user: Validated user from token
+        authz: Authorization context for the tenant
         
     Returns:
         List of capabilities with their tool and skill counts
     """
-    validate_tenant_access(db, current_user, tenant_name)
     from integrator.domains.domain_db_crud import get_capabilities_with_tool_and_skill_count
     
     # Verify domain exists for this tenant
-    domain = db.query(Domain).filter(
+    domain = db.query(Domain).options(*DOMAIN_READ_OPTIONS).filter(
         (Domain.name == domain_name) &
         (Domain.tenant_name == tenant_name)
     ).first()
@@ -545,7 +581,7 @@ class WorkflowsWithTotalCount(BaseModel):
 def get_workflows_tool_counts(
     tenant_name: str = Path(...),
     db: Session = Depends(get_db),
-    current_user: dict = Depends(validate_token)
+    authz: AuthzCtx = Depends(get_tenant_authz)
 ):
     """
     Get all workflows with their tool counts and workflow steps with tool counts for a specific tenant.
@@ -568,7 +604,7 @@ def get_workflows_tool_counts(
     Args:
         tenant_name: Name of the tenant
         db: Database session
-        current_user: Validated user from token
+        authz: Authorization context for the tenant
         
     Returns:
         List of workflows with their tool counts and workflow steps
@@ -604,8 +640,7 @@ def get_workflows_tool_counts(
             }
         ]
     """
-    validate_tenant_access(db, current_user, tenant_name)
     from integrator.domains.domain_db_crud import get_workflows_with_tool_count
     
     result = get_workflows_with_tool_count(db, tenant_name=tenant_name)
-    return WorkflowsWithTotalCount(**result)
+    return ORJSONResponse(WorkflowsWithTotalCount(**result).model_dump(mode="json"))
@@ -81,16 +81,8 @@ def sync_workflows_from_db_to_graph(gsess) -> None:
             
             logger.info(f"Processing {len(steps)} steps for workflow: {workflow_name}")
             
-            # Sort steps by step_order to ensure correct ordering
-            # Handle both string and numeric step_order values
-            try:
-                sorted_steps = sorted(steps, key=lambda x: float(x.get("step_order", 0)))
-            except (ValueError, TypeError):
-                # If conversion fails, sort as strings
-                sorted_steps = sorted(steps, key=lambda x: str(x.get("step_order", "")))
-            
             # Create workflow step nodes and HAS_STEP edges
-            for step in sorted_steps:
+            for step in steps:
                 step_name = step["name"]
                 
                 # Create workflow step node
@@ -112,9 +104,9 @@ def sync_workflows_from_db_to_graph(gsess) -> None:
                     logger.info(f"Created USES_CAPABILITY edge: {step_name} -> {capability_name}")
             
             # Create NEXT_STEP edges between consecutive steps
-            for i in range(len(sorted_steps) - 1):
-                current_step = sorted_steps[i]
-                next_step = sorted_steps[i + 1]
+            for i in range(len(steps) - 1):
+                current_step = steps[i]
+                next_step = steps[i + 1]
                 
                 create_workflow_step_next_edge(
                     gsess,
@@ -123,7 +115,7 @@ def sync_workflows_from_db_to_graph(gsess) -> None:
                     workflow_name=workflow_name,
                 )
             
-            logger.info(f"Successfully synced workflow: {workflow_name} with {len(sorted_steps)} steps")
+            logger.info(f"Successfully synced workflow: {workflow_name} with {len(steps)} steps")
         
         logger.info("Workflow sync completed successfully")
 
@@ -1,15 +1,113 @@
 
 from __future__ import annotations
-import json
+import re
 from textwrap import dedent
-from typing import Any, Dict, List, Optional, Tuple, Union
-from dataclasses import  asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import orjson
 
 def _as_json(obj_or_text: Union[str, Dict[str, Any], List[Any]]) -> Union[Dict[str, Any], List[Any]]:
     if isinstance(obj_or_text, (dict, list)):
         return obj_or_text
-    text = (obj_or_text or "").strip()
-    return json.loads(text) if text else {}
+    # orjson tolerates surrounding whitespace, so no stripped copy is needed
+    if not obj_or_text or obj_or_text.isspace():
+        return {}
+    return orjson.loads(obj_or_text)
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to compact JSON; indentation only adds LLM tokens.
+
+    orjson walks dataclasses natively, so tool chains are written without an
+    ``asdict`` copy.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _dumps_bytes(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes without a decode/encode hop."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _dump_arg(
+    obj_or_text: Union[str, Dict[str, Any], List[Any], None],
+    default: str,
+    reformat: bool = False,
+) -> str:
+    """Serialize a builder argument.
+
+    JSON strings (from the DB or a previous LLM call) are trusted and passed through
+    as is, skipping the parse/re-serialize round-trip, unless ``reformat`` is set.
+    Dicts/lists are serialized directly.
+    """
+    if not obj_or_text:
+        return default
+    if isinstance(obj_or_text, str):
+        if obj_or_text.isspace():
+            return default
+        return _dumps(_as_json(obj_or_text)) if reformat else obj_or_text
+    return _dumps(obj_or_text)
+
+
+_PLACEHOLDER_RE = re.compile(r"\[\[([A-Z_]+)\]\]")
+
+
+_TRAILING_WS_RE = re.compile(r"[ \t]+\n")
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
+
+
+def _normalize_template(template: str) -> str:
+    """Dedent and strip a template once at import so builders never do it per call.
+
+    Trailing spaces are trimmed and runs of blank lines collapse to one; the
+    extra whitespace carries nothing for the LLM.
+    """
+    template = _TRAILING_WS_RE.sub("\n", dedent(template))
+    return _BLANK_RUN_RE.sub("\n\n", template).strip() + "\n"
+
+
+def _compile_template(template: str) -> str:
+    """Turn a normalized template into a ``str.format_map`` format string.
+
+    Literal braces (the JSON examples in the prompts) are doubled and each
+    ``[[NAME]]`` placeholder becomes ``{NAME}``. Format strings are built once at
+    import; the integrator serves from a single process, so there is no per-worker
+    copy to share.
+    """
+    escaped = template.replace("{", "{{").replace("}", "}}")
+    return _PLACEHOLDER_RE.sub(lambda m: "{%s}" % m.group(1), escaped)
+
+
+def _render(compiled: str, values: Dict[str, str]) -> str:
+    """Fill a compiled template in one C-level pass."""
+    return compiled.format_map(values)
+
+
+def _bind(compiled: str, name: str, value: str) -> str:
+    """Fill one placeholder of a compiled template, leaving the others for a later _render."""
+    escaped = value.replace("{", "{{").replace("}", "}}")
+    return compiled.replace("{%s}" % name, escaped)
+
+
+BytesTemplate = Tuple[Tuple[bytes, ...], Tuple[str, ...]]
+
+
+def _compile_template_bytes(template: str) -> BytesTemplate:
+    """Split a normalized template around its placeholders and pre-encode the static parts as UTF-8.
+
+    Returns ``(segments, placeholders)`` where ``len(segments) == len(placeholders) + 1``.
+    """
+    parts = _PLACEHOLDER_RE.split(template)
+    return tuple(part.encode("utf-8") for part in parts[0::2]), tuple(parts[1::2])
+
+
+def _render_bytes(compiled: BytesTemplate, values: Dict[str, bytes]) -> bytes:
+    """Interleave pre-encoded template segments with UTF-8 placeholder values."""
+    segments, placeholders = compiled
+    out = [b""] * (len(segments) + len(placeholders))
+    out[0::2] = segments
+    out[1::2] = [values[name] for name in placeholders]
+    return b"".join(out)
 
 
 CAN_TOOL_PROMPT_TEMPLATE = """
@@ -126,22 +224,100 @@ INPUT SCHEMA (RAW JSON):
 """
 
 
+CAN_TOOL_PROMPT_TEMPLATE = _normalize_template(CAN_TOOL_PROMPT_TEMPLATE)
+_CAN_TOOL_FMT = _compile_template(CAN_TOOL_PROMPT_TEMPLATE)
+_CAN_TOOL_SEGMENTS_B = _compile_template_bytes(CAN_TOOL_PROMPT_TEMPLATE)
+
+
+def _without_inputs(template: str) -> str:
+    """Derive the prompt variant for tools that take no parameters.
+
+    The input-schema rules (section 3) collapse to one line and the raw schema block is dropped.
+    """
+    head, rest = template.split("3. Strict, Canonical Inputs", 1)
+    _, tail = rest.split("4. Strict, Canonical Outputs", 1)
+    tail, _ = tail.split("\nINPUT SCHEMA (RAW JSON):", 1)
+    return (
+        head
+        + "3. Strict, Canonical Inputs (Tier 2 – Inputs)\n"
+        + 'This tool takes no input parameters. Set "inputs" to {"required": "none", "optional": "none"}.\n\n'
+        + "4. Strict, Canonical Outputs"
+        + tail
+    )
+
+
+CAN_TOOL_NO_INPUTS_TEMPLATE = _without_inputs(CAN_TOOL_PROMPT_TEMPLATE)
+_CAN_TOOL_NO_INPUTS_FMT = _compile_template(CAN_TOOL_NO_INPUTS_TEMPLATE)
+_CAN_TOOL_NO_INPUTS_SEGMENTS_B = _compile_template_bytes(CAN_TOOL_NO_INPUTS_TEMPLATE)
+
+
+def _is_trivial_schema(input_schema: Union[str, Dict[str, Any], None]) -> bool:
+    """True for empty schemas and object wrappers without any properties or required fields."""
+    if not input_schema:
+        return True
+    if isinstance(input_schema, str):
+        return input_schema.isspace()
+    return isinstance(input_schema, dict) and not input_schema.get("properties") and not input_schema.get("required")
+
+
 def build_can_tool_prompt(
     tool_name: str,    
     tool_description: str,
     input_schema: Union[str, Dict[str, Any]],
+    reformat: bool = False,
 ) -> str:
     """
     Builds a schema-aware capability extraction prompt using both description and JSON Schema.
+    A JSON string schema is embedded verbatim unless reformat=True; tools with a trivial
+    schema get the shorter no-inputs prompt.
     """
-    cleaned_desc = tool_description
-    schema_obj = _as_json(input_schema)
-    schema_raw = json.dumps(schema_obj, ensure_ascii=False, indent=2) if schema_obj else "{}"
+    if _is_trivial_schema(input_schema):
+        return _render(_CAN_TOOL_NO_INPUTS_FMT, {"TOOL_NAME": tool_name, "TOOL_DESCRIPTION": tool_description})
+    return build_can_tool_prompt_raw(tool_name, tool_description, _dump_arg(input_schema, "{}", reformat))
 
-    prompt_str = CAN_TOOL_PROMPT_TEMPLATE.replace("[[TOOL_DESCRIPTION]]", cleaned_desc)
-    prompt_str = prompt_str.replace("[[TOOL_NAME]]", tool_name)
-    prompt_str = prompt_str.replace("[[INPUT_SCHEMA_RAW]]", schema_raw)
-    return dedent(prompt_str).strip() + "\n"
+
+def build_can_tool_prompt_raw(
+    tool_name: str,
+    tool_description: str,
+    input_schema_raw: str,
+) -> str:
+    """
+    Same as build_can_tool_prompt, but takes the input schema as an already serialized JSON string.
+    Use this when the schema comes straight from the DB or a cache to skip the parse/dump round-trip.
+    """
+    return _render(_CAN_TOOL_FMT, {
+        "TOOL_NAME": tool_name,
+        "TOOL_DESCRIPTION": tool_description,
+        "INPUT_SCHEMA_RAW": input_schema_raw,
+    })
+
+
+def build_can_tool_prompt_bytes(
+    tool_name: str,
+    tool_description: str,
+    input_schema: Union[str, Dict[str, Any]],
+) -> bytes:
+    """
+    Same as build_can_tool_prompt, but returns the UTF-8 encoded prompt for callers that
+    post it straight to an HTTP LLM endpoint. The static template text is encoded once at
+    import, so only the tool fields are encoded per call.
+    """
+    if _is_trivial_schema(input_schema):
+        return _render_bytes(_CAN_TOOL_NO_INPUTS_SEGMENTS_B, {
+            "TOOL_NAME": tool_name.encode("utf-8"),
+            "TOOL_DESCRIPTION": tool_description.encode("utf-8"),
+        })
+
+    if isinstance(input_schema, (dict, list)):
+        schema_raw = _dumps_bytes(input_schema)
+    else:
+        schema_raw = _dump_arg(input_schema, "{}").encode("utf-8")
+
+    return _render_bytes(_CAN_TOOL_SEGMENTS_B, {
+        "TOOL_NAME": tool_name.encode("utf-8"),
+        "TOOL_DESCRIPTION": tool_description.encode("utf-8"),
+        "INPUT_SCHEMA_RAW": schema_raw,
+    })
 
 DOMAIN_CLASSIFER="""
 
@@ -277,6 +453,10 @@ Rules:
 """
 
 
+DOMAIN_CLASSIFER = _normalize_template(DOMAIN_CLASSIFER)
+_DOMAIN_FMT = _compile_template(DOMAIN_CLASSIFER)
+
+
 def build_domain_classifer_prompt(
     tool_json: Dict[str, Any],
     domains: List[Dict[str, Any]],
@@ -285,13 +465,46 @@ def build_domain_classifer_prompt(
     Builds a schema-aware capability extraction prompt using both description and JSON Schema.
     """
    
-    tool_raw = json.dumps(_as_json(tool_json), ensure_ascii=False, indent=2) if tool_json else "{}"
+    tool_raw = _dump_arg(tool_json, "{}")
+
+    domains_raw = _dump_arg(domains, "[]")
+
+    return build_domain_classifer_prompt_raw(tool_raw, domains_raw)
+
 
-    domains_raw = json.dumps(_as_json(domains), ensure_ascii=False, indent=2) if domains else "[]"
+def build_domain_classifer_prompt_raw(tool_raw: str, domains_raw: str) -> str:
+    """
+    Same as build_domain_classifer_prompt, but takes already serialized JSON strings.
+    """
+    return _render(_DOMAIN_FMT, {"TOOL_JSON": tool_raw, "DOMAINS_JSON": domains_raw})
+
+
+def build_domain_classifer_prompts(
+    tool_jsons: List[Dict[str, Any]],
+    domains: List[Dict[str, Any]],
+) -> List[str]:
+    """
+    Builds one domain classification prompt per tool against a shared domain list.
+    The domain list is serialized once for the whole batch; per tool only the tool
+    JSON is serialized and formatted into the precompiled template.
+    """
+    classify = make_domain_classifier(domains)
+    return [classify(tool_json) for tool_json in tool_jsons]
 
-    prompt_str = DOMAIN_CLASSIFER.replace("[[TOOL_JSON]]", tool_raw)
-    prompt_str = prompt_str.replace("[[DOMAINS_JSON]]", domains_raw)
-    return dedent(prompt_str).strip() + "\n"
+
+def make_domain_classifier(domains: List[Dict[str, Any]]) -> Callable[[Dict[str, Any]], str]:
+    """
+    Returns a prompt builder with the domain list already baked into the template, for
+    classification loops that run many tools against the same domains. Each call only
+    serializes the tool and fills its single placeholder.
+    """
+    domains_raw = _dump_arg(domains, "[]")
+    compiled = _bind(_DOMAIN_FMT, "DOMAINS_JSON", domains_raw)
+
+    def build(tool_json: Dict[str, Any]) -> str:
+        return _render(compiled, {"TOOL_JSON": _dump_arg(tool_json, "{}")})
+
+    return build
 
 CAPABILITY_CLASSIFER="""
 
@@ -395,6 +608,10 @@ Return a single JSON object structured as:
 """
 
 
+CAPABILITY_CLASSIFER = _normalize_template(CAPABILITY_CLASSIFER)
+_CAPABILITY_FMT = _compile_template(CAPABILITY_CLASSIFER)
+
+
 def build_capability_classifer_prompt(
     tool_json: Dict[str, Any],
     capabilities: List[Dict[str, Any]],
@@ -403,13 +620,44 @@ def build_capability_classifer_prompt(
     Builds a schema-aware capability extraction prompt using both description and JSON Schema.
     """
    
-    tool_raw = json.dumps(_as_json(tool_json), ensure_ascii=False, indent=2) if tool_json else "{}"
+    tool_raw = _dump_arg(tool_json, "{}")
+
+    capabilities_raw = _dump_arg(capabilities, "[]")
+
+    return build_capability_classifer_prompt_raw(tool_raw, capabilities_raw)
+
+
+def build_capability_classifer_prompt_raw(tool_raw: str, capabilities_raw: str) -> str:
+    """
+    Same as build_capability_classifer_prompt, but takes already serialized JSON strings.
+    """
+    return _render(_CAPABILITY_FMT, {"TOOL_JSON": tool_raw, "CAPABILITIES_JSON": capabilities_raw})
 
-    capabilities_raw = json.dumps(_as_json(capabilities), ensure_ascii=False, indent=2) if capabilities else "[]"
 
-    prompt_str = CAPABILITY_CLASSIFER.replace("[[TOOL_JSON]]", tool_raw)
-    prompt_str = prompt_str.replace("[[CAPABILITIES_JSON]]", capabilities_raw)
-    return dedent(prompt_str).strip() + "\n"
+def build_capability_classifer_prompts(
+    tool_jsons: List[Dict[str, Any]],
+    capabilities: List[Dict[str, Any]],
+) -> List[str]:
+    """
+    Builds one capability classification prompt per tool against a shared capability list.
+    The capability list is serialized once for the whole batch; per tool only the tool
+    JSON is serialized and formatted into the precompiled template.
+    """
+    classify = make_capability_classifier(capabilities)
+    return [classify(tool_json) for tool_json in tool_jsons]
+
+
+def make_capability_classifier(capabilities: List[Dict[str, Any]]) -> Callable[[Dict[str, Any]], str]:
+    """
+    Returns a prompt builder with the capability list already baked into the template.
+    """
+    capabilities_raw = _dump_arg(capabilities, "[]")
+    compiled = _bind(_CAPABILITY_FMT, "CAPABILITIES_JSON", capabilities_raw)
+
+    def build(tool_json: Dict[str, Any]) -> str:
+        return _render(compiled, {"TOOL_JSON": _dump_arg(tool_json, "{}")})
+
+    return build
 
 
 
@@ -661,6 +909,10 @@ If ANY check fails, the workflow is INVALID, return []
 """
 
 
+TOOL_REL_PROMPT = _normalize_template(TOOL_REL_PROMPT)
+_TOOL_REL_FMT = _compile_template(TOOL_REL_PROMPT)
+
+
 def build_tool_rel_prompt(
     src_tool_json: Dict[str, Any],
     target_tool_list: List[Dict[str, Any]],
@@ -669,13 +921,18 @@ def build_tool_rel_prompt(
     Builds a tool_rel extraction prompt 
     """
    
-    src_tool_raw = json.dumps(_as_json(src_tool_json), ensure_ascii=False, indent=2) if src_tool_json else "{}"
+    src_tool_raw = _dump_arg(src_tool_json, "{}")
 
-    target_tool_list_raw = json.dumps(_as_json(target_tool_list), ensure_ascii=False, indent=2) if target_tool_list else "[]"
+    target_tool_list_raw = _dump_arg(target_tool_list, "[]")
 
-    prompt_str = TOOL_REL_PROMPT.replace("[[SOURCE_TOOL]]", src_tool_raw)
-    prompt_str = prompt_str.replace("[[TARGET_TOOLS]]", target_tool_list_raw)
-    return dedent(prompt_str).strip() + "\n"
+    return build_tool_rel_prompt_raw(src_tool_raw, target_tool_list_raw)
+
+
+def build_tool_rel_prompt_raw(src_tool_raw: str, target_tool_list_raw: str) -> str:
+    """
+    Same as build_tool_rel_prompt, but takes already serialized JSON strings.
+    """
+    return _render(_TOOL_REL_FMT, {"SOURCE_TOOL": src_tool_raw, "TARGET_TOOLS": target_tool_list_raw})
 
 SKILL_EXTRACT_PROMPT="""
 SYSTEM INSTRUCTIONS: Skill Extraction From Tool Chains  
@@ -859,15 +1116,26 @@ Inputs for Tool Chains
 
 
 
+SKILL_EXTRACT_PROMPT = _normalize_template(SKILL_EXTRACT_PROMPT)
+# single placeholder: the prompt is prefix + tool chains + suffix, no format parsing per call
+_SKILL_EXTRACT_PREFIX, _SKILL_EXTRACT_SUFFIX = SKILL_EXTRACT_PROMPT.split("[[TOOL_CHAINS]]", 1)
+
+
 def build_skill_exract_prompt(
     tool_chains: List[Dict[str, Any]],
 ) -> str:
     """
     Builds a tool_rel extraction prompt 
     """
-    src_chain_raw = json.dumps(([asdict(c) for c in tool_chains]), ensure_ascii=False, indent=2) if tool_chains else "{}"
-    prompt_str = SKILL_EXTRACT_PROMPT.replace("[[TOOL_CHAINS]]", src_chain_raw)
-    return dedent(prompt_str).strip() + "\n"
+    src_chain_raw = _dumps(tool_chains) if tool_chains else "{}"
+    return build_skill_exract_prompt_raw(src_chain_raw)
+
+
+def build_skill_exract_prompt_raw(tool_chains_raw: str) -> str:
+    """
+    Same as build_skill_exract_prompt, but takes the tool chains as an already serialized JSON string.
+    """
+    return "".join((_SKILL_EXTRACT_PREFIX, tool_chains_raw, _SKILL_EXTRACT_SUFFIX))
 
 
 OP_MATCH_TEMPLATE = """
@@ -937,6 +1205,13 @@ OUTPUT (strict)
 """
 
 
+OP_MATCH_TEMPLATE = _normalize_template(OP_MATCH_TEMPLATE)
+# two placeholders: head + target + middle + candidates + tail
+_OP_MATCH_HEAD, _rest = OP_MATCH_TEMPLATE.split("[[TARGET_OPERATION_JSON]]", 1)
+_OP_MATCH_MIDDLE, _OP_MATCH_TAIL = _rest.split("[[CANDIDATE_OPERATIONS_JSON]]", 1)
+del _rest
+
+
 def build_op_match_prompt(
     target_op: Union[str, Dict[str, Any]],
 
@@ -945,12 +1220,15 @@ def build_op_match_prompt(
     """
     Builds a schema-aware capability extraction prompt using both description and JSON Schema.
     """
-    target_obj = _as_json(target_op)
-    target_raw = json.dumps(target_obj, ensure_ascii=False, indent=2) if target_obj else "{}"
+    target_raw = _dump_arg(target_op, "{}")
+
+    candidate_raw = _dump_arg(candidate_ops, "{}")
 
-    candidate_obj = _as_json(candidate_ops)
-    candidate_raw = json.dumps(candidate_obj, ensure_ascii=False, indent=2) if candidate_obj else "{}"
+    return build_op_match_prompt_raw(target_raw, candidate_raw)
 
-    prompt_str = OP_MATCH_TEMPLATE.replace("[[TARGET_OPERATION_JSON]]", target_raw)
-    prompt_str = prompt_str.replace("[[CANDIDATE_OPERATIONS_JSON]]", candidate_raw)
-    return dedent(prompt_str).strip() + "\n"
+
+def build_op_match_prompt_raw(target_raw: str, candidate_raw: str) -> str:
+    """
+    Same as build_op_match_prompt, but takes already serialized JSON strings.
+    """
+    return "".join((_OP_MATCH_HEAD, target_raw, _OP_MATCH_MIDDLE, candidate_raw, _OP_MATCH_TAIL))
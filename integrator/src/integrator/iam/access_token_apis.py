@@ -1,18 +1,26 @@
-from fastapi import APIRouter, Request, HTTPException, Depends, status, Path
+from fastapi import APIRouter, BackgroundTasks, Request, HTTPException, Depends, status, Path, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
 from pydantic import BaseModel, model_validator
+from dataclasses import dataclass, fields
 import uuid
 from datetime import datetime
 
-from integrator.utils.db import get_db
-from sqlalchemy.orm import Session
+from integrator.utils.db import get_async_db, transactional_db, AsyncSessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
-from sqlalchemy import select, delete
+from sqlalchemy import bindparam, literal, select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
 
 from integrator.utils.oauth import validate_token
-from integrator.iam.iam_db_model import ProviderToken
+from integrator.iam.iam_db_model import AuthProvider, ProviderToken
+from integrator.utils.logger import get_logger
 
+logger = get_logger(__name__)
 
-oauth_router = APIRouter(prefix="/oauth", tags=["oauth"])
+
+oauth_router = APIRouter(prefix="/oauth", tags=["oauth"], default_response_class=ORJSONResponse)
 
 
 from typing import Dict, Any, Optional, List
@@ -35,7 +43,9 @@ class ProviderTokenPayload(BaseModel):
     agent_id: str  # Now required for identifying the record
     username: Optional[str] = None # Username is optional, can be updated if provided
 
-class ProviderTokenResponse(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class ProviderTokenResponse:
+    """Output-only shape built from trusted rows; orjson serializes it natively, no validation."""
     id: uuid.UUID
     provider_id: str
     tenant_name: str
@@ -45,74 +55,134 @@ class ProviderTokenResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+
+_TOKEN_RESPONSE_FIELDS = tuple(f.name for f in fields(ProviderTokenResponse))
+
+
+def _token_dict(token: ProviderToken) -> Dict[str, Any]:
+    """Read the response fields straight off a ProviderToken row; orjson encodes UUIDs and datetimes."""
+    return {name: getattr(token, name) for name in _TOKEN_RESPONSE_FIELDS}
+
+
+def _token_response(token: ProviderToken) -> ProviderTokenResponse:
+    """Build the response DTO from a ProviderToken row."""
+    return ProviderTokenResponse(**_token_dict(token))
 
 class ProviderTokenDeletePayload(BaseModel):
     provider_id: str
     tenant_name: str
     agent_id: str # Now required for deletion
 
-@oauth_router.put("/update_credential/providers/{provider}")
-def upasyncdate_oauth_credential(
+async def upsert_provider_token(db: AsyncSession, payload: ProviderTokenPayload) -> ProviderToken:
+    """
+    Inserts or updates the token identified by (provider_id, agent_id, tenant_name) in a single
+    INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement, backed by uq_provider_agent_tenant.
+    An existing username is kept when the payload does not carry one. The caller commits.
+    """
+    stmt = pg_insert(ProviderToken).values(
+        provider_id=payload.provider_id,
+        tenant_name=payload.tenant_name,
+        agent_id=payload.agent_id,
+        token=payload.token,
+        username=payload.username,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ProviderToken.provider_id, ProviderToken.agent_id, ProviderToken.tenant_name],
+        set_={
+            "token": stmt.excluded.token,
+            "username": func.coalesce(stmt.excluded.username, ProviderToken.username),
+            "updated_at": func.now(),
+        },
+    ).returning(ProviderToken)
+
+    result = await db.execute(stmt)
+    return result.scalar_one()
+
+
+async def _persist_provider_token(payload: ProviderTokenPayload) -> None:
+    """Background upsert for acknowledged credential updates; runs on its own session."""
+    async with AsyncSessionLocal() as db:
+        try:
+            await upsert_provider_token(db, payload)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.error(f"Failed to persist provider token for provider '{payload.provider_id}', agent '{payload.agent_id}', tenant '{payload.tenant_name}': {str(e)}")
+
+
+# The upsert's foreign-key target: an auth provider row implies its tenant exists too.
+_AUTH_PROVIDER_EXISTS = select(literal(1)).where(
+    AuthProvider.tenant_name == bindparam("tenant_name"),
+    AuthProvider.provider_id == bindparam("provider_id"),
+).limit(1)
+
+
+@oauth_router.put("/update_credential/providers/{provider}", status_code=status.HTTP_202_ACCEPTED)
+async def upasyncdate_oauth_credential(
     provider: str,
     payload: ProviderTokenPayload,
     req: Request,
+    background: BackgroundTasks,
     _: dict = Depends(validate_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
     ):
+        """
+        Acknowledges the credential update by echoing the payload and persists it after the
+        response is sent.
+
+        The tenant and provider are checked before the update is accepted, so a 202 is only
+        returned for a write whose foreign keys resolve. The write is eventually consistent:
+        a GET issued immediately afterwards may still see the previous token for the short
+        window until the background upsert commits. Callers that need read-after-write should
+        use POST /provider_tokens instead.
+        """
         if not provider:
             raise HTTPException(status_code=404, detail=f"Unsupported service: {provider}")
 
-        try:
-            existing_token = db.query(ProviderToken).filter_by(
-                provider_id=payload.provider_id,
-                tenant_name=payload.tenant_name,
-                agent_id=payload.agent_id
-            ).first()
-
-            if existing_token:
-                # Token found, update it
-                existing_token.token = payload.token
-                if payload.username is not None:
-                    existing_token.username = payload.username
-                existing_token.updated_at = func.now()
-                db.commit()
-                db.refresh(existing_token)
-                return existing_token
-            else:
-                # Token not found, insert a new one
-                new_token_data = {
-                    "provider_id": payload.provider_id,
-                    "tenant_name": payload.tenant_name,
-                    "agent_id": payload.agent_id,
-                    "token": payload.token,
-                    "username": payload.username,
-                    "updated_at": func.now()
-                }
-                db_token = ProviderToken(**new_token_data)
-                db.add(db_token)
-                db.commit()
-                db.refresh(db_token)
-                return db_token
-        except HTTPException:
-            raise
-        except Exception as e:
-            db.rollback()
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An unexpected database error occurred: {str(e)}")
+        known = await db.scalar(
+            _AUTH_PROVIDER_EXISTS,
+            {"tenant_name": payload.tenant_name, "provider_id": payload.provider_id},
+        )
+        if known is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Provider '{payload.provider_id}' not found in tenant '{payload.tenant_name}'",
+            )
+
+        background.add_task(_persist_provider_token, payload)
+        return payload.model_dump()
 
 
 
 
 #    return {"status": "success", "message": f"Credential for {provider} updated successfully."}
 
-# Router for provider tokens
-provider_token_router = APIRouter(prefix="/provider_tokens", tags=["Provider Tokens"])
+# Exact-key statements over uq_provider_agent_tenant, built once at import time so the
+# per-request cost is just binding parameters; the compiled form is reused from
+# SQLAlchemy's statement cache.
+_SELECT_TOKEN_BY_KEY = select(ProviderToken).where(
+    ProviderToken.tenant_name == bindparam("tenant_name"),
+    ProviderToken.provider_id == bindparam("provider_id"),
+    ProviderToken.agent_id == bindparam("agent_id"),
+)
+_DELETE_TOKEN_BY_KEY = delete(ProviderToken).where(
+    ProviderToken.provider_id == bindparam("provider_id"),
+    ProviderToken.tenant_name == bindparam("tenant_name"),
+    ProviderToken.agent_id == bindparam("agent_id"), # Deletion is now strictly by these three
+).execution_options(synchronize_session=False)
 
-@provider_token_router.post("", response_model=ProviderTokenResponse, status_code=status.HTTP_201_CREATED)
+# Router for provider tokens
+provider_token_router = APIRouter(prefix="/provider_tokens", tags=["Provider Tokens"], default_response_class=ORJSONResponse)
+
+@provider_token_router.post(
+    "",
+    response_model=None,
+    responses={status.HTTP_201_CREATED: {"model": ProviderTokenResponse}},
+    status_code=status.HTTP_201_CREATED,
+)
 async def add_or_update_provider_token(
     payload: ProviderTokenPayload,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(transactional_db),
      user: dict = Depends(validate_token) # Assuming authentication is needed
 ):
     """
@@ -129,71 +199,51 @@ async def add_or_update_provider_token(
         - A new token record is created with all details from the payload (`provider_id`, `tenant_name`,
           `agent_id`, `token`, and `username` if provided).
     """
-    try:
-        existing_token = db.query(ProviderToken).filter_by(
-            provider_id=payload.provider_id,
-            tenant_name=payload.tenant_name,
-            agent_id=payload.agent_id
-        ).first()
-
-        if existing_token:
-            # Token found, update it
-            existing_token.token = payload.token
-            if payload.username is not None:
-                existing_token.username = payload.username
-            existing_token.updated_at = func.now()
-            db.commit()
-            db.refresh(existing_token)
-            return existing_token
-        else:
-            # Token not found, insert a new one
-            new_token_data = {
-                "provider_id": payload.provider_id,
-                "tenant_name": payload.tenant_name,
-                "agent_id": payload.agent_id,
-                "token": payload.token,
-                "username": payload.username,
-                "updated_at": func.now()
-            }
-            db_token = ProviderToken(**new_token_data)
-            db.add(db_token)
-            db.commit()
-            db.refresh(db_token)
-            return db_token
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An unexpected database error occurred: {str(e)}")
-
-@provider_token_router.get("/tenants/{tenant_name}/providers/{provider_id}/agents/{agent_id}", response_model=ProviderTokenResponse)
+    db_token = await upsert_provider_token(db, payload)
+    return ORJSONResponse(content=_token_response(db_token), status_code=status.HTTP_201_CREATED)
+
+@provider_token_router.get(
+    "/tenants/{tenant_name}/providers/{provider_id}/agents/{agent_id}",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": ProviderTokenResponse}},
+)
 async def get_specific_provider_token(
     tenant_name: str = Path(..., description="The name of the tenant"),
     provider_id: str = Path(..., description="The ID of the provider"),
     agent_id: str = Path(..., description="The ID of the agent"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     # user: dict = Depends(validate_token) # Assuming authentication is needed
 ):
     """
     Get a specific provider token by tenant_name, provider_id, and agent_id.
     """
-    token = db.query(ProviderToken).filter_by(
-        tenant_name=tenant_name,
-        provider_id=provider_id,
-        agent_id=agent_id
-    ).first()
+    token = await db.scalar(
+        _SELECT_TOKEN_BY_KEY,
+        {"tenant_name": tenant_name, "provider_id": provider_id, "agent_id": agent_id},
+    )
 
     if not token:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Provider token not found for the given tenant, provider, and agent.")
-    return token
+    return ORJSONResponse(content=_token_response(token))
 
-@provider_token_router.get("", response_model=List[ProviderTokenResponse])
+# Page size of the token list when the caller does not pass a limit
+DEFAULT_TOKEN_PAGE_SIZE = 100
+
+
+@provider_token_router.get(
+    "",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": List[ProviderTokenResponse]}},
+)
 async def get_provider_tokens_by_user_or_agent( # Renamed for clarity
     username: Optional[str] = None,
     agent_id: Optional[str] = None,
     tenant_name: Optional[str] = None,
     provider_id: Optional[str] = None,
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of tokens to return (100 per page by default; a stream is only capped when set)"),
+    cursor: Optional[uuid.UUID] = Query(None, description="Return tokens after this id (the last id of the previous page)"),
+    stream: bool = Query(False, description="Stream matching tokens as NDJSON instead of one page"),
+    db: AsyncSession = Depends(get_async_db),
     # user: dict = Depends(validate_token) # Assuming authentication is needed
 ):
     """
@@ -202,6 +252,11 @@ async def get_provider_tokens_by_user_or_agent( # Renamed for clarity
     Can optionally filter by `tenant_name` and `provider_id`.
     If neither username nor agent_id is provided, it might return all tokens (consider security implications).
     For more targeted queries, use the specific GET endpoint.
+
+    Results are ordered by `id` and paged with keyset pagination: a page holds at most `limit`
+    tokens (100 by default, 1000 at most); pass the last `id` of a page as `cursor` to get the
+    next one. With `stream=true` the matching tokens after `cursor` (at most `limit` when given)
+    are streamed as `application/x-ndjson`, one token per line, without loading them all in memory.
     """
     # Consider if requiring at least one of username or agent_id is still desired for this broader query
     # if not username and not agent_id:
@@ -217,30 +272,42 @@ async def get_provider_tokens_by_user_or_agent( # Renamed for clarity
     if provider_id:
         stmt = stmt.where(ProviderToken.provider_id == provider_id)
 
-    result = db.execute(stmt)
+    if cursor:
+        stmt = stmt.where(ProviderToken.id > cursor)
+    stmt = stmt.order_by(ProviderToken.id)
+
+    if stream:
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return StreamingResponse(_ndjson_tokens(stmt), media_type="application/x-ndjson")
+
+    result = await db.execute(stmt.limit(limit or DEFAULT_TOKEN_PAGE_SIZE))
     tokens = result.scalars().all()
-    return tokens
+    return ORJSONResponse(content=[_token_response(t) for t in tokens])
+
+
+async def _ndjson_tokens(stmt):
+    """Yield one NDJSON line per token, fetching rows in batches.
+
+    Uses its own session: the request-scoped one is closed before a streaming body is sent.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream_scalars(stmt.execution_options(yield_per=500))
+        async for token in result:
+            yield orjson.dumps(_token_dict(token)) + b"\n"
 
 @provider_token_router.delete("", status_code=status.HTTP_204_NO_CONTENT) # Consider changing path for specificity
 async def delete_provider_token(
     payload: ProviderTokenDeletePayload, # Payload now contains provider_id, tenant_name, agent_id
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(transactional_db),
     # user: dict = Depends(validate_token) # Assuming authentication is needed
 ):
     """
     Delete a provider token based on provider_id, tenant_name, and agent_id.
     """
-    stmt = delete(ProviderToken).where(
-        ProviderToken.provider_id == payload.provider_id,
-        ProviderToken.tenant_name == payload.tenant_name,
-        ProviderToken.agent_id == payload.agent_id # Deletion is now strictly by these three
+    result = await db.execute(
+        _DELETE_TOKEN_BY_KEY,
+        {"provider_id": payload.provider_id, "tenant_name": payload.tenant_name, "agent_id": payload.agent_id},
     )
-
-    try:
-        result = db.execute(stmt)
-        db.commit()
-        if result.rowcount == 0:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Token not found for the given provider_id, tenant_name, and agent_id.")
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Database error during deletion: {str(e)}")
+    if result.rowcount == 0:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Token not found for the given provider_id, tenant_name, and agent_id.")
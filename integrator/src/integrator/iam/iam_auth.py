@@ -1,94 +1,179 @@
+import threading
+import time
+from collections import OrderedDict
+from operator import methodcaller
+
 from integrator.utils.logger import get_logger
-from integrator.iam.iam_db_crud import get_agents_by_username, get_user_by_username, get_agent_by_agent_id
+from integrator.iam.iam_db_crud import get_agent_ids_by_username, get_matching_agent_ids, user_exists, agent_exists
 
 logger = get_logger(__name__)
 
+# Lookups repeated on every authenticated request. Only hits (non-empty agent id sets,
+# existing users/agents) are cached; writes to users, agents or user_agent call
+# invalidate_auth_cache so revocations do not wait for the TTL.
+AUTH_LOOKUP_CACHE_SIZE = 10_000
+AUTH_LOOKUP_TTL = 30.0
+
+
+class _TTLCache:
+    """Thread-safe LRU whose entries also expire ``ttl`` seconds after insertion."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            expires_at, value = hit
+            if expires_at <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_agent_ids_by_username_cache = _TTLCache(AUTH_LOOKUP_CACHE_SIZE, AUTH_LOOKUP_TTL)
+_agent_exists_cache = _TTLCache(AUTH_LOOKUP_CACHE_SIZE, AUTH_LOOKUP_TTL)
+_user_exists_cache = _TTLCache(AUTH_LOOKUP_CACHE_SIZE, AUTH_LOOKUP_TTL)
+
+
+def _cached_agent_ids(sess, username, tenant_name):
+    key = (username, tenant_name)
+    agent_ids = _agent_ids_by_username_cache.get(key)
+    if agent_ids is None:
+        agent_ids = get_agent_ids_by_username(sess, username, tenant_name)
+        if agent_ids:
+            _agent_ids_by_username_cache.set(key, agent_ids)
+    return agent_ids
+
+
+def _cached_agent_exists(sess, agent_id, tenant_name):
+    key = (agent_id, tenant_name)
+    if _agent_exists_cache.get(key):
+        return True
+    if agent_exists(sess, agent_id, tenant_name):
+        _agent_exists_cache.set(key, True)
+        return True
+    return False
+
+
+def _cached_user_exists(sess, username, tenant_name):
+    key = (username, tenant_name)
+    if _user_exists_cache.get(key):
+        return True
+    if user_exists(sess, username, tenant_name):
+        _user_exists_cache.set(key, True)
+        return True
+    return False
+
+
+def invalidate_auth_cache(tenant_name, username=None, agent_id=None):
+    """Drop cached auth lookups after users, agents or their user_agent links change."""
+    if username is not None:
+        _agent_ids_by_username_cache.pop((username, tenant_name))
+        _user_exists_cache.pop((username, tenant_name))
+    if agent_id is not None:
+        _agent_exists_cache.pop((agent_id, tenant_name))
+        # agent id sets are keyed by username; an agent can appear under any of them
+        _agent_ids_by_username_cache.clear()
+
+
 def get_auth_agent(sess, payload, tenant_name):
 
-    user_type=payload.get("user_type")
-    client_type=payload.get("client_type")
-    scope=payload.get("scope")
-    username = payload.get("preferred_username")
-    x_agent_id=payload.get("x_agent_id")
+    pg = payload.get
+    user_type = pg("user_type")
+    scope = pg("scope")
 
+    # Agent tokens name themselves: no further claims or DB reads needed.
     if user_type=="agent":
-        return username, scope
-    elif user_type=="human" and x_agent_id:
+        return pg("preferred_username"), scope
 
-        agents = get_agents_by_username(sess, username, tenant_name)
-        if not agents:
+    if user_type=="human":
+        x_agent_id = pg("x_agent_id")
+        if x_agent_id:
+            if x_agent_id in _cached_agent_ids(sess, pg("preferred_username"), tenant_name):
+                return x_agent_id, scope
             return None, None
 
-        for agent in agents:
-            if agent.get("agent_id")==x_agent_id:
-                return x_agent_id, scope
-        return None, None
-    elif client_type=="agent":
-        return payload.get("azp"), scope    
-    else:
-        return None, None
+    if pg("client_type")=="agent":
+        return pg("azp"), scope
+    return None, None
+
+
+def _agent_principal(payload):
+    return payload.get("preferred_username") or payload.get("azp")
+
+
+# validate_tenant dispatch: claim getter + existence check. A token's user_type decides
+# first ("agent" names an agent, any other value a user); tokens without one fall back
+# to client_type ("agent" service clients), then to the x_agent_id claim.
+_USER_TYPE_TENANT_CHECKS = {
+    "agent": (_agent_principal, _cached_agent_exists),
+}
+_DEFAULT_USER_TENANT_CHECK = (methodcaller("get", "preferred_username"), _cached_user_exists)
+_CLIENT_TYPE_TENANT_CHECKS = {
+    "agent": (methodcaller("get", "client_id"), _cached_agent_exists),
+}
+_DEFAULT_CLIENT_TENANT_CHECK = (methodcaller("get", "x_agent_id"), _cached_agent_exists)
+
+
 def validate_tenant(sess, payload, tenant_name):
 
-    user_type=payload.get("user_type")
-    username = payload.get("preferred_username")
-    client_type=payload.get("client_type")
+    user_type = payload.get("user_type")
     if user_type:
-        user_id=None
-        if not username and user_type=="agent":
-            user_id=payload.get("azp")
-        else:
-            user_id=username
-        if user_type=="agent":
-            if get_agent_by_agent_id(sess, user_id, tenant_name):
-                return True
-            else:
-                return False
-
-        else:    
-            if get_user_by_username(sess, user_id, tenant_name):
-                return True
-            else:
-                return False
-
+        principal, exists = _USER_TYPE_TENANT_CHECKS.get(user_type, _DEFAULT_USER_TENANT_CHECK)
     else:
-        agent_id=None
-        if client_type =="agent":
-            agent_id=payload.get("client_id")
-        else:
-            agent_id=payload.get("x_agent_id")
-        if get_agent_by_agent_id(sess, agent_id, tenant_name):
-            return True
-        else:
-            return False            
-    return False
+        principal, exists = _CLIENT_TYPE_TENANT_CHECKS.get(payload.get("client_type"), _DEFAULT_CLIENT_TENANT_CHECK)
+    return exists(sess, principal(payload), tenant_name)
 
-def validate_agent_id(sess, payload, agent_id):
+def validate_agent_ids(sess, payload, agent_ids):
+    """Return the subset of ``agent_ids`` the token may act as, with at most one query."""
 
-    user_type=payload.get("user_type")
-    client_type=payload.get("client_type")
-    scope=payload.get("scope")
-    username = payload.get("preferred_username")
+    pg = payload.get
+    user_type = pg("user_type")
+    username = pg("preferred_username")
 
-    if user_type=="agent" and username==agent_id:
-        return True
-    elif user_type=="human":
+    if user_type=="human":
         # Get user to extract tenant_name
-        user_obj = get_user_by_username(sess, username, "default")  # TODO: Get actual tenant from context
-        if not user_obj:
-            return False
-        
-        tenant_name = user_obj.tenant_name
-        agents = get_agents_by_username(sess, username, tenant_name)
-        if not agents:
-            return False
-
-        for agent in agents:
-            if agent.get("agent_id")==agent_id:
-                return True
-        return False
-    elif client_type=="agent" and payload.get("azp")== agent_id:    
-        return True
-    else:
-        return False
-    
+        tenant_name = "default"  # TODO: Get actual tenant from context
+        if not _cached_user_exists(sess, username, tenant_name):
+            return set()
 
+        known = _agent_ids_by_username_cache.get((username, tenant_name))
+        if known is not None:
+            return known & set(agent_ids)
+        return set(get_matching_agent_ids(sess, username, tenant_name, agent_ids))
+
+    # An agent token may act as itself by preferred_username; tokens of agent service
+    # clients (agent tokens included) may also act as their azp.
+    allowed = set()
+    if user_type=="agent":
+        allowed.add(username)
+    if pg("client_type")=="agent":
+        allowed.add(pg("azp"))
+    return allowed & set(agent_ids)
+
+
+def validate_agent_id(sess, payload, agent_id):
+    return agent_id in validate_agent_ids(sess, payload, (agent_id,))
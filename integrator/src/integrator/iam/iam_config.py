@@ -0,0 +1,15 @@
+import functools
+import os
+
+import orjson
+
+# Seed config shared by iam_keycloak_crud.main() and iam_db_crud.main(). Kept in its own module
+# so the DB-side init does not import the Keycloak admin client to read it.
+IAM_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '../../..', 'init', 'init_iam.json')
+
+
+@functools.lru_cache(maxsize=1)
+def load_iam_config():
+    """Parse init/init_iam.json once per process. Callers must treat the result as read-only."""
+    with open(IAM_CONFIG_PATH, "rb") as f:
+        return orjson.loads(f.read())
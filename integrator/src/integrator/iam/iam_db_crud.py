@@ -1,45 +1,68 @@
 import logging
 import os
 import json
+import orjson
 import uuid
-from datetime import datetime, timezone
-from sqlalchemy import select, func
-from typing import List, Optional
-from integrator.iam.iam_db_model import Tenant, Agent, User, AuthProvider, Role, RoleDomain, AgentProfile, UserAgent, RoleAgent
-from integrator.tools.tool_db_crud import upsert_application, upsert_app_key
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import insert, select, func, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional
+from integrator.iam.iam_db_model import Tenant, Agent, User, AuthProvider, Role, RoleDomain, AgentProfile, UserAgent, RoleAgent, RoleUser, EmbeddingCache
+from integrator.domains.domain_db_model import Domain, DomainCapability
+from integrator.tools.tool_db_model import CapabilityTool
+from integrator.tools.tool_db_crud import bulk_upsert_applications, bulk_upsert_app_keys
 from integrator.utils.db import get_db_cm
 from integrator.utils.crypto_utils import encrypt
 from integrator.utils.host import generate_host_id
+from integrator.iam.iam_config import load_iam_config
 
 logger = logging.getLogger(__name__)
 
 def upsert_tenant(sess, tenant_data):
-    tenant = sess.execute(
-        select(Tenant).where(Tenant.name == tenant_data["name"])
-    ).scalar_one_or_none()
-    if not tenant:
-        tenant = Tenant(
-            name=tenant_data["name"],
-            description=tenant_data.get("description", "")
-        )
-        sess.add(tenant)
-        logger.info(f"Inserted new tenant. name: {tenant.name}")
-    else:
-        tenant.description = tenant_data.get("description", "")
-        logger.info(f"Updated existing tenant, name: {tenant.name}")
+    """
+    Insert or update a tenant with a single INSERT ... ON CONFLICT (name) DO UPDATE, so no
+    SELECT round trip and no pending ORM object that later Core statements would have to flush.
+    """
+    stmt = pg_insert(Tenant).values(
+        name=tenant_data["name"],
+        description=tenant_data.get("description", "")
+    )
+    sess.execute(stmt.on_conflict_do_update(
+        index_elements=[Tenant.name],
+        set_={"description": stmt.excluded.description},
+    ))
+    logger.info("Upserted tenant. name: %s", tenant_data["name"])
 
-def upsert_agent(sess, agent_data, tenant_name):
-    from integrator.iam.iam_db_model import AgentProfile
-    
-    agent_id = agent_data.get("name") or agent_data.get("agent_id") or agent_data.get("username")
+# Rows per multi-row INSERT ... ON CONFLICT statement in the bulk_upsert_* helpers; keeps
+# each statement well under the driver's bind-parameter limits.
+BULK_UPSERT_CHUNK_SIZE = 1000
+
+
+def _chunks(rows, size=BULK_UPSERT_CHUNK_SIZE):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _dedupe(rows, key):
+    """Keep the last row per key: ON CONFLICT DO UPDATE cannot touch the same row twice in one statement."""
+    return list({tuple(row[k] for k in key): row for row in rows}.values())
+
+
+def _agent_id_of(agent_data):
+    return agent_data.get("name") or agent_data.get("agent_id") or agent_data.get("username")
+
+
+def _agent_values(agent_data, tenant_name):
+    """Column values for an agent entry of the IAM config, with its secret encrypted; None if it has no id."""
+    agent_id = _agent_id_of(agent_data)
     if not agent_id:
         logger.warning("Skipping agent with no name or agent_id.")
-        return
+        return None
     secret = agent_data.get("secret")
     if not secret and agent_data.get("credentials", []):
         secret=agent_data.get("credentials", [])[0].get("value")
 
-      
     encrypted_secret = None
     iv = None
     if secret:
@@ -48,14 +71,63 @@ def upsert_agent(sess, agent_data, tenant_name):
             encrypted_secret = encrypted_info["encryptedData"]
             iv = encrypted_info["iv"]
         except Exception as e:
-            logger.warning(f"Could not encrypt secret for agent '{agent_id}': {e}")
+            logger.warning("Could not encrypt secret for agent '%s': %s", agent_id, e)
+
+    return {
+        "agent_id": agent_id,
+        "tenant_name": tenant_name,
+        "name": agent_data.get("name", agent_id),
+        "encrypted_secret": encrypted_secret,
+        "iv": iv,
+    }
 
-    agent = sess.execute(
+
+def prefetch_agents(sess, agents_data, tenant_name) -> dict:
+    """
+    Load the existing agents for a batch of agent entries with one IN query, keyed by agent_id,
+    for passing to upsert_agent as ``existing``.
+    
+    Args:
+        sess: SQLAlchemy session
+        agents_data: Agent entries, resolved to agent_ids the same way upsert_agent does
+        tenant_name: Tenant name for isolation
+    """
+    agent_ids = {agent_id for agent_id in map(_agent_id_of, agents_data) if agent_id}
+    if not agent_ids:
+        return {}
+    agents = sess.execute(
         select(Agent).where(
-            (Agent.agent_id == agent_id) &
-            (Agent.tenant_name == tenant_name)
+            (Agent.tenant_name == tenant_name) &
+            Agent.agent_id.in_(agent_ids)
         )
-    ).scalar_one_or_none()
+    ).scalars()
+    return {agent.agent_id: agent for agent in agents}
+
+
+def upsert_agent(sess, agent_data, tenant_name, existing: Optional[dict] = None):
+    """
+    Insert or update an agent and make sure it has an AgentProfile.
+
+    ``existing`` is an optional {agent_id: Agent} map from prefetch_agents; when given, the
+    per-agent SELECT is skipped and newly inserted agents are added to it.
+    """
+    
+    values = _agent_values(agent_data, tenant_name)
+    if values is None:
+        return
+    agent_id = values["agent_id"]
+    encrypted_secret = values["encrypted_secret"]
+    iv = values["iv"]
+
+    if existing is not None:
+        agent = existing.get(agent_id)
+    else:
+        agent = sess.execute(
+            select(Agent).where(
+                (Agent.agent_id == agent_id) &
+                (Agent.tenant_name == tenant_name)
+            )
+        ).scalar_one_or_none()
     
     is_new_agent = agent is None
     
@@ -65,49 +137,54 @@ def upsert_agent(sess, agent_data, tenant_name):
             tenant_name=tenant_name,
             name=agent_data.get("name", agent_id),
             encrypted_secret=encrypted_secret,
-            iv=iv,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            iv=iv
         )
         sess.add(agent)
-        logger.info(f"Inserted new agent. agent_id: {agent.agent_id}, tenant: {tenant_name}")
+        if existing is not None:
+            existing[agent_id] = agent
+        logger.info("Inserted new agent. agent_id: %s, tenant: %s", agent.agent_id, tenant_name)
         
         # Create AgentProfile for new agent
         agent_profile = AgentProfile(
             agent_id=agent_id,
             tenant_name=tenant_name,
-            context=None,  # Initialize as empty
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
+            context=None  # Initialize as empty
         )
         sess.add(agent_profile)
-        logger.info(f"Created AgentProfile for new agent. agent_id: {agent_id}, tenant: {tenant_name}")
+        logger.info("Created AgentProfile for new agent. agent_id: %s, tenant: %s", agent_id, tenant_name)
         
     else:
         agent.name = agent_data.get("name", agent_id)
         agent.encrypted_secret = encrypted_secret
         agent.iv = iv
-        agent.updated_at = datetime.now(timezone.utc)
-        logger.info(f"Updated existing agent, agent_id: {agent.agent_id}, tenant: {tenant_name}")
+        agent.updated_at = func.now()  # evaluated by the database as part of the UPDATE
+        logger.info("Updated existing agent, agent_id: %s, tenant: %s", agent.agent_id, tenant_name)
         
         # Ensure AgentProfile exists for existing agent (in case it was missing)
-        existing_profile = sess.execute(
-            select(AgentProfile).where(
-                (AgentProfile.agent_id == agent_id) &
-                (AgentProfile.tenant_name == tenant_name)
-            )
-        ).scalar_one_or_none()
+        existing_profile = sess.get(AgentProfile, {"agent_id": agent_id, "tenant_name": tenant_name})
         
         if not existing_profile:
             agent_profile = AgentProfile(
                 agent_id=agent_id,
                 tenant_name=tenant_name,
-                context=None,
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc)
+                context=None
             )
             sess.add(agent_profile)
-            logger.info(f"Created missing AgentProfile for existing agent. agent_id: {agent_id}, tenant: {tenant_name}")
+            logger.info("Created missing AgentProfile for existing agent. agent_id: %s, tenant: %s", agent_id, tenant_name)
+
+def _encrypt_user_credentials(user_data):
+    """Encrypt a user's credentials as JSON; returns (encrypted_credentials, iv), both None if absent."""
+    credentials = user_data.get("credentials")
+    if not credentials:
+        return None, None
+    try:
+        # Convert credentials to JSON string for encryption
+        credentials_json = json.dumps(credentials)
+        encrypted_info = encrypt(credentials_json)
+        return encrypted_info["encryptedData"], encrypted_info["iv"]
+    except Exception as e:
+        logger.warning("Could not encrypt credentials for user '%s': %s", user_data.get('username'), e)
+        return None, None
 
 def upsert_user(sess, user_data, tenant_name):
     username = user_data.get("username")
@@ -116,22 +193,10 @@ def upsert_user(sess, user_data, tenant_name):
         return
     
     if not tenant_name:
-        logger.warning(f"Skipping user '{username}' with no tenant_name.")
+        logger.warning("Skipping user '%s' with no tenant_name.", username)
         return
     
-    # Handle credentials encryption
-    credentials = user_data.get("credentials")
-    encrypted_credentials = None
-    iv = None
-    if credentials:
-        try:
-            # Convert credentials to JSON string for encryption
-            credentials_json = json.dumps(credentials)
-            encrypted_info = encrypt(credentials_json)
-            encrypted_credentials = encrypted_info["encryptedData"]
-            iv = encrypted_info["iv"]
-        except Exception as e:
-            logger.warning(f"Could not encrypt credentials for user '{username}': {e}")
+    encrypted_credentials, iv = _encrypt_user_credentials(user_data)
     
     user = sess.execute(
         select(User).where(
@@ -145,7 +210,7 @@ def upsert_user(sess, user_data, tenant_name):
         user_id = user_data.get("id")
         if not user_id:
             user_id = str(uuid.uuid4())
-            logger.info(f"Generated temporary UUID for user '{username}': {user_id}")
+            logger.info("Generated temporary UUID for user '%s': %s", username, user_id)
         
         user = User(
             id=user_id,
@@ -156,16 +221,88 @@ def upsert_user(sess, user_data, tenant_name):
             iv=iv
         )
         sess.add(user)
-        logger.info(f"Inserted new user. username: {user.username}, tenant: {tenant_name}")
+        logger.info("Inserted new user. username: %s, tenant: %s", user.username, tenant_name)
     else:
         user.email = user_data.get("email", "")
         user.encrypted_credentials = encrypted_credentials
         user.iv = iv
-        logger.info(f"Updated existing user, username: {user.username}, tenant: {tenant_name}")
+        logger.info("Updated existing user, username: %s, tenant: %s", user.username, tenant_name)
+
+
+
+def _role_emb_input(role_data):
+    """Text embedded for a role: description, job_roles and domains."""
+    # Note: domains are stored in role_domain table, not in the role itself
+    emb_input_parts = [role_data.get("description", "")]
+    
+    # Add job_roles if present
+    job_roles = role_data.get("job_roles", [])
+    if job_roles:
+        emb_input_parts.append(" ".join(job_roles))
+    
+    # Optionally include domains in embedding even though they're stored separately
+    domains = role_data.get("domains", [])
+    if domains:
+        emb_input_parts.append(" ".join(domains))
+    
+    return " ".join(part for part in emb_input_parts if part).strip()
+
+
+def _emb_cache_key(emb, text):
+    """blake2b of the embedding model name and the input, so a model switch never reuses vectors."""
+    model = getattr(emb, "model", emb)
+    model_name = getattr(model, "model", None) or type(model).__name__
+    return hashlib.blake2b(f"{model_name}\0{text}".encode("utf-8"), digest_size=16).digest()
+
+
+def _emb_cache_get(sess, keys):
+    rows = sess.execute(select(EmbeddingCache.hash, EmbeddingCache.emb).where(EmbeddingCache.hash.in_(keys)))
+    return {bytes(key): vec for key, vec in rows}
+
+
+def _emb_cache_put(sess, vecs_by_key):
+    sess.execute(
+        pg_insert(EmbeddingCache)
+        .values([{"hash": key, "emb": vec} for key, vec in vecs_by_key.items()])
+        .on_conflict_do_nothing()
+    )
+
+
+def role_embeddings(roles_data, emb, sess=None) -> list:
+    """
+    Embed many roles with a single batched emb.encode call.
+
+    With a session, vectors are first looked up in the emb_cache table by content hash and
+    only the misses are encoded (and then stored), so re-seeding unchanged roles is free.
+    Returns one vector per role, in order; None for roles with nothing to embed or when
+    no embedder is given.
+    """
+    vecs = [None] * len(roles_data)
+    if not emb:
+        return vecs
+    inputs = [_role_emb_input(role_data) for role_data in roles_data]
+    todo = [i for i, text in enumerate(inputs) if text]
+    if not todo:
+        return vecs
+
+    cached = {}
+    if sess is not None:
+        keys = {i: _emb_cache_key(emb, inputs[i]) for i in todo}
+        cached = _emb_cache_get(sess, set(keys.values()))
+        for i in todo:
+            vecs[i] = cached.get(keys[i])
+        todo = [i for i in todo if vecs[i] is None]
 
+    if todo:
+        encoded = emb.encode([inputs[i] for i in todo])
+        for i, vec in zip(todo, encoded):
+            vecs[i] = vec
+        if sess is not None:
+            _emb_cache_put(sess, {keys[i]: vecs[i] for i in todo})
+    return vecs
 
 
-def upsert_role(sess, role_data, tenant_name, emb=None):
+def upsert_role(sess, role_data, tenant_name, emb=None, emb_vec=None):
     """
     Upsert a role with all fields including embedding.
     
@@ -174,6 +311,7 @@ def upsert_role(sess, role_data, tenant_name, emb=None):
         role_data: Dictionary containing role data
         tenant_name: Tenant name for isolation
         emb: Optional Embedder instance for generating embeddings
+        emb_vec: Optional precomputed embedding (see role_embeddings); takes precedence over emb
     
     Note: Domains are managed through the role_domain relationship table,
     not as a column in the roles table.
@@ -185,25 +323,8 @@ def upsert_role(sess, role_data, tenant_name, emb=None):
         )
     ).scalar_one_or_none()
     
-    # Generate embedding from description and job_roles
-    # Note: domains are stored in role_domain table, not in the role itself
-    emb_vec = None
-    if emb:
-        emb_input_parts = [role_data.get("description", "")]
-        
-        # Add job_roles if present
-        job_roles = role_data.get("job_roles", [])
-        if job_roles:
-            emb_input_parts.append(" ".join(job_roles))
-        
-        # Optionally include domains in embedding even though they're stored separately
-        domains = role_data.get("domains", [])
-        if domains:
-            emb_input_parts.append(" ".join(domains))
-        
-        emb_input = " ".join(part for part in emb_input_parts if part).strip()
-        if emb_input:
-            emb_vec = emb.encode(emb_input)
+    if emb_vec is None:
+        emb_vec = role_embeddings([role_data], emb, sess)[0]
     
     if not role:
         role = Role(
@@ -217,7 +338,7 @@ def upsert_role(sess, role_data, tenant_name, emb=None):
             emb=emb_vec
         )
         sess.add(role)
-        logger.info(f"Inserted new role. name: {role.name}, tenant: {tenant_name}")
+        logger.info("Inserted new role. name: %s, tenant: %s", role.name, tenant_name)
     else:
         role.type = role_data.get("type")
         role.label = role_data["label"]
@@ -225,7 +346,180 @@ def upsert_role(sess, role_data, tenant_name, emb=None):
         role.job_roles = role_data.get("job_roles")
         role.constraints = role_data.get("constraints")
         role.emb = emb_vec
-        logger.info(f"Updated existing role, name: {role.name}, tenant: {tenant_name}")
+        logger.info("Updated existing role, name: %s, tenant: %s", role.name, tenant_name)
+
+def bulk_upsert_agents(sess, agents_data, tenant_name) -> List[str]:
+    """
+    Upsert many agents of one tenant with one INSERT ... ON CONFLICT DO UPDATE per chunk,
+    creating any missing AgentProfile rows the same way. Same column semantics as upsert_agent.
+    
+    Args:
+        sess: SQLAlchemy session
+        agents_data: Agent entries from the IAM config
+        tenant_name: Tenant name for isolation
+    
+    Returns:
+        List[str]: agent_ids that were upserted
+    """
+    sess.flush()  # Core statements below bypass the unit of work; pending ORM rows must exist first
+    rows = [v for v in (_agent_values(a, tenant_name) for a in agents_data) if v is not None]
+    rows = _dedupe(rows, ("agent_id",))
+    for chunk in _chunks(rows):
+        stmt = pg_insert(Agent).values(chunk)
+        sess.execute(stmt.on_conflict_do_update(
+            index_elements=[Agent.agent_id, Agent.tenant_name],
+            set_={
+                "name": stmt.excluded.name,
+                "encrypted_secret": stmt.excluded.encrypted_secret,
+                "iv": stmt.excluded.iv,
+                "updated_at": func.now(),
+            },
+        ))
+        sess.execute(
+            pg_insert(AgentProfile)
+            .values([{"agent_id": r["agent_id"], "tenant_name": tenant_name, "context": None} for r in chunk])
+            .on_conflict_do_nothing(index_elements=[AgentProfile.agent_id, AgentProfile.tenant_name])
+        )
+    logger.info("Upserted %d agents, tenant: %s", len(rows), tenant_name)
+    return [r["agent_id"] for r in rows]
+
+def bulk_upsert_users(sess, users_data, tenant_name) -> List[str]:
+    """
+    Upsert many users of one tenant with one INSERT ... ON CONFLICT DO UPDATE per chunk.
+    Same column semantics as upsert_user: an existing user keeps its id.
+    
+    Args:
+        sess: SQLAlchemy session
+        users_data: User entries from the IAM config
+        tenant_name: Tenant name for isolation
+    
+    Returns:
+        List[str]: usernames that were upserted
+    """
+    sess.flush()
+    rows = []
+    for user_data in users_data:
+        username = user_data.get("username")
+        if not username:
+            logger.warning("Skipping user with no username.")
+            continue
+        encrypted_credentials, iv = _encrypt_user_credentials(user_data)
+        rows.append({
+            # Only used when the user is new; in production this ID should come from Keycloak
+            "id": user_data.get("id") or str(uuid.uuid4()),
+            "username": username,
+            "tenant_name": tenant_name,
+            "email": user_data.get("email", ""),
+            "encrypted_credentials": encrypted_credentials,
+            "iv": iv,
+        })
+    rows = _dedupe(rows, ("username",))
+    for chunk in _chunks(rows):
+        stmt = pg_insert(User).values(chunk)
+        sess.execute(stmt.on_conflict_do_update(
+            index_elements=[User.username, User.tenant_name],
+            set_={
+                "email": stmt.excluded.email,
+                "encrypted_credentials": stmt.excluded.encrypted_credentials,
+                "iv": stmt.excluded.iv,
+            },
+        ))
+    logger.info("Upserted %d users, tenant: %s", len(rows), tenant_name)
+    return [r["username"] for r in rows]
+
+def bulk_upsert_roles(sess, roles_data, tenant_name, emb=None) -> List[str]:
+    """
+    Upsert many roles of one tenant with one INSERT ... ON CONFLICT DO UPDATE per chunk.
+    Same column semantics as upsert_role, including the embedding.
+    
+    Args:
+        sess: SQLAlchemy session
+        roles_data: Role entries from the roles config
+        tenant_name: Tenant name for isolation
+        emb: Optional Embedder instance for generating embeddings
+    
+    Returns:
+        List[str]: role names that were upserted
+    """
+    sess.flush()
+    rows = _dedupe([
+        {
+            "name": role_data["name"],
+            "tenant_name": tenant_name,
+            "type": role_data.get("type"),
+            "label": role_data["label"],
+            "description": role_data.get("description", ""),
+            "job_roles": role_data.get("job_roles"),
+            "constraints": role_data.get("constraints"),
+            "emb": emb_vec,
+        }
+        for role_data, emb_vec in zip(roles_data, role_embeddings(roles_data, emb, sess))
+    ], ("name",))
+    for chunk in _chunks(rows):
+        stmt = pg_insert(Role).values(chunk)
+        sess.execute(stmt.on_conflict_do_update(
+            index_elements=[Role.name, Role.tenant_name],
+            set_={col: stmt.excluded[col] for col in ("type", "label", "description", "job_roles", "constraints", "emb")},
+        ))
+    logger.info("Upserted %d roles, tenant: %s", len(rows), tenant_name)
+    return [r["name"] for r in rows]
+
+def _insert_links(sess, model, rows):
+    """
+    Insert link-table rows with INSERT ... ON CONFLICT DO NOTHING on the primary key, one
+    statement per chunk. Returns the number of rows actually inserted.
+    Rows referenced here must already be in the database: callers that created them through
+    the ORM flush once per batch before linking.
+    """
+    inserted = 0
+    for chunk in _chunks(rows):
+        result = sess.execute(pg_insert(model).values(chunk).on_conflict_do_nothing())
+        inserted += result.rowcount
+    return inserted
+
+def insert_role_domains(sess, role_domains, tenant_name):
+    """
+    Ensure role-domain relationships exist, in one statement per chunk.
+
+    Args:
+        sess: SQLAlchemy session
+        role_domains: Iterable of {"role_name": ..., "domain_name": ...}
+        tenant_name: Tenant name for isolation
+
+    Note: This maps to the underlying `role_category` table in the DB.
+    """
+    rows = [{"role_name": r["role_name"], "domain_name": r["domain_name"], "tenant_name": tenant_name} for r in role_domains]
+    inserted = _insert_links(sess, RoleDomain, rows)
+    logger.info("Inserted %d of %d role-domain relations, tenant: %s", inserted, len(rows), tenant_name)
+    return inserted
+
+def insert_role_users(sess, role_users, tenant_name):
+    """
+    Ensure role-user relationships exist, in one statement per chunk.
+
+    Args:
+        sess: SQLAlchemy session
+        role_users: Iterable of {"role_name": ..., "username": ...}
+        tenant_name: Tenant name for isolation
+    """
+    rows = [{"role_name": r["role_name"], "username": r["username"], "tenant_name": tenant_name} for r in role_users]
+    inserted = _insert_links(sess, RoleUser, rows)
+    logger.info("Inserted %d of %d role_user relations, tenant: %s", inserted, len(rows), tenant_name)
+    return inserted
+
+def insert_role_agents(sess, role_agents, tenant_name):
+    """
+    Ensure role-agent relationships exist, in one statement per chunk.
+
+    Args:
+        sess: SQLAlchemy session
+        role_agents: Iterable of {"role_name": ..., "agent_id": ...}
+        tenant_name: Tenant name for isolation
+    """
+    rows = [{"role_name": r["role_name"], "agent_id": r["agent_id"], "tenant_name": tenant_name} for r in role_agents]
+    inserted = _insert_links(sess, RoleAgent, rows)
+    logger.info("Inserted %d of %d role_agent relations, tenant: %s", inserted, len(rows), tenant_name)
+    return inserted
 
 def insert_role_domain(sess, role_name, domain_name, tenant_name):
     """
@@ -233,66 +527,13 @@ def insert_role_domain(sess, role_name, domain_name, tenant_name):
 
     Note: This maps to the underlying `role_category` table in the DB.
     """
-    role_domain = sess.execute(
-        select(RoleDomain).where(
-            (RoleDomain.role_name == role_name) &
-            (RoleDomain.domain_name == domain_name) &
-            (RoleDomain.tenant_name == tenant_name)
-        )
-    ).scalar_one_or_none()
-    if not role_domain:
-        role_domain = RoleDomain(
-            domain_name=domain_name,
-            role_name=role_name,
-            tenant_name=tenant_name
-        )
-        sess.add(role_domain)
-        sess.flush()
-        logger.info(f"Inserted new role-domain relation, domain_name={domain_name}, role_name={role_name}, tenant: {tenant_name}")
-    else:
-        logger.info(f"role-domain relation already exists, domain_name={domain_name}, role_name={role_name}, tenant: {tenant_name}")
+    insert_role_domains(sess, [{"role_name": role_name, "domain_name": domain_name}], tenant_name)
 
 def insert_role_user(sess, role_name, username, tenant_name):
-    from integrator.iam.iam_db_model import RoleUser
-    role_user = sess.execute(
-        select(RoleUser).where(
-            (RoleUser.role_name == role_name) &
-            (RoleUser.username == username) &
-            (RoleUser.tenant_name == tenant_name)
-        )
-    ).scalar_one_or_none()
-    if not role_user:
-        role_user = RoleUser(
-            role_name=role_name,
-            username=username,
-            tenant_name=tenant_name
-        )
-        sess.add(role_user)
-        sess.flush()
-        logger.info(f"Inserted new role_user: role_name={role_name}, username={username}, tenant: {tenant_name}")
-    else:
-        logger.info(f"role_user relation already exists: role_name={role_name}, username={username}, tenant: {tenant_name}")
+    insert_role_users(sess, [{"role_name": role_name, "username": username}], tenant_name)
 
 def insert_role_agent(sess, role_name, agent_id, tenant_name):
-    from integrator.iam.iam_db_model import RoleAgent
-    role_agent = sess.execute(
-        select(RoleAgent).where(
-            (RoleAgent.role_name == role_name) &
-            (RoleAgent.agent_id == agent_id) &
-            (RoleAgent.tenant_name == tenant_name)
-        )
-    ).scalar_one_or_none()
-    if not role_agent:
-        role_agent = RoleAgent(
-            role_name=role_name,
-            agent_id=agent_id,
-            tenant_name=tenant_name
-        )
-        sess.add(role_agent)
-        sess.flush()
-        logger.info(f"Inserted new role_agent: role_name={role_name}, agent_id={agent_id}, tenant: {tenant_name}")
-    else:
-        logger.info(f"role_agent relation already exists: role_name={role_name}, agent_id={agent_id}, tenant: {tenant_name}")
+    insert_role_agents(sess, [{"role_name": role_name, "agent_id": agent_id}], tenant_name)
 
 def upsert_user_agent(sess, username, agent_id, tenant_name, role=None, context=None):
     """
@@ -306,31 +547,21 @@ def upsert_user_agent(sess, username, agent_id, tenant_name, role=None, context=
         role: Optional role string for the user-agent relationship
         context: Optional JSON context for the user-agent relationship
     """
-    user_agent = sess.execute(
-        select(UserAgent).where(
-            (UserAgent.username == username) &
-            (UserAgent.agent_id == agent_id) &
-            (UserAgent.tenant_name == tenant_name)
-        )
-    ).scalar_one_or_none()
-    if not user_agent:
-        user_agent = UserAgent(
-            username=username,
-            agent_id=agent_id,
-            tenant_name=tenant_name,
-            role=role,
-            context=context
-        )
-        sess.add(user_agent)
-        sess.flush()
-        logger.info(f"Inserted new user_agent: username={username}, agent_id={agent_id}, tenant: {tenant_name}, role={role}")
+    stmt = pg_insert(UserAgent).values(
+        username=username,
+        agent_id=agent_id,
+        tenant_name=tenant_name,
+        role=role,
+        context=context
+    )
+    # Update role and context only if provided
+    updates = {k: v for k, v in (("role", role), ("context", context)) if v is not None}
+    if updates:
+        stmt = stmt.on_conflict_do_update(index_elements=[UserAgent.username, UserAgent.agent_id, UserAgent.tenant_name], set_=updates)
     else:
-        # Update role and context if provided
-        if role is not None:
-            user_agent.role = role
-        if context is not None:
-            user_agent.context = context
-        logger.info(f"Updated user_agent relation: username={username}, agent_id={agent_id}, tenant: {tenant_name}, role={role}")
+        stmt = stmt.on_conflict_do_nothing()
+    sess.execute(stmt)
+    logger.info("Upserted user_agent relation: username=%s, agent_id=%s, tenant: %s, role=%s", username, agent_id, tenant_name, role)
 
 # Keep the old function name for backward compatibility
 def insert_user_agent(sess, username, agent_id, tenant_name, role=None, context=None):
@@ -340,6 +571,72 @@ def insert_user_agent(sess, username, agent_id, tenant_name, role=None, context=
     """
     return upsert_user_agent(sess, username, agent_id, tenant_name, role, context)
 
+def _new_auth_provider_values(provider_data, tenant_name, encrypted_info=None):
+    """Column values for inserting a new auth provider, with defaults for missing fields."""
+    provider_id = provider_data["provider_id"]
+    if not encrypted_info:
+        encrypted_info = encrypt(provider_data.get("clientSecret") or "known")
+    return {
+        "tenant_name": tenant_name,
+        "provider_id": provider_id,
+        "provider_name": provider_data.get("provider_name", provider_id),
+        "provider_type": provider_data.get("provider_type", provider_id),
+        "type": provider_data.get("type"),
+        "client_id": provider_data.get("clientId", "unknown"),
+        "is_built_in": provider_data.get("is_built_in", True),
+        "options": provider_data.get("options"),
+        "encrypted_secret": encrypted_info["encryptedData"],
+        "iv": encrypted_info["iv"],
+    }
+
+
+def _core_insert_many(sess, model, rows):
+    """
+    Plain Core INSERT (executemany) for rows known to be new: no unit of work, identity map
+    or attribute events. Only for write-only rows that are not touched again via the ORM.
+    """
+    for chunk in _chunks(rows):
+        sess.execute(insert(model.__table__), chunk)
+
+
+def bulk_upsert_auth_providers(sess, providers_data, tenant_name):
+    """
+    Upsert a tenant's auth providers: one query finds the existing ones, new providers are
+    written with a single Core INSERT, and only existing (or repeated) entries go through
+    upsert_auth_provider's partial-update path.
+    
+    Args:
+        sess: SQLAlchemy session
+        providers_data: Auth provider entries
+        tenant_name: Tenant name for isolation
+    """
+    if any(not p.get("provider_id") for p in providers_data):
+        logger.warning("Skipping auth provider with missing provider_id")
+        providers_data = [p for p in providers_data if p.get("provider_id")]
+    sess.flush()
+    existing = set(sess.execute(
+        select(AuthProvider.provider_id).where(
+            (AuthProvider.tenant_name == tenant_name) &
+            AuthProvider.provider_id.in_({p["provider_id"] for p in providers_data})
+        )
+    ).scalars()) if providers_data else set()
+
+    new_rows = []
+    updates = []
+    for provider_data in providers_data:
+        provider_id = provider_data["provider_id"]
+        if provider_id in existing:
+            updates.append(provider_data)
+        else:
+            new_rows.append(_new_auth_provider_values(provider_data, tenant_name))
+            existing.add(provider_id)
+
+    _core_insert_many(sess, AuthProvider, new_rows)
+    for provider_data in updates:
+        upsert_auth_provider(sess, provider_data, tenant_name)
+    logger.info("Inserted %d and updated %d auth providers, tenant: %s", len(new_rows), len(updates), tenant_name)
+
+
 def upsert_auth_provider(sess, provider_data, tenant_name):
     provider_id = provider_data.get("provider_id")
     client_secret = provider_data.get("clientSecret")
@@ -356,25 +653,9 @@ def upsert_auth_provider(sess, provider_data, tenant_name):
         )
     ).scalar_one_or_none()
     if not auth_provider:
-        auth_provider = AuthProvider(
-            tenant_name=tenant_name,
-            provider_id=provider_id,
-            provider_name=provider_data.get("provider_name", provider_id),
-            provider_type=provider_data.get("provider_type", provider_id),
-            type=provider_data.get("type"),
-            client_id=provider_data.get("clientId", "unknown"),
-            is_built_in=provider_data.get("is_built_in", True),
-            options=provider_data.get("options"),
-            created_at=datetime.now(timezone.utc)
-        )
-        if not encrypted_info:
-            encrypted_info =encrypt("known")
-
-        auth_provider.encrypted_secret=encrypted_info["encryptedData"]
-        auth_provider.iv=encrypted_info["iv"]
-
+        auth_provider = AuthProvider(**_new_auth_provider_values(provider_data, tenant_name, encrypted_info))
         sess.add(auth_provider)
-        logger.info(f"Inserted new auth provider: {provider_id}")
+        logger.info("Inserted new auth provider: %s", provider_id)
     else:
 
         # For existing providers, only update fields that are provided
@@ -396,13 +677,12 @@ def upsert_auth_provider(sess, provider_data, tenant_name):
             auth_provider.is_built_in = provider_data["is_built_in"]
         if "options" in provider_data:
             auth_provider.options = provider_data["options"]
-        logger.info(f"Updated auth provider: {provider_id}")
+        logger.info("Updated auth provider: %s", provider_id)
 
 def get_roles_by_username(sess, username, tenant_name):
     """
     Returns a list of Role objects for the given username in a specific tenant.
     """
-    from integrator.iam.iam_db_model import RoleUser, Role
     roles = (
         sess.query(Role)
         .join(RoleUser, (Role.name == RoleUser.role_name) & (Role.tenant_name == RoleUser.tenant_name))
@@ -415,7 +695,6 @@ def get_roles_by_agent_id(sess, agent_id, tenant_name):
     """
     Returns a list of Role objects for the given agent_id in a specific tenant.
     """
-    from integrator.iam.iam_db_model import RoleAgent, Role
     roles = (
         sess.query(Role)
         .join(RoleAgent, (Role.name == RoleAgent.role_name) & (Role.tenant_name == RoleAgent.tenant_name))
@@ -430,12 +709,14 @@ def is_admin_user(sess, user:dict, tenant_name:str, admin_role: str="administrat
     get the working agent for the current user.
     """
     username = user["preferred_username"]
-    roles =get_roles_by_username(sess,username, tenant_name)
-    admin = next((role for role in roles if role.name == admin_role), None)
-    if admin:
-        return True
-    else:
-        False
+    # Single index probe on role_user instead of loading every role of the user
+    return sess.execute(
+        select(literal(1)).where(
+            (RoleUser.username == username) &
+            (RoleUser.tenant_name == tenant_name) &
+            (RoleUser.role_name == admin_role)
+        ).limit(1)
+    ).scalar() is not None
 
 
 def get_user_by_username(sess, username: str, tenant_name: str) -> Optional[User]:
@@ -459,67 +740,111 @@ def get_user_by_username(sess, username: str, tenant_name: str) -> Optional[User
         ).scalar_one_or_none()
         
         if user:
-            logger.info(f"Retrieved user '{username}' for tenant: {tenant_name}")
+            logger.info("Retrieved user '%s' for tenant: %s", username, tenant_name)
         else:
-            logger.info(f"User '{username}' not found for tenant: {tenant_name}")
+            logger.info("User '%s' not found for tenant: %s", username, tenant_name)
         
         return user
     except Exception as e:
-        logger.error(f"Error retrieving user '{username}' for tenant '{tenant_name}': {str(e)}")
+        logger.error("Error retrieving user '%s' for tenant '%s': %s", username, tenant_name, e)
         raise
 
 
-def get_all_users(sess, tenant_name, skip: int = 0, limit: int = 100) -> List[User]:
+def user_exists(sess, username: str, tenant_name: str) -> bool:
+    """
+    Check whether a user exists in a tenant without loading the row.
+    
+    Args:
+        sess: SQLAlchemy session
+        username: The username to check
+        tenant_name: Tenant name for filtering
+        
+    Returns:
+        bool: True if the user exists
+    """
+    return sess.execute(
+        select(literal(1)).where(
+            (User.username == username) &
+            (User.tenant_name == tenant_name)
+        ).limit(1)
+    ).scalar() is not None
+
+
+# Rows fetched per round trip when get_all_users/get_all_agents are consumed as iterators
+YIELD_PER = 1000
+
+
+def _tenant_page(sess, model, tenant_name, skip, limit, cursor, as_iter):
+    """
+    One page of a tenant's rows ordered by id. With ``cursor`` (the last id of the previous
+    page) the page starts with a keyset predicate instead of OFFSET. With ``as_iter`` the rows
+    are streamed YIELD_PER at a time instead of materialized into a list.
+    """
+    stmt = select(model).where(model.tenant_name == tenant_name).order_by(model.id)
+    if cursor is not None:
+        stmt = stmt.where(model.id > cursor)
+    elif skip:
+        stmt = stmt.offset(skip)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    if as_iter:
+        return sess.execute(stmt.execution_options(yield_per=YIELD_PER)).scalars()
+    return sess.execute(stmt).scalars().all()
+
+
+def get_all_users(sess, tenant_name, skip: int = 0, limit: Optional[int] = 100,
+                  cursor: Optional[uuid.UUID] = None, as_iter: bool = False) -> Iterable[User]:
     """
     Retrieve all users from the database for a specific tenant with pagination.
     
     Args:
         sess: SQLAlchemy session
         tenant_name: Tenant name for filtering
-        skip: Number of records to skip (default: 0)
-        limit: Maximum number of records to return (default: 100)
+        skip: Number of records to skip (default: 0); ignored when cursor is given
+        limit: Maximum number of records to return (default: 100); None for no limit
+        cursor: Return users with an id greater than this one (keyset pagination)
+        as_iter: Stream users instead of returning a list
         
     Returns:
-        List[User]: List of all users in the tenant
+        Iterable[User]: Users in the tenant ordered by id; a list unless as_iter is set
     """
     try:
-        users = sess.execute(
-            select(User).where(User.tenant_name == tenant_name).offset(skip).limit(limit)
-        ).scalars().all()
-        
-        logger.info(f"Retrieved {len(users)} users for tenant: {tenant_name}")
+        users = _tenant_page(sess, User, tenant_name, skip, limit, cursor, as_iter)
+        if not as_iter:
+            logger.info("Retrieved %d users for tenant: %s", len(users), tenant_name)
         return users
     except Exception as e:
-        logger.error(f"Error retrieving all users for tenant '{tenant_name}': {str(e)}")
+        logger.error("Error retrieving all users for tenant '%s': %s", tenant_name, e)
         raise
 
 
-def get_all_agents(sess, tenant_name, skip: int = 0, limit: int = 100) -> List[Agent]:
+def get_all_agents(sess, tenant_name, skip: int = 0, limit: Optional[int] = 100,
+                   cursor: Optional[uuid.UUID] = None, as_iter: bool = False) -> Iterable[Agent]:
     """
     Retrieve all agents from the database for a specific tenant with pagination.
     
     Args:
         sess: SQLAlchemy session
         tenant_name: Tenant name for filtering
-        skip: Number of records to skip (default: 0)
-        limit: Maximum number of records to return (default: 100)
+        skip: Number of records to skip (default: 0); ignored when cursor is given
+        limit: Maximum number of records to return (default: 100); None for no limit
+        cursor: Return agents with an id greater than this one (keyset pagination)
+        as_iter: Stream agents instead of returning a list
         
     Returns:
-        List[Agent]: List of all agents in the tenant
+        Iterable[Agent]: Agents in the tenant ordered by id; a list unless as_iter is set
     """
     try:
-        agents = sess.execute(
-            select(Agent).where(Agent.tenant_name == tenant_name).offset(skip).limit(limit)
-        ).scalars().all()
-        
-        logger.info(f"Retrieved {len(agents)} agents for tenant: {tenant_name}")
+        agents = _tenant_page(sess, Agent, tenant_name, skip, limit, cursor, as_iter)
+        if not as_iter:
+            logger.info("Retrieved %d agents for tenant: %s", len(agents), tenant_name)
         return agents
     except Exception as e:
-        logger.error(f"Error retrieving all agents for tenant '{tenant_name}': {str(e)}")
+        logger.error("Error retrieving all agents for tenant '%s': %s", tenant_name, e)
         raise
 
 
-def get_agents_by_username(sess, username: str, tenant_name: str) -> List[dict]:
+def get_agents_by_username(sess, username: str, tenant_name: str) -> List[Mapping]:
     """
     Retrieve all agents associated with a given username through the user_agent relationship,
     including role and context from the user_agent table.
@@ -530,38 +855,126 @@ def get_agents_by_username(sess, username: str, tenant_name: str) -> List[dict]:
         tenant_name: Tenant name for filtering
         
     Returns:
-        List[dict]: List of dictionaries containing agent information with role and context
+        List[Mapping]: Read-only dict-like rows with id, agent_id, name, tenant_name, created_at,
+        updated_at, role and context. id and the timestamps keep their native UUID/datetime
+        types; the JSON encoder serializes them.
     """
     try:
         # Join UserAgent and Agent tables to get agents with role and context
-        results = sess.execute(
-            select(Agent, UserAgent.role, UserAgent.context)
+        agents_with_context = sess.execute(
+            select(
+                Agent.id, Agent.agent_id, Agent.name, Agent.tenant_name,
+                Agent.created_at, Agent.updated_at, UserAgent.role, UserAgent.context
+            )
             .join(UserAgent, (UserAgent.agent_id == Agent.agent_id) & (UserAgent.tenant_name == Agent.tenant_name))
             .where((UserAgent.username == username) & (UserAgent.tenant_name == tenant_name))
-        ).all()
+        ).mappings().all()
         
-        # Convert results to list of dictionaries
-        agents_with_context = []
-        for agent, role, context in results:
-            agent_dict = {
-                "id": str(agent.id),
-                "agent_id": agent.agent_id,
-                "name": agent.name,
-                "tenant_name": agent.tenant_name,
-                "created_at": agent.created_at.isoformat() if agent.created_at else None,
-                "updated_at": agent.updated_at.isoformat() if agent.updated_at else None,
-                "role": role,
-                "context": context
-            }
-            agents_with_context.append(agent_dict)
-        
-        logger.info(f"Retrieved {len(agents_with_context)} agents for username '{username}', tenant: {tenant_name}")
+        logger.info("Retrieved %d agents for username '%s', tenant: %s", len(agents_with_context), username, tenant_name)
         return agents_with_context
     except Exception as e:
-        logger.error(f"Error retrieving agents for username '{username}', tenant '{tenant_name}': {str(e)}")
+        logger.error("Error retrieving agents for username '%s', tenant '%s': %s", username, tenant_name, e)
+        raise
+
+
+def get_agent_ids_by_username(sess, username: str, tenant_name: str) -> FrozenSet[str]:
+    """
+    Retrieve the ids of all agents associated with a given username, for membership checks.
+    
+    Args:
+        sess: SQLAlchemy session
+        username: The username to search for
+        tenant_name: Tenant name for filtering
+        
+    Returns:
+        FrozenSet[str]: agent_ids linked to the user through the user_agent table
+    """
+    try:
+        agent_ids = sess.execute(
+            select(Agent.agent_id)
+            .join(UserAgent, (UserAgent.agent_id == Agent.agent_id) & (UserAgent.tenant_name == Agent.tenant_name))
+            .where((UserAgent.username == username) & (UserAgent.tenant_name == tenant_name))
+        ).scalars().all()
+        return frozenset(agent_ids)
+    except Exception as e:
+        logger.error("Error retrieving agent ids for username '%s', tenant '%s': %s", username, tenant_name, e)
         raise
 
 
+
+def get_matching_agent_ids(sess, username: str, tenant_name: str, candidate_ids: Iterable[str]) -> FrozenSet[str]:
+    """
+    Retrieve which of the candidate agent_ids are associated with a given username, in one query.
+    
+    Args:
+        sess: SQLAlchemy session
+        username: The username to search for
+        tenant_name: Tenant name for filtering
+        candidate_ids: agent_ids to check
+        
+    Returns:
+        FrozenSet[str]: the subset of candidate_ids linked to the user through the user_agent table
+    """
+    candidate_ids = list(candidate_ids)
+    if not candidate_ids:
+        return frozenset()
+    try:
+        agent_ids = sess.execute(
+            select(Agent.agent_id)
+            .join(UserAgent, (UserAgent.agent_id == Agent.agent_id) & (UserAgent.tenant_name == Agent.tenant_name))
+            .where(
+                (UserAgent.username == username)
+                & (UserAgent.tenant_name == tenant_name)
+                & Agent.agent_id.in_(candidate_ids)
+            )
+        ).scalars().all()
+        return frozenset(agent_ids)
+    except Exception as e:
+        logger.error("Error matching agent ids for username '%s', tenant '%s': %s", username, tenant_name, e)
+        raise
+
+def _role_names_by(sess, key_col, tenant_col, role_col, keys, tenant_name) -> Dict[str, List[str]]:
+    """Bucket role names by key for all keys in one IN query; keys without roles map to []."""
+    roles_by_key = {key: [] for key in keys}
+    if not roles_by_key:
+        return roles_by_key
+    rows = sess.execute(
+        select(key_col, role_col).where((tenant_col == tenant_name) & key_col.in_(list(roles_by_key)))
+    ).all()
+    for key, role_name in rows:
+        roles_by_key[key].append(role_name)
+    return roles_by_key
+
+
+def get_role_names_by_agent_ids(sess, agent_ids: Iterable[str], tenant_name: str) -> Dict[str, List[str]]:
+    """
+    Retrieve the role names of many agents in one query.
+    
+    Args:
+        sess: SQLAlchemy session
+        agent_ids: agent_ids to look up
+        tenant_name: Tenant name for filtering
+        
+    Returns:
+        Dict[str, List[str]]: role names per agent_id (empty list for agents without roles)
+    """
+    return _role_names_by(sess, RoleAgent.agent_id, RoleAgent.tenant_name, RoleAgent.role_name, agent_ids, tenant_name)
+
+
+def get_role_names_by_usernames(sess, usernames: Iterable[str], tenant_name: str) -> Dict[str, List[str]]:
+    """
+    Retrieve the role names of many users in one query.
+    
+    Args:
+        sess: SQLAlchemy session
+        usernames: usernames to look up
+        tenant_name: Tenant name for filtering
+        
+    Returns:
+        Dict[str, List[str]]: role names per username (empty list for users without roles)
+    """
+    return _role_names_by(sess, RoleUser.username, RoleUser.tenant_name, RoleUser.role_name, usernames, tenant_name)
+
 def get_agent_by_agent_id(sess, agent_id: str, tenant_name: str) -> Optional[Agent]:
     """
     Retrieve a single agent by agent_id for a specific tenant.
@@ -583,16 +996,36 @@ def get_agent_by_agent_id(sess, agent_id: str, tenant_name: str) -> Optional[Age
         ).scalar_one_or_none()
         
         if agent:
-            logger.info(f"Retrieved agent '{agent_id}' for tenant: {tenant_name}")
+            logger.info("Retrieved agent '%s' for tenant: %s", agent_id, tenant_name)
         else:
-            logger.info(f"Agent '{agent_id}' not found for tenant: {tenant_name}")
+            logger.info("Agent '%s' not found for tenant: %s", agent_id, tenant_name)
         
         return agent
     except Exception as e:
-        logger.error(f"Error retrieving agent '{agent_id}' for tenant '{tenant_name}': {str(e)}")
+        logger.error("Error retrieving agent '%s' for tenant '%s': %s", agent_id, tenant_name, e)
         raise
 
 
+def agent_exists(sess, agent_id: str, tenant_name: str) -> bool:
+    """
+    Check whether an agent exists in a tenant without loading the row.
+    
+    Args:
+        sess: SQLAlchemy session
+        agent_id: The agent_id to check
+        tenant_name: Tenant name for filtering
+        
+    Returns:
+        bool: True if the agent exists
+    """
+    return sess.execute(
+        select(literal(1)).where(
+            (Agent.agent_id == agent_id) &
+            (Agent.tenant_name == tenant_name)
+        ).limit(1)
+    ).scalar() is not None
+
+
 def get_users_by_agent_id(sess, agent_id: str, tenant_name: str) -> List[UserAgent]:
     """
     Retrieve all users associated with a given agent through the user_agent relationship.
@@ -613,10 +1046,10 @@ def get_users_by_agent_id(sess, agent_id: str, tenant_name: str) -> List[UserAge
             )
         ).scalars().all()
         
-        logger.info(f"Retrieved {len(user_agents)} users for agent_id '{agent_id}', tenant: {tenant_name}")
+        logger.info("Retrieved %d users for agent_id '%s', tenant: %s", len(user_agents), agent_id, tenant_name)
         return user_agents
     except Exception as e:
-        logger.error(f"Error retrieving users for agent_id '{agent_id}', tenant '{tenant_name}': {str(e)}")
+        logger.error("Error retrieving users for agent_id '%s', tenant '%s': %s", agent_id, tenant_name, e)
         raise
 
 
@@ -634,24 +1067,17 @@ def delete_user_agent(sess, username: str, agent_id: str, tenant_name: str) -> b
         bool: True if deleted, False if not found
     """
     try:
-        user_agent = sess.execute(
-            select(UserAgent).where(
-                (UserAgent.username == username) &
-                (UserAgent.agent_id == agent_id) &
-                (UserAgent.tenant_name == tenant_name)
-            )
-        ).scalar_one_or_none()
+        user_agent = sess.get(UserAgent, {"username": username, "agent_id": agent_id, "tenant_name": tenant_name})
         
         if not user_agent:
-            logger.warning(f"User-agent relationship not found: username={username}, agent_id={agent_id}, tenant: {tenant_name}")
+            logger.warning("User-agent relationship not found: username=%s, agent_id=%s, tenant: %s", username, agent_id, tenant_name)
             return False
         
         sess.delete(user_agent)
-        sess.flush()
-        logger.info(f"Deleted user_agent: username={username}, agent_id={agent_id}, tenant: {tenant_name}")
+        logger.info("Deleted user_agent: username=%s, agent_id=%s, tenant: %s", username, agent_id, tenant_name)
         return True
     except Exception as e:
-        logger.error(f"Error deleting user_agent: {str(e)}")
+        logger.error("Error deleting user_agent: %s", e)
         raise
 
 
@@ -690,116 +1116,140 @@ def get_roles_with_domains_and_tool_counts(sess, agent_id: Optional[str] = None)
             ...
         ]
     """
-    from integrator.domains.domain_db_model import Domain, DomainCapability, Capability
-    from integrator.tools.tool_db_model import CapabilityTool, McpTool
     
     try:
-        # Build base query for roles
+        # Distinct tools per domain, aggregated once in a CTE. The capability_tool foreign keys
+        # to capabilities and mcp_tools guarantee both rows exist, so the chain
+        # Domain -> DomainCapability -> Capability -> CapabilityTool -> McpTool reduces to
+        # domain_capability JOIN capability_tool. DISTINCT stays: a tool reachable through
+        # several capabilities of a domain counts once.
+        domain_tool_counts = (
+            select(
+                DomainCapability.domain_name.label("domain_name"),
+                func.count(func.distinct(CapabilityTool.tool_id)).label("tool_count"),
+            )
+            .join(CapabilityTool, CapabilityTool.capability_name == DomainCapability.capability_name)
+            .group_by(DomainCapability.domain_name)
+            .cte("tools_per_domain")
+        )
+
+        # One row per (role, domain); roles without domains come back with NULL domain columns
+        stmt = (
+            select(
+                Role.id, Role.name, Role.label, Role.description, Role.type,
+                Domain.name, Domain.label, Domain.description,
+                func.coalesce(domain_tool_counts.c.tool_count, 0),
+            )
+            .outerjoin(RoleDomain, RoleDomain.role_name == Role.name)
+            .outerjoin(Domain, Domain.name == RoleDomain.domain_name)
+            .outerjoin(domain_tool_counts, domain_tool_counts.c.domain_name == Domain.name)
+        )
         if agent_id:
             # Filter roles for specific agent
-            roles_query = (
-                sess.query(Role)
-                .join(RoleAgent, Role.name == RoleAgent.role_name)
-                .filter(RoleAgent.agent_id == agent_id)
-            )
-            logger.info(f"Extracting roles for agent_id: {agent_id}")
+            stmt = stmt.where(Role.name.in_(select(RoleAgent.role_name).where(RoleAgent.agent_id == agent_id)))
+            logger.info("Extracting roles for agent_id: %s", agent_id)
         else:
             # Get all roles
-            roles_query = sess.query(Role)
             logger.info("Extracting all roles")
         
-        roles = roles_query.all()
-        
-        result = []
+        roles_by_id = {}
+        for role_id, role_name, role_label, role_description, role_type, domain_name, domain_label, domain_description, domain_tool_count in sess.execute(stmt):
+            role_data = roles_by_id.get(role_id)
+            if role_data is None:
+                role_data = roles_by_id[role_id] = {
+                    "role_name": role_name,
+                    "role_label": role_label,
+                    "role_description": role_description,
+                    "role_type": role_type,
+                    "tool_count": 0,
+                    "domains": []
+                }
+            if domain_name is None:
+                continue
+            role_data["domains"].append({
+                "name": domain_name,
+                "label": domain_label,
+                "description": domain_description,
+                "tool_count": domain_tool_count
+            })
+            role_data["tool_count"] += domain_tool_count
         
-        for role in roles:
-            # Get all domains for this role
-            role_domains = (
-                sess.query(Domain)
-                .join(RoleDomain, Domain.name == RoleDomain.domain_name)
-                .filter(RoleDomain.role_name == role.name)
-                .all()
-            )
-            
-            domains_data = []
-            total_role_tool_count = 0
-            
-            for domain in role_domains:
-                # Count tools for this domain through the relationship chain:
-                # Domain -> DomainCapability -> Capability -> CapabilityTool -> McpTool
-                domain_tool_count = (
-                    sess.query(func.count(func.distinct(McpTool.id)))
-                    .join(CapabilityTool, McpTool.id == CapabilityTool.tool_id)
-                    .join(Capability, CapabilityTool.capability_name == Capability.name)
-                    .join(DomainCapability, Capability.name == DomainCapability.capability_name)
-                    .filter(DomainCapability.domain_name == domain.name)
-                    .scalar()
-                ) or 0
-                
-                domains_data.append({
-                    "name": domain.name,
-                    "label": domain.label,
-                    "description": domain.description,
-                    "tool_count": domain_tool_count
-                })
-                
-                total_role_tool_count += domain_tool_count
-            
-            role_data = {
-                "role_name": role.name,
-                "role_label": role.label,
-                "role_description": role.description,
-                "role_type": role.type,
-                "tool_count": total_role_tool_count,
-                "domains": domains_data
-            }
-            
-            result.append(role_data)
+        result = list(roles_by_id.values())
         
-        logger.info(f"Successfully extracted {len(result)} roles with domain and tool counts")
+        logger.info("Successfully extracted %d roles with domain and tool counts", len(result))
         return result
         
     except Exception as e:
-        logger.error(f"Error extracting roles with domains and tool counts: {str(e)}")
+        logger.error("Error extracting roles with domains and tool counts: %s", e)
         raise
 
 
+def _load_json(path):
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
 def main():
     base_dir = os.path.dirname(__file__)
-    iam_config_path = os.path.join(base_dir, "../../../init/init_iam.json")
     initial_services_path = os.path.join(base_dir, "../../../init/initial_services.json")
     app_keys_path = os.path.join(base_dir, "../../../init/init_app_keys.json")
     auth_providers_path = os.path.join(base_dir, "../../../init/init_auth_providers.json")
 
+    # Read and parse the four files concurrently; failures are reported per file below
+    paths = {
+        "initial_services": initial_services_path,
+        "app_keys": app_keys_path,
+        "auth_providers": auth_providers_path,
+    }
+    with ThreadPoolExecutor(max_workers=len(paths) + 1) as pool:
+        futures = {name: pool.submit(_load_json, path) for name, path in paths.items()}
+        futures["iam_config"] = pool.submit(load_iam_config)
+
     try:
-        with open(iam_config_path, "r") as f:
-            iam_config = json.load(f)
+        iam_config = futures["iam_config"].result()
     except Exception as e:
-        logger.error(f"Failed to load IAM config: {e}")
+        logger.error("Failed to load IAM config: %s", e)
         return
 
     try:
-        with open(initial_services_path, "r") as f:
-            initial_services = json.load(f)
+        initial_services = futures["initial_services"].result()
     except Exception as e:
-        logger.warning(f"Could not load initial_services.json: {e}")
+        logger.warning("Could not load initial_services.json: %s", e)
         initial_services = {}
 
     try:
-        with open(app_keys_path, "r") as f:
-            app_key_list = json.load(f)
+        app_key_list = futures["app_keys"].result()
     except Exception as e:
-        logger.warning(f"Could not load app_keys.json: {e}")
+        logger.warning("Could not load app_keys.json: %s", e)
         app_key_list = []
 
     try:
-        with open(auth_providers_path, "r") as f:
-            auth_providers_data = json.load(f)
+        auth_providers_data = futures["auth_providers"].result()
     except Exception as e:
-        logger.warning(f"Could not load auth_providers.json: {e}")
+        logger.warning("Could not load auth_providers.json: %s", e)
         auth_providers_data = []
 
-    with get_db_cm() as sess:
+    # Services are the same for every tenant: resolve their URLs and host ids once up front
+    service_url_map = {
+        service['name']: service['staticInput']['url']
+        for service in (initial_services or {}).get("default", [])
+        if 'staticInput' in service and 'url' in service['staticInput']
+    }
+    service_host_ids = {name: generate_host_id(url)[0] for name, url in service_url_map.items()}
+    service_apps = [
+        {"app_name": service_host_ids[name], "app_note": json.dumps(url)}
+        for name, url in service_url_map.items()
+    ]
+    service_secrets = [
+        (service_host_ids[secret_info["service_name"]], secret_info["secrets"])
+        for secret_info in app_key_list
+        if secret_info.get("service_name") in service_host_ids
+    ]
+
+    # One transaction for the whole load: either every tenant is initialized or nothing is.
+    # no_autoflush keeps the ORM from flushing before each query; the bulk helpers flush
+    # explicitly where Core statements need earlier ORM writes to be visible.
+    with get_db_cm() as sess, sess.begin(), sess.no_autoflush:
 
         for tenant_data in iam_config.get("tenants", []):
             tenant_name = tenant_data.get("name")
@@ -807,53 +1257,32 @@ def main():
                 logger.warning("Skipping tenant with no name.")
                 continue
 
-            logger.info(f"--- Processing tenant: {tenant_name} ---")
+            logger.info("--- Processing tenant: %s ---", tenant_name)
             upsert_tenant(sess, tenant_data)
 
             # Agents
-            for agent_data in tenant_data.get("agents", []):
-                upsert_agent(sess, agent_data, tenant_name)
-                agent_id = agent_data.get("name") or agent_data.get("agent_id")
-
-                # Applications (for first agent of first tenant, as in original script)
-                if initial_services and agent_id:
-                    for service in initial_services.get("default", []):
-                        if "staticInput" in service and "url" in service["staticInput"]:
-                            url_data = service["staticInput"]["url"]
-                            host_id, base_url, _ = generate_host_id(url_data)
-                            app_data = {
-                                "app_name": host_id,
-                                "app_note": base_url
-                            }
-                            upsert_application(sess, url_data, tenant_name)
+            agent_ids = bulk_upsert_agents(sess, tenant_data.get("agents", []), tenant_name)
+
+            # Applications (once per tenant that has agents, as in original script)
+            if any(agent_ids):
+                bulk_upsert_applications(sess, service_apps, tenant_name)
 
             # Users
-            for user_data in tenant_data.get("users", []):
-                upsert_user(sess, user_data, tenant_name)
+            bulk_upsert_users(sess, tenant_data.get("users", []), tenant_name)
 
             # Service Secrets (for first agent of first tenant, as in original script)
             if tenant_data.get("agents"):
                 first_agent_id = tenant_data["agents"][0].get("name") or tenant_data["agents"][0].get("agent_id")
-                if initial_services and first_agent_id:
-                    service_url_map = {
-                        service['name']: service['staticInput']['url']
-                        for service in initial_services.get("default", [])
-                        if 'staticInput' in service and 'url' in service['staticInput']
-                    }
-                    for secret_info in app_key_list:
-                        service_name = secret_info.get("service_name")
-                        if not service_name or service_name not in service_url_map:
-                            continue
-                        url_data = service_url_map[service_name]
-                        host_id, _, _ = generate_host_id(url_data)
-                        upsert_app_key(sess, secret_info, host_id, first_agent_id, tenant_name)
+                if first_agent_id:
+                    bulk_upsert_app_keys(sess, [
+                        {"app_name": host_id, "agent_id": first_agent_id, "secrets": secrets}
+                        for host_id, secrets in service_secrets
+                    ], tenant_name)
 
             # Auth Providers (for each tenant)
-            for provider in auth_providers_data:
-                upsert_auth_provider(sess, provider, tenant_name)
+            bulk_upsert_auth_providers(sess, auth_providers_data, tenant_name)
 
-            sess.commit()
-            logger.info(f"--- Finished processing tenant: {tenant_name} ---\n")
+            logger.info("--- Finished processing tenant: %s ---\n", tenant_name)
 
 if __name__ == "__main__":
     main()
@@ -2,7 +2,7 @@
 import json
 import logging
 from sqlalchemy import Column, Text, ForeignKey, Boolean, DateTime, Index, text, Integer, String, BigInteger, ARRAY
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import UUID, JSONB, BYTEA
 from pgvector.sqlalchemy import Vector
 from sqlalchemy.orm import relationship, Session, backref
 from sqlalchemy.sql import func
@@ -104,6 +104,15 @@ class Role(Base):
     )
 
 
+class EmbeddingCache(Base):
+    """Embeddings keyed by a hash of (embedding model, input text), so re-seeding unchanged
+    roles does not call the embedding model again."""
+    __tablename__ = "emb_cache"
+    hash = Column(BYTEA, primary_key=True)
+    emb = Column(Vector(1536), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class RoleUser(Base):
     __tablename__ = "role_user"
     role_name = Column(String, nullable=False, primary_key=True)
@@ -123,6 +132,8 @@ class RoleUser(Base):
             ondelete="CASCADE",
             name='role_user_username_tenant_name_fkey'
         ),
+        # Reverse lookups and FK cascades by the non-leading key columns
+        Index('idx_role_user_username_tenant', 'username', 'tenant_name'),
     )
 
 class RoleAgent(Base):
@@ -144,6 +155,8 @@ class RoleAgent(Base):
             ondelete="CASCADE",
             name='role_agent_agent_id_tenant_name_fkey'
         ),
+        # Reverse lookups and FK cascades by the non-leading key columns
+        Index('idx_role_agent_agent_id_tenant', 'agent_id', 'tenant_name'),
     )
 
 
@@ -173,6 +186,8 @@ class UserAgent(Base):
             ondelete="CASCADE",
             name='user_agent_agent_id_tenant_name_fkey'
         ),
+        # Reverse lookups and FK cascades by the non-leading key columns
+        Index('idx_user_agent_agent_id_tenant', 'agent_id', 'tenant_name'),
     )
 
 
@@ -267,6 +282,9 @@ class ProviderToken(Base):
         ),
         # Index for faster lookups on tenant_name and provider_id if not covered by FK
         Index('idx_pt_tenant_provider', 'tenant_name', 'provider_id'),
+        # uq_provider_agent_tenant already indexes the exact-key lookups; these back the list filters
+        Index('idx_pt_username', 'username'),
+        Index('idx_pt_agent_id', 'agent_id'),
     )
 
     def __repr__(self):
@@ -1,10 +1,61 @@
-import requests
+import httpx
+import importlib.util
 import json
+import orjson
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from integrator.iam.iam_config import load_iam_config
 from integrator.utils.logger import get_logger
 
 
 logger = get_logger(__name__)
+
+# Read/write timeout for every admin call, with fail-fast connect and pool acquisition, so a
+# slow or unreachable Keycloak fails the call instead of hanging the init or an API request.
+_HTTP_TIMEOUT = httpx.Timeout(30.0, connect=3.05, pool=3.05)
+# One pooled client for all Keycloak admin calls, built on first use: connections (and TLS
+# handshakes) are reused, and when the optional h2 package is installed (httpx[http2]) concurrent
+# calls over TLS multiplex on one HTTP/2 connection; without it the client speaks HTTP/1.1.
+# Retries cover failed connection attempts only, so non-idempotent create POSTs are never replayed.
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _client():
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                http2 = importlib.util.find_spec("h2") is not None
+                _CLIENT = httpx.Client(
+                    http2=http2,
+                    timeout=_HTTP_TIMEOUT,
+                    transport=httpx.HTTPTransport(
+                        http2=http2,
+                        retries=3,
+                        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+                    ),
+                )
+    return _CLIENT
+
+
+def _json_headers(headers):
+    """Request headers for a body that is already serialized with orjson."""
+    return {**headers, "Content-Type": "application/json"}
+
+# Concurrency for the bulk create_* helpers; stays within the client's connection limit.
+_KC_WORKERS = 16
+
+
+def _run_parallel(fn, items):
+    """Apply fn to every item on a thread pool; admin calls are I/O-bound and independent."""
+    items = list(items)
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(_KC_WORKERS, len(items))) as ex:
+        return list(ex.map(fn, items))
 KC_CONFIG={
     "KEYCLOAK_BASE": os.getenv("IAM_URL", "http://localhost:8888"),
     "ADMIN_REALM": "master",
@@ -50,24 +101,73 @@ KC_CONFIG={
       }
 
 }
-def get_admin_token(kc_config=KC_CONFIG):
+# Attribute names accepted by create_user / create_client, resolved once for the default config
+_USER_KEYS = frozenset(KC_CONFIG["USER_ATTRIBUTES"])
+_CLIENT_KEYS = frozenset(KC_CONFIG["CLIENT_ATTRIBUTES"])
 
-    """Get admin access token."""
-    token_url = f'{kc_config["KEYCLOAK_BASE"]}/realms/{kc_config["ADMIN_REALM"]}/protocol/openid-connect/token'
-    logger.info(" get admin token from token url: {token_url}")
+# Admin tokens cached per (Keycloak base, realm, client, admin user), so a changed
+# KEYCLOAK_BASE / ADMIN_USERNAME never reuses another server's token.
+_TOKEN_CACHE = {}
+_TOKEN_LOCK = threading.Lock()
+# Refresh this many seconds before expiry so a token never expires mid-request.
+_TOKEN_EXPIRY_MARGIN = 60
 
-    token_data = {
-        "grant_type": "password",
-        "client_id": kc_config["ADMIN_CLIENT_ID"],
-        "username": kc_config["ADMIN_USERNAME"],
-        "password": kc_config["ADMIN_PASSWORD"],
-    }
-    token_resp = requests.post(token_url, data=token_data)
+
+def _token_cache_key(kc_config):
+    return (kc_config["KEYCLOAK_BASE"], kc_config["ADMIN_REALM"], kc_config["ADMIN_CLIENT_ID"], kc_config["ADMIN_USERNAME"])
+
+
+def _request_admin_token(token_url, token_data):
+    """POST to the token endpoint and return the token response with absolute expiry times."""
+    token_resp = _client().post(token_url, data=token_data, timeout=_HTTP_TIMEOUT)
     token_resp.raise_for_status()
+    token = orjson.loads(token_resp.content)
+    now = time.time()
+    return {
+        "access_token": token["access_token"],
+        "refresh_token": token.get("refresh_token"),
+        "exp": now + token.get("expires_in", 0),
+        "refresh_exp": now + token.get("refresh_expires_in", 0),
+    }
+
+
+def _refresh_admin_token(token_url, kc_config, cached):
+    """Exchange the cached refresh token for a new access token; None if that is not possible."""
+    if not cached.get("refresh_token") or time.time() >= cached["refresh_exp"] - _TOKEN_EXPIRY_MARGIN:
+        return None
+    try:
+        return _request_admin_token(token_url, {
+            "grant_type": "refresh_token",
+            "client_id": kc_config["ADMIN_CLIENT_ID"],
+            "refresh_token": cached["refresh_token"],
+        })
+    except httpx.HTTPError as e:
+        logger.info(f"Refreshing admin token failed, re-authenticating: {e}")
+        return None
 
-    access_token=token_resp.json()["access_token"]
-    logger.info(f" received admin access token. access_token: {access_token} ")
-    return access_token
+
+def get_admin_token(kc_config=KC_CONFIG):
+
+    """Get admin access token, reusing a cached one until it is about to expire."""
+    key = _token_cache_key(kc_config)
+    with _TOKEN_LOCK:
+        cached = _TOKEN_CACHE.get(key)
+        if cached and time.time() < cached["exp"] - _TOKEN_EXPIRY_MARGIN:
+            return cached["access_token"]
+
+        token_url = f'{kc_config["KEYCLOAK_BASE"]}/realms/{kc_config["ADMIN_REALM"]}/protocol/openid-connect/token'
+        token = _refresh_admin_token(token_url, kc_config, cached) if cached else None
+        if token is None:
+            logger.info(f" get admin token from token url: {token_url}")
+            token = _request_admin_token(token_url, {
+                "grant_type": "password",
+                "client_id": kc_config["ADMIN_CLIENT_ID"],
+                "username": kc_config["ADMIN_USERNAME"],
+                "password": kc_config["ADMIN_PASSWORD"],
+            })
+        _TOKEN_CACHE[key] = token
+        logger.info(" received admin access token.")
+        return token["access_token"]
 
 
 def disable_keycloak_ssl(realm, headers,  kc_config=KC_CONFIG):
@@ -81,14 +181,14 @@ def disable_keycloak_ssl(realm, headers,  kc_config=KC_CONFIG):
         }
 
         print(f"Updating realm '{kc_config['ADMIN_REALM']}' settings...")
-        update_res = requests.put(admin_url, json=payload, headers=headers)
+        update_res = _client().put(admin_url, content=orjson.dumps(payload), headers=_json_headers(headers), timeout=_HTTP_TIMEOUT)
         update_res.raise_for_status()
 
         print("Success! HTTPS requirement has been disabled for the master realm.")
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"Error: {e}")
-        if e.response is not None:
+        if isinstance(e, httpx.HTTPStatusError):
             print(f"Response Body: {e.response.text}")
 
 
@@ -97,11 +197,15 @@ def create_realm(headers, tenant_name, kc_config=KC_CONFIG):
     """Create a new realm."""
     realm_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms'
     
-    # Use configurable attributes from KC_CONFIG
-    realm_data = kc_config["REALM_ATTRIBUTES"].copy()
-    realm_data["realm"] = tenant_name  # Override with the specific tenant name
-    
-    realm_resp = requests.post(realm_url, json=realm_data, headers=headers)
+    # Re-runs are the common case: check existence cheaply before sending the realm payload
+    exists_resp = _client().get(f'{realm_url}/{tenant_name}', headers=headers, timeout=_HTTP_TIMEOUT)
+    if exists_resp.status_code == 200:
+        logger.info(f"Realm '{tenant_name}' already exists.")
+        return False
+
+    # Use configurable attributes from KC_CONFIG, overriding with the specific tenant name
+    realm_data = kc_config["REALM_ATTRIBUTES"] | {"realm": tenant_name}
+    realm_resp = _client().post(realm_url, content=orjson.dumps(realm_data), headers=_json_headers(headers), timeout=_HTTP_TIMEOUT)
     if realm_resp.status_code == 201:
         logger.info(f"Realm '{tenant_name}' created.")
         return True
@@ -112,11 +216,14 @@ def create_realm(headers, tenant_name, kc_config=KC_CONFIG):
         logger.info(f"Error creating realm '{tenant_name}': {realm_resp.text}")
         return False
 
-def create_client_scope( headers, tenant_name, scope, kc_config=KC_CONFIG):
+def create_client_scope( headers, tenant_name, scope, kc_config=KC_CONFIG, scope_index=None):
     
-    """Create scope in a realm."""
+    """Create scope in a realm. scope_index ({name: id}) lets callers skip scopes that already exist."""
+    if scope_index is not None and scope["name"] in scope_index:
+        logger.info(f"Scope '{scope['name']}' already exists in realm '{tenant_name}'.")
+        return
     scopes_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/client-scopes'
-    scope_resp = requests.post(scopes_url, json=scope, headers=headers)
+    scope_resp = _client().post(scopes_url, content=orjson.dumps(scope), headers=_json_headers(headers), timeout=_HTTP_TIMEOUT)
     if scope_resp.status_code == 201:
         logger.info(f"Scope '{scope['name']}' created in realm '{tenant_name}'.")
     elif scope_resp.status_code == 409:
@@ -125,34 +232,35 @@ def create_client_scope( headers, tenant_name, scope, kc_config=KC_CONFIG):
         logger.error(f"Error creating scope '{scope['name']}': {scope_resp.text}")
 
 
-def assign_scope_to_client( headers, tenant_name, client_name, scope_json, kc_config=KC_CONFIG) -> None:
-
+def get_realm_scope_index(headers, tenant_name, kc_config=KC_CONFIG):
+    """Return {scope name: scope id} for all client scopes of a realm, in one request."""
+    scopes_url = f"{kc_config['KEYCLOAK_BASE']}/admin/realms/{tenant_name}/client-scopes"
+    scopes_raw = _client().get( scopes_url,headers=headers, timeout=_HTTP_TIMEOUT)
+    scopes_raw.raise_for_status()
+    return {s.get("name"): s["id"] for s in orjson.loads(scopes_raw.content)}
 
 
+def assign_scope_to_client( headers, tenant_name, client_name, scope_json, kc_config=KC_CONFIG, scope_index=None) -> None:
+    """
+    scope_index: optional {name: id} from get_realm_scope_index, so callers assigning many
+    scopes fetch the realm's scope list once instead of once per assignment.
+    """
 
     # Get clients (agents) using new approach
     clients_url = f"{kc_config['KEYCLOAK_BASE']}/admin/realms/{tenant_name}/clients"
     params={"name": client_name}
 
-    clients_response = requests.get(clients_url, headers=headers, params=params)
+    clients_response = _client().get(clients_url, headers=headers, params=params, timeout=_HTTP_TIMEOUT)
     clients_response.raise_for_status()
 
-    clients = clients_response.json()
+    clients = orjson.loads(clients_response.content)
     if not clients:
         raise ValueError(f"Client not found by clientId: {client_name}")
     client_id=clients[0]["id"]
 
-
-    scopes_url = f"{kc_config['KEYCLOAK_BASE']}/admin/realms/{tenant_name}/client-scopes"
-
-    scopes_raw = requests.get( scopes_url,headers=headers)
-    scopes_raw.raise_for_status()
-    scopes = scopes_raw.json()
-    scope_id=None
-    for s in scopes:
-        if s.get("name") == scope_json.get("name"):
-            scope_id=s["id"]
-            break 
+    if scope_index is None:
+        scope_index = get_realm_scope_index(headers, tenant_name, kc_config)
+    scope_id = scope_index.get(scope_json.get("name"))
     if not scope_id:
         logger.error(f"Error: scope name={scope_json.get('name')} is not found") 
         return
@@ -169,22 +277,48 @@ def assign_scope_to_client( headers, tenant_name, client_name, scope_json, kc_co
     else:
         assign_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/clients/{client_id}/optional-client-scopes/{scope_id}'
 
-    res = requests.put(assign_url, headers=headers)
+    res = _client().put(assign_url, headers=headers, timeout=_HTTP_TIMEOUT)
     # 204 No Content on success
     res.raise_for_status()
 
 
 
+def partial_import(headers, tenant_name, resources, kc_config=KC_CONFIG):
+    """
+    Create users, clients and/or roles in one request via the realm's partialImport endpoint.
+    Existing objects are skipped, like the 409 handling of the per-object create_* calls.
+    Returns False when the import could not be done, so callers can fall back to those calls.
+    """
+    import_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/partialImport'
+    payload = {"ifResourceExists": "SKIP", **resources}
+    try:
+        import_resp = _client().post(import_url, content=orjson.dumps(payload), headers=_json_headers(headers), timeout=_HTTP_TIMEOUT)
+    except httpx.HTTPError as e:
+        logger.warning(f"Partial import into realm '{tenant_name}' failed: {e}")
+        return False
+    if import_resp.status_code != 200:
+        logger.warning(f"Partial import into realm '{tenant_name}' failed: Status {import_resp.status_code}, Response: {import_resp.text}")
+        return False
+    result = orjson.loads(import_resp.content)
+    logger.info(f"Partial import into realm '{tenant_name}': {result.get('added', 0)} added, {result.get('skipped', 0)} skipped.")
+    return True
+
+
+def _role_representation(role):
+    return {"name": role["name"], "description": role.get("description", "")}
+
+
 def create_realm_roles(headers, tenant_name, roles, kc_config=KC_CONFIG):
     """Create roles in a realm."""
-    for role in roles:
-        create_realm_role(headers, tenant_name, role, kc_config)
+    if not roles or partial_import(headers, tenant_name, {"roles": {"realm": [_role_representation(r) for r in roles]}}, kc_config):
+        return
+    _run_parallel(lambda role: create_realm_role(headers, tenant_name, role, kc_config), roles)
 
 def create_realm_role( headers, tenant_name, role, kc_config=KC_CONFIG):
     """Create roles in a realm."""
     roles_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/roles'
-    role_data = {"name": role["name"], "description": role.get("description", "")}
-    role_resp = requests.post(roles_url, json=role_data, headers=headers)
+    role_data = _role_representation(role)
+    role_resp = _client().post(roles_url, content=orjson.dumps(role_data), headers=_json_headers(headers), timeout=_HTTP_TIMEOUT)
     if role_resp.status_code == 201:
         logger.info(f"Role '{role['name']}' created in realm '{tenant_name}'.")
     elif role_resp.status_code == 409:
@@ -193,22 +327,24 @@ def create_realm_role( headers, tenant_name, role, kc_config=KC_CONFIG):
         logger.error(f"Error creating role '{role['name']}': {role_resp.text}")
 
 
+def _user_representation(user, kc_config=KC_CONFIG):
+    # Keep only the attributes Keycloak's user representation accepts
+    user_keys = _USER_KEYS if kc_config is KC_CONFIG else kc_config["USER_ATTRIBUTES"].keys()
+    return {key: user[key] for key in user_keys & user.keys()}
+
+
 def create_users(headers, tenant_name, users, kc_config=KC_CONFIG):
     """Create users in a realm."""
-    for user in users:
-        create_user(kc_config, headers, tenant_name, user)
+    if not users or partial_import(headers, tenant_name, {"users": [_user_representation(u, kc_config) for u in users]}, kc_config):
+        return
+    _run_parallel(lambda user: create_user(headers, tenant_name, user, kc_config), users)
 
 def create_user(headers, tenant_name, user, kc_config=KC_CONFIG):
     """Create users in a realm."""
     users_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/users'
-    
-    # Start with default attributes from KC_CONFIG
-    user_keys = kc_config["USER_ATTRIBUTES"].keys()
-    
-
-    filtered_user = {key: value for key, value in user.items() if key in user_keys}
+    filtered_user = _user_representation(user, kc_config)
  
-    user_resp = requests.post(users_url, json=filtered_user, headers=headers)
+    user_resp = _client().post(users_url, content=orjson.dumps(filtered_user), headers=_json_headers(headers), timeout=_HTTP_TIMEOUT)
     if user_resp.status_code == 201:
         logger.info(f"User '{filtered_user['username']}' created in realm '{tenant_name}'.")
     elif user_resp.status_code == 409:
@@ -229,9 +365,9 @@ def get_realm(headers, realm_name, kc_config=KC_CONFIG):
     realm_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{realm_name}'
     
     try:
-        realm_resp = requests.get(realm_url, headers=headers)
+        realm_resp = _client().get(realm_url, headers=headers, timeout=_HTTP_TIMEOUT)
         if realm_resp.status_code == 200:
-            realm_data = realm_resp.json()
+            realm_data = orjson.loads(realm_resp.content)
             
             # Filter to only return attributes defined in KC_CONFIG
             filtered_realm = filter_realm(realm_data, kc_config)
@@ -244,7 +380,7 @@ def get_realm(headers, realm_name, kc_config=KC_CONFIG):
         else:
             logger.error(f"Error retrieving realm '{realm_name}': {realm_resp.text}")
             return None
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Request error while retrieving realm '{realm_name}': {e}")
         return None
 
@@ -255,10 +391,10 @@ def get_user(headers, tenant_name, username, kc_config=KC_CONFIG):
     try:
         # Search for user by username
         search_params = {"username": username, "exact": "true"}
-        users_resp = requests.get(users_url, headers=headers, params=search_params)
+        users_resp = _client().get(users_url, headers=headers, params=search_params, timeout=_HTTP_TIMEOUT)
         
         if users_resp.status_code == 200:
-            users_data = users_resp.json()
+            users_data = orjson.loads(users_resp.content)
             if users_data:
                 user_data = users_data[0]  # Get first match
                 
@@ -275,7 +411,7 @@ def get_user(headers, tenant_name, username, kc_config=KC_CONFIG):
         else:
             logger.error(f"Error retrieving user '{username}': {users_resp.text}")
             return None
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Request error while retrieving user '{username}': {e}")
         return None
 
@@ -286,16 +422,16 @@ def delete_user(headers, tenant_name, username, kc_config=KC_CONFIG):
     try:
         # First, search for user by username to get the user ID
         search_params = {"username": username, "exact": "true"}
-        users_resp = requests.get(users_url, headers=headers, params=search_params)
+        users_resp = _client().get(users_url, headers=headers, params=search_params, timeout=_HTTP_TIMEOUT)
         
         if users_resp.status_code == 200:
-            users_data = users_resp.json()
+            users_data = orjson.loads(users_resp.content)
             if users_data:
                 user_id = users_data[0]["id"]  # Get the internal user ID
                 
                 # Delete the user using the user ID
                 delete_url = f'{users_url}/{user_id}'
-                delete_resp = requests.delete(delete_url, headers=headers)
+                delete_resp = _client().delete(delete_url, headers=headers, timeout=_HTTP_TIMEOUT)
                 
                 if delete_resp.status_code == 204:
                     logger.info(f"User '{username}' deleted successfully from realm '{tenant_name}'.")
@@ -309,7 +445,7 @@ def delete_user(headers, tenant_name, username, kc_config=KC_CONFIG):
         else:
             logger.error(f"Error retrieving user '{username}' for deletion: {users_resp.text}")
             return False
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Request error while deleting user '{username}': {e}")
         return False
 
@@ -320,10 +456,10 @@ def get_client( headers, tenant_name, client_id, kc_config=KC_CONFIG):
     try:
         # Search for client by clientId
         search_params = {"clientId": client_id}
-        clients_resp = requests.get(clients_url, headers=headers, params=search_params)
+        clients_resp = _client().get(clients_url, headers=headers, params=search_params, timeout=_HTTP_TIMEOUT)
         
         if clients_resp.status_code == 200:
-            clients_data = clients_resp.json()
+            clients_data = orjson.loads(clients_resp.content)
             if clients_data:
                 client_data = clients_data[0]  # Get first match
                 
@@ -340,31 +476,33 @@ def get_client( headers, tenant_name, client_id, kc_config=KC_CONFIG):
         else:
             logger.error(f"Error retrieving agent '{client_id}': {clients_resp.text}")
             return None
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Request error while retrieving agent '{client_id}': {e}")
         return None
 
 def create_clients( headers, tenant_name, clients, kc_config=KC_CONFIG):
-    for client in clients:
-        create_client(kc_config, headers, tenant_name, client)
-
-def create_client( headers, tenant_name, client, kc_config=KC_CONFIG):
-    """Create clients (agents) in a realm."""
-    clients_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/clients'
-    
-    # Start with default attributes from KC_CONFIG
-    client_data = kc_config["CLIENT_ATTRIBUTES"].copy()
-    
-    # Override with provided agent values, only for keys that exist in CLIENT_ATTRIBUTES
-    for key in client_data.keys():
-        if key in client:
-            client_data[key] = client[key]
+    if not clients or partial_import(headers, tenant_name, {"clients": [_client_representation(c, kc_config) for c in clients]}, kc_config):
+        return
+    _run_parallel(lambda client: create_client(headers, tenant_name, client, kc_config), clients)
+
+def _client_representation(client, kc_config=KC_CONFIG):
+    # Start with default attributes from KC_CONFIG, overridden by the provided agent values
+    # for keys that exist in CLIENT_ATTRIBUTES
+    defaults = kc_config["CLIENT_ATTRIBUTES"]
+    client_keys = _CLIENT_KEYS if kc_config is KC_CONFIG else defaults.keys()
+    client_data = defaults | {key: client[key] for key in client_keys & client.keys()}
     
     # Special handling for clientId - use name or agent_id as fallback
     if not client_data["clientId"]:
         client_data["clientId"] = client.get("name") or client.get("agent_id", "")
+    return client_data
+
+def create_client( headers, tenant_name, client, kc_config=KC_CONFIG):
+    """Create clients (agents) in a realm."""
+    clients_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/clients'
+    client_data = _client_representation(client, kc_config)
     
-    client_resp = requests.post(clients_url, json=client_data, headers=headers)
+    client_resp = _client().post(clients_url, content=orjson.dumps(client_data), headers=_json_headers(headers), timeout=_HTTP_TIMEOUT)
     if client_resp.status_code == 201:
         logger.info(f"Agent (client) '{client_data['clientId']}' created in realm '{tenant_name}'.")
     elif client_resp.status_code == 409:
@@ -373,15 +511,23 @@ def create_client( headers, tenant_name, client, kc_config=KC_CONFIG):
         logger.error(f"Error creating agent '{client_data['clientId']}': {client_resp.text}")
 def create_client_mapper( headers, tenant_name, client_id, mapper_json, kc_config=KC_CONFIG):
     """Create client mapper"""
+    create_client_mappers(headers, tenant_name, client_id, [mapper_json], kc_config)
+
+
+def create_client_mappers( headers, tenant_name, client_id, mapper_list, kc_config=KC_CONFIG):
+    """
+    Create client mappers, looking up the client UUID only once. Existing mappers are not
+    listed up front: Keycloak rejects a duplicate mapper name with 409, handled per mapper.
+    """
     
     # First, get the internal client UUID using the clientId
     clients_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/clients'
     search_params = {"clientId": client_id}
     
     try:
-        clients_resp = requests.get(clients_url, headers=headers, params=search_params)
+        clients_resp = _client().get(clients_url, headers=headers, params=search_params, timeout=_HTTP_TIMEOUT)
         clients_resp.raise_for_status()
-        clients_data = clients_resp.json()
+        clients_data = orjson.loads(clients_resp.content)
         
         if not clients_data:
             logger.error(f"Client '{client_id}' not found in realm '{tenant_name}'.")
@@ -391,45 +537,35 @@ def create_client_mapper( headers, tenant_name, client_id, mapper_json, kc_confi
         client_uuid = clients_data[0]["id"]
         logger.info(f"Found client '{client_id}' with UUID '{client_uuid}' in realm '{tenant_name}'.")
         
-        # Check if mapper already exists for this specific client
+    except httpx.HTTPError as e:
+        logger.error(f"Request error while creating mappers for client '{client_id}': {e}")
+        return
+
+    mapper_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/clients/{client_uuid}/protocol-mappers/models'
+    seen_names = set()
+    for mapper_json in mapper_list:
         mapper_name = mapper_json.get("name")
-        get_mappers_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/clients/{client_uuid}/protocol-mappers/models'
-        
-        existing_mappers_resp = requests.get(get_mappers_url, headers=headers)
-        if existing_mappers_resp.status_code == 200:
-            existing_mappers = existing_mappers_resp.json()
-            logger.info(f"Client '{client_id}' has {len(existing_mappers)} existing mappers.")
-            
-            # Check if a mapper with the same name already exists for this client
-            for existing_mapper in existing_mappers:
-                if existing_mapper.get("name") == mapper_name:
-                    logger.info(f"Mapper '{mapper_name}' already exists for client '{client_id}' (UUID: {client_uuid}) in realm '{tenant_name}'.")
-                    return
-        
-        # Now use the UUID in the mapper URL to create the mapper
-        mapper_url = f'{kc_config["KEYCLOAK_BASE"]}/admin/realms/{tenant_name}/clients/{client_uuid}/protocol-mappers/models'
-        
-        logger.info(f"Creating mapper '{mapper_name}' for client '{client_id}' (UUID: {client_uuid})...")
-        mapper_resp = requests.post(mapper_url, json=mapper_json, headers=headers)
-        if mapper_resp.status_code == 201:
-            logger.info(f"✓ Mapper '{mapper_name}' for client '{client_id}' created successfully in realm '{tenant_name}'.")
-        elif mapper_resp.status_code == 409:
-            logger.warning(f"Mapper '{mapper_name}' for client '{client_id}' already exists (409 from Keycloak).")
-        else:
-            logger.error(f"Error creating mapper '{mapper_name}' for client '{client_id}': Status {mapper_resp.status_code}, Response: {mapper_resp.text}")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request error while creating mapper for client '{client_id}': {e}")
+        if mapper_name in seen_names:
+            continue
+        seen_names.add(mapper_name)
+        try:
+            logger.info(f"Creating mapper '{mapper_name}' for client '{client_id}' (UUID: {client_uuid})...")
+            mapper_resp = _client().post(mapper_url, content=orjson.dumps(mapper_json), headers=_json_headers(headers), timeout=_HTTP_TIMEOUT)
+            if mapper_resp.status_code == 201:
+                logger.info(f"✓ Mapper '{mapper_name}' for client '{client_id}' created successfully in realm '{tenant_name}'.")
+            elif mapper_resp.status_code == 409:
+                logger.info(f"Mapper '{mapper_name}' already exists for client '{client_id}' (UUID: {client_uuid}) in realm '{tenant_name}'.")
+            else:
+                logger.error(f"Error creating mapper '{mapper_name}' for client '{client_id}': Status {mapper_resp.status_code}, Response: {mapper_resp.text}")
+        except httpx.HTTPError as e:
+            logger.error(f"Request error while creating mapper for client '{client_id}': {e}")
 
 
 def main():
     import os
     """Main function to initialize Keycloak from a JSON file."""
     try:
-
-        config_path = os.path.join(os.path.dirname(__file__), '../../..', 'init', 'init_iam.json')
-
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        config = load_iam_config()
     except FileNotFoundError:
         print("Error: 'init/init_iam.json' not found.")
         return
@@ -455,15 +591,24 @@ def main():
                 print("Realm created. Please run the script again to process roles, users, and agents.")
                 continue
             
+            # Roles, users and agents in one partial import; per-object creates as fallback
+            resources = {}
             if "roles" in tenant:
-                create_realm_roles(headers, tenant_name, tenant["roles"])
+                resources["roles"] = {"realm": [_role_representation(r) for r in tenant["roles"]]}
             if "users" in tenant:
-                create_users(headers, tenant_name, tenant["users"])
+                resources["users"] = [_user_representation(u) for u in tenant["users"]]
             if "agents" in tenant:
-                create_clients(headers, tenant_name, tenant["agents"])
+                resources["clients"] = [_client_representation(a) for a in tenant["agents"]]
+            if resources and not partial_import(headers, tenant_name, resources):
+                if "roles" in tenant:
+                    create_realm_roles(headers, tenant_name, tenant["roles"])
+                if "users" in tenant:
+                    create_users(headers, tenant_name, tenant["users"])
+                if "agents" in tenant:
+                    create_clients(headers, tenant_name, tenant["agents"])
             print(f"--- Finished processing tenant: {tenant_name} ---\n")
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"An error occurred: {e}")
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ from integrator.utils.db import get_db
 
 # === backend/main.py ===
 from fastapi import APIRouter, Depends,  HTTPException, Request, Path as PathParam
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 import os
 from pydantic import BaseModel, Field, ValidationError
@@ -20,8 +21,8 @@ from integrator.tools.tool_db_model import AppKey, Application
 from integrator.utils.oauth import validate_token
 from integrator.utils.crypto_utils import decrypt
 
-from integrator.iam.iam_db_crud import get_agents_by_username
-from integrator.iam.iam_auth import validate_agent_id, validate_tenant
+from integrator.iam.iam_db_crud import get_agents_by_username, get_role_names_by_agent_ids, get_role_names_by_usernames
+from integrator.iam.iam_auth import validate_agent_id, validate_tenant, invalidate_auth_cache
 
 from integrator.iam.iam_db_model import RoleAgent
 from integrator.domains.domain_db_model import Domain, Capability, DomainCapability
@@ -111,6 +112,8 @@ class AuthProviderInfo(BaseModel):
     class Config:
         from_attributes = True
 
+_AUTH_PROVIDER_INFO_FIELDS = tuple(AuthProviderInfo.model_fields)
+
 class AuthProviderDetails(BaseModel):
     provider_id: str
     provider_name: str
@@ -124,7 +127,7 @@ class AuthProviderDetails(BaseModel):
     class Config:
         from_attributes = True
 
-user_router = APIRouter(prefix="/users", tags=["users"])
+user_router = APIRouter(prefix="/users", tags=["users"], default_response_class=ORJSONResponse)
 
 # === New API Models ===
 class AgentInfo(BaseModel):
@@ -138,6 +141,17 @@ class AgentInfo(BaseModel):
     class Config:
         from_attributes = True
 
+def _agent_info(agent_id, name, roles, tenant_name=None, role=None, context=None) -> dict:
+    """AgentInfo as a plain dict, so list endpoints serialize with orjson without per-item validation."""
+    return {
+        "agent_id": agent_id,
+        "name": name,
+        "tenant_name": tenant_name,
+        "roles": roles,
+        "role": role,
+        "context": context,
+    }
+
 class UserInfo(BaseModel):
     username: str
     email: Optional[str] = None
@@ -215,7 +229,11 @@ class AuthProviderUpdatePayload(BaseModel):
     options: Optional[Dict[str, Any]] = None
 
 
-@user_router.get("/tenants/{tenant_name}/agents", response_model=List[AgentInfo])
+@user_router.get(
+    "/tenants/{tenant_name}/agents",
+    response_model=None,
+    responses={200: {"model": List[AgentInfo]}},
+)
 def get_all_agents_api(
     tenant_name: str,
     skip: int = 0,
@@ -228,8 +246,6 @@ def get_all_agents_api(
     Requires authentication via access token.
     """
     from integrator.iam.iam_db_crud import get_all_agents
-    from integrator.iam.iam_db_model import RoleAgent
-    from sqlalchemy import func
     
     # Verify tenant exists
     tenant_obj = db.query(Tenant).filter(Tenant.name == tenant_name).first()
@@ -239,26 +255,17 @@ def get_all_agents_api(
     # Get agents using the CRUD function
     agents = get_all_agents(db, tenant_name, skip=skip, limit=limit)
     
-    # Enrich with roles information
-    agent_infos = []
-    for agent in agents:
-        # Get roles for this agent
-        roles_query = db.query(RoleAgent.role_name).filter(
-            (RoleAgent.agent_id == agent.agent_id) &
-            (RoleAgent.tenant_name == tenant_name)
-        ).all()
-        roles = [role.role_name for role in roles_query]
-        
-        agent_info = AgentInfo(
-            agent_id=agent.agent_id,
-            name=agent.name,
-            roles=roles
-        )
-        agent_infos.append(agent_info)
+    # Enrich with roles information, fetched for the whole page in one query
+    roles_by_agent = get_role_names_by_agent_ids(db, (agent.agent_id for agent in agents), tenant_name)
+    agent_infos = [_agent_info(agent.agent_id, agent.name, roles_by_agent[agent.agent_id]) for agent in agents]
     
-    return agent_infos
+    return ORJSONResponse(content=agent_infos)
 
-@user_router.get("/tenants/{tenant_name}/users", response_model=List[UserInfo])
+@user_router.get(
+    "/tenants/{tenant_name}/users",
+    response_model=None,
+    responses={200: {"model": List[UserInfo]}},
+)
 def get_all_users_api(
     tenant_name: str,
     skip: int = 0,
@@ -271,7 +278,6 @@ def get_all_users_api(
     Requires authentication via access token.
     """
     from integrator.iam.iam_db_crud import get_all_users
-    from integrator.iam.iam_db_model import RoleUser
     
     # Verify tenant exists
     tenant_obj = db.query(Tenant).filter(Tenant.name == tenant_name).first()
@@ -281,26 +287,20 @@ def get_all_users_api(
     # Get users using the CRUD function
     users = get_all_users(db, tenant_name, skip=skip, limit=limit)
     
-    # Enrich with roles information
-    user_infos = []
-    for user_obj in users:
-        # Get roles for this user
-        roles_query = db.query(RoleUser.role_name).filter(
-            (RoleUser.username == user_obj.username) &
-            (RoleUser.tenant_name == tenant_name)
-        ).all()
-        roles = [role.role_name for role in roles_query]
-        
-        user_info = UserInfo(
-            username=user_obj.username,
-            email=user_obj.email,
-            roles=roles
-        )
-        user_infos.append(user_info)
+    # Enrich with roles information, fetched for the whole page in one query
+    roles_by_user = get_role_names_by_usernames(db, (user_obj.username for user_obj in users), tenant_name)
+    user_infos = [
+        {"username": user_obj.username, "email": user_obj.email, "roles": roles_by_user[user_obj.username]}
+        for user_obj in users
+    ]
     
-    return user_infos
+    return ORJSONResponse(content=user_infos)
 
-@user_router.get("/tenants/{tenant_name}/users/{username}/agents", response_model=List[AgentInfo])
+@user_router.get(
+    "/tenants/{tenant_name}/users/{username}/agents",
+    response_model=None,
+    responses={200: {"model": List[AgentInfo]}},
+)
 def get_agents_by_username_api(
     tenant_name: str,
     username: str,
@@ -321,29 +321,24 @@ def get_agents_by_username_api(
     agents = get_agents_by_username(db, username, tenant_name)
     
     if not agents:
-        return []
+        return ORJSONResponse(content=[])
     
-    # Enrich with roles information from role_agent table
+    # Enrich with roles information from role_agent table, for all agents in one query
+    roles_by_agent = get_role_names_by_agent_ids(db, (agent_dict["agent_id"] for agent_dict in agents), tenant_name)
     agent_infos = []
     for agent_dict in agents:
-        # Get roles for this agent from role_agent table
-        roles_query = db.query(RoleAgent.role_name).filter(
-            (RoleAgent.agent_id == agent_dict["agent_id"]) &
-            (RoleAgent.tenant_name == tenant_name)
-        ).all()
-        roles = [role.role_name for role in roles_query]
+        roles = roles_by_agent[agent_dict["agent_id"]]
         
-        agent_info = AgentInfo(
-            agent_id=agent_dict["agent_id"],
-            name=agent_dict["name"],
+        agent_infos.append(_agent_info(
+            agent_dict["agent_id"],
+            agent_dict["name"],
+            roles,
             tenant_name=agent_dict["tenant_name"],
-            roles=roles,
             role=agent_dict.get("role"),  # Role from user_agent relationship
             context=agent_dict.get("context")  # Context from user_agent relationship
-        )
-        agent_infos.append(agent_info)
+        ))
     
-    return agent_infos
+    return ORJSONResponse(content=agent_infos)
 
 @user_router.get("/tenants/{tenant_name}/roles", response_model=List[RoleInfo])
 def get_all_roles(
@@ -578,15 +573,11 @@ def get_login_user_agents(user=Depends(validate_token), db: Session = Depends(ge
     if not agents:
         raise HTTPException(status_code=404, detail="agents not found")
 
-    # Enrich with roles information from role_agent table
+    # Enrich with roles information from role_agent table, for all agents in one query
+    roles_by_agent = get_role_names_by_agent_ids(db, (agent_dict["agent_id"] for agent_dict in agents), tenant_name)
     agent_infos = []
     for agent_dict in agents:
-        # Get roles for this agent from role_agent table
-        roles_query = db.query(RoleAgent.role_name).filter(
-            (RoleAgent.agent_id == agent_dict["agent_id"]) &
-            (RoleAgent.tenant_name == tenant_name)
-        ).all()
-        roles = [role.role_name for role in roles_query]
+        roles = roles_by_agent[agent_dict["agent_id"]]
         
         agent_info = AgentInfo(
             agent_id=agent_dict["agent_id"],
@@ -700,21 +691,23 @@ async def delete_app_key(
     return
 
 
-@user_router.get("/agents/{agent_id}/tenants/{tenant_name}/app_keys", response_model=Dict[str, Dict[str, Any]])
+@user_router.get(
+    "/agents/{agent_id}/tenants/{tenant_name}/app_keys",
+    response_model=None,
+    responses={200: {"model": Dict[str, Dict[str, Any]]}},
+)
 def get_app_keys(
     agent_id: str,
     tenant_name: str,
     user: dict = Depends(validate_token),
     db: Session = Depends(get_db)
 ):
-    secrets_query = db.query(AppKey).filter(
+    secrets_query = db.query(AppKey.app_name, AppKey.secrets).filter(
         AppKey.agent_id == agent_id,
         AppKey.tenant_name == tenant_name,
     ).all()
 
-    secrets_dict = {secret.app_name: secret.secrets for secret in secrets_query}
-    
-    return secrets_dict
+    return ORJSONResponse(content={app_name: secrets for app_name, secrets in secrets_query})
 @user_router.get("/agents/{agent_id}/tenants/{tenant_name}/app_keys/{app_name}", response_model=Dict[str, Dict[str, Any]])
 def get_app_key(
     agent_id: str,
@@ -740,7 +733,11 @@ class ApplicationInfo(BaseModel):
     class Config:
         from_attributes = True
 
-@user_router.get("/tenants/{tenant_name}/applications", response_model=List[ApplicationInfo])
+@user_router.get(
+    "/tenants/{tenant_name}/applications",
+    response_model=None,
+    responses={200: {"model": List[ApplicationInfo]}},
+)
 def get_all_applications(
     tenant_name: str,
     user: dict = Depends(validate_token),
@@ -756,13 +753,17 @@ def get_all_applications(
     
     # Note: Application table doesn't have tenant_name field, so we return all applications
     # This may need to be updated if applications should be tenant-specific
-    applications = db.query(Application).all()
-    return [ApplicationInfo.from_orm(app) for app in applications]
+    applications = db.query(Application.app_name, Application.app_note).all()
+    return ORJSONResponse(content=[{"app_name": app_name, "app_note": app_note} for app_name, app_note in applications])
 
 
 
 
-@user_router.get("/tenants/{tenant_name}/auth_providers", response_model=List[AuthProviderInfo])
+@user_router.get(
+    "/tenants/{tenant_name}/auth_providers",
+    response_model=None,
+    responses={200: {"model": List[AuthProviderInfo]}},
+)
 def get_auth_providers(
     tenant_name: str,
     db: Session = Depends(get_db),
@@ -774,22 +775,12 @@ def get_auth_providers(
     # Basic validation to ensure the user is associated with the tenant could be added here
     # For simplicity, this example assumes any authenticated user can query providers for any tenant.
     
-    providers_db = db.query(AuthProvider).filter(AuthProvider.tenant_name == tenant_name).all()
-    
-    if not providers_db:
-        # It's not an error if a tenant has no providers, so return an empty list.
-        return []
-
-    providers_info = []
-    for config in providers_db:
-        # The sample Typescript code shows decrypting a secret.
-        # However, the secret is not part of the response model, so we don't need to decrypt it here.
-        # If the response model were to include sensitive info, decryption would be necessary.
-        
-        provider_info = AuthProviderInfo.from_orm(config)
-        providers_info.append(provider_info)
+    # Select only the AuthProviderInfo columns; the encrypted secret is never part of the response
+    providers = db.query(*(getattr(AuthProvider, f) for f in _AUTH_PROVIDER_INFO_FIELDS)).filter(
+        AuthProvider.tenant_name == tenant_name
+    ).all()
 
-    return providers_info
+    return ORJSONResponse(content=[dict(zip(_AUTH_PROVIDER_INFO_FIELDS, row)) for row in providers])
 
 
 @user_router.get("/tenants/{tenant_name}/auth_providers_with_secrets", response_model=List[AuthProviderDetails])
@@ -1267,6 +1258,7 @@ def create_agent_by_user(
         
         # Commit the user-agent relationship
         db.commit()
+        invalidate_auth_cache(tenant_name, username=username)
         
         # Retrieve the created agent
         created_agent = db.query(Agent).filter(
@@ -1429,6 +1421,7 @@ def delete_agent_by_user(
         
         # Commit all changes
         db.commit()
+        invalidate_auth_cache(tenant_name, username=username, agent_id=agent_id)
         
         logger.info(f"Agent '{agent_id}' and all related data deleted successfully by user '{username}'")
         
@@ -1644,6 +1637,7 @@ def delete_user_endpoint(
         
         # Commit all changes
         db.commit()
+        invalidate_auth_cache(tenant_name, username=username)
         
         logger.info(f"User '{username}' and all related data deleted successfully")
         
@@ -1773,6 +1767,7 @@ def upsert_user_to_agent(
         UserAgent.username == payload.username,
         UserAgent.agent_id == agent_id
     ).first()
+    invalidate_auth_cache(user_agent_rel.tenant_name, username=payload.username)
     
     return UserAgentInfo.from_orm(user_agent_rel)
 
@@ -1826,6 +1821,7 @@ def remove_user_from_agent(
     # Delete the relationship using CRUD function
     delete_user_agent(db, username, agent_id)
     db.commit()
+    invalidate_auth_cache(user_agent_rel.tenant_name, username=username)
     
     return
 
@@ -1,7 +1,8 @@
 import logging
 import uuid, json
 from datetime import datetime, timezone
-from sqlalchemy import select, text
+from sqlalchemy import select, text, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.sql import bindparam
 from integrator.tools.tool_db_model import  AppKey, Application, McpTool, ToolSkill, StagingService, CapabilityTool, Skill, CapabilitySkill, ToolRel
 from integrator.domains.domain_llm import normalize_tool
@@ -68,8 +69,12 @@ def get_app_by_app_name_and_tenant_name(sess, app_name: str, tenant_name: str) -
         raise
 
     
-def upsert_application(sess, app_data, tenant_name, tool_id = None, old_tool_url = None):
-
+def _application_values(app_data, tenant_name) -> Optional[Dict[str, Any]]:
+    """
+    Map an application entry (a tool URL dict or an {app_name, app_note} dict) to its
+    Application column values. Shared by upsert_application and bulk_upsert_applications.
+    Returns None when no app_name can be derived.
+    """
     if app_data.get("protocol"):
         app_name, _, _ = generate_host_id(app_data)
         tool_url=app_data
@@ -77,11 +82,23 @@ def upsert_application(sess, app_data, tenant_name, tool_id = None, old_tool_url
         app_name=app_data.get("app_name")
         tool_url=app_data.get("app_note") 
     else:
-        tool_url=app_data       
+        app_name=None
 
     if not app_name:
+        return None
+    # Convert tool_url dict to JSON string for TEXT column
+    app_note_text = json.dumps(tool_url) if isinstance(tool_url, dict) else tool_url
+    return {"app_name": app_name, "tenant_name": tenant_name, "app_note": app_note_text}
+
+
+def upsert_application(sess, app_data, tenant_name, tool_id = None, old_tool_url = None):
+
+    values = _application_values(app_data, tenant_name)
+    if not values:
         logger.warning("Skipping application with no app_name.")
         return
+    app_name = values["app_name"]
+    app_note_text = values["app_note"]
     application = sess.execute(
         select(Application).where(
             Application.app_name == app_name,
@@ -90,9 +107,6 @@ def upsert_application(sess, app_data, tenant_name, tool_id = None, old_tool_url
     ).scalar_one_or_none()
     now = datetime.now(timezone.utc)
     
-    # Convert tool_url dict to JSON string for TEXT column
-    app_note_text = json.dumps(tool_url) if isinstance(tool_url, dict) else tool_url
-    
     if not application:
         application = Application(
             app_name=app_name,
@@ -147,6 +161,73 @@ def upsert_app_key(sess, secret_data, app_name, agent_id, tenant_name):
         logger.info(f"Updated service secret for app: {app_name}")
 
 
+def bulk_upsert_applications(sess, apps_data, tenant_name) -> List[str]:
+    """
+    Upsert many applications of one tenant with a single INSERT ... ON CONFLICT DO UPDATE.
+    Same column semantics as upsert_application (without the tool links); entries that map
+    to the same app_name collapse to the last one.
+    
+    Args:
+        sess: SQLAlchemy session
+        apps_data: Application entries (tool URL dicts or {app_name, app_note} dicts)
+        tenant_name: Tenant name for isolation
+    
+    Returns:
+        List[str]: app_names that were upserted
+    """
+    rows = {}
+    for app_data in apps_data:
+        values = _application_values(app_data, tenant_name)
+        if not values:
+            logger.warning("Skipping application with no app_name.")
+            continue
+        rows[values["app_name"]] = values
+    if not rows:
+        return []
+    sess.flush()  # Core statement below; pending ORM rows must exist first
+    stmt = pg_insert(Application).values(list(rows.values()))
+    sess.execute(stmt.on_conflict_do_update(
+        index_elements=[Application.app_name, Application.tenant_name],
+        set_={"app_note": stmt.excluded.app_note, "updated_at": func.now()},
+    ))
+    logger.info("Upserted %d applications, tenant: %s", len(rows), tenant_name)
+    return list(rows)
+
+
+def bulk_upsert_app_keys(sess, app_keys, tenant_name) -> int:
+    """
+    Upsert many service secrets of one tenant with a single INSERT ... ON CONFLICT DO UPDATE.
+    Same semantics as upsert_app_key; repeated (app_name, agent_id) pairs keep the last secrets.
+    
+    Args:
+        sess: SQLAlchemy session
+        app_keys: Dicts with app_name, agent_id and secrets
+        tenant_name: Tenant name for isolation
+    
+    Returns:
+        int: Number of app keys upserted
+    """
+    rows = {
+        (k["app_name"], k["agent_id"]): {
+            "app_name": k["app_name"],
+            "agent_id": k["agent_id"],
+            "tenant_name": tenant_name,
+            "secrets": k["secrets"],
+        }
+        for k in app_keys
+    }
+    if not rows:
+        return 0
+    sess.flush()
+    stmt = pg_insert(AppKey).values(list(rows.values()))
+    sess.execute(stmt.on_conflict_do_update(
+        index_elements=[AppKey.app_name, AppKey.agent_id, AppKey.tenant_name],
+        set_={"secrets": stmt.excluded.secrets, "updated_at": func.now()},
+    ))
+    logger.info("Upserted %d service secrets, tenant: %s", len(rows), tenant_name)
+    return len(rows)
+
+
 
 def get_mcp_tool_by_id(sess, tool_id: str) -> Optional[McpTool]:
     """
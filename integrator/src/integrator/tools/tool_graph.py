@@ -17,6 +17,7 @@ Environment variables (or edit constants below):
 """
 
 import json
+import orjson
 import os
 from dataclasses import dataclass, asdict
 from collections import defaultdict
@@ -596,8 +597,8 @@ def sync_domains_and_capabilities_from_db_to_graph(gsess, llm, tenant_name) -> N
                 #if not all_candidates:
                 #   continue
 
-                        # CandidatePath is a dataclass; convert to plain dicts for JSON serialization
-                        print(json.dumps([asdict(c) for c in candidates]))
+                        # CandidatePath is a dataclass; orjson serializes it directly, without asdict copies
+                        print(orjson.dumps(candidates).decode())
 
                         skills = extract_skills_from_tools(llm, candidates)
                         print(skills)
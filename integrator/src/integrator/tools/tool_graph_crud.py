@@ -14,12 +14,12 @@ from __future__ import annotations
 
 from typing import Any, Mapping, Union, List, Dict
 import json
+import orjson
 
 from integrator.tools.tool_db_model import McpTool, Skill, CapabilitySkill, ToolSkill, ToolRel
 from integrator.utils.logger import get_logger
 from integrator.tools.tool_graph_model import ToolEdge, CandidatePath
 from collections import defaultdict
-from dataclasses import asdict
 from neo4j.exceptions import ServiceUnavailable, Neo4jError
 
 
@@ -899,8 +899,8 @@ def correlate_tools(gsess, sess,llm, emb, tenant_name, domain_name, cap_name, to
     for start_c_idx in range(0, len(candidates), candidate_batch_size):
         batch_candidates = candidates[start_c_idx : start_c_idx + candidate_batch_size]
 
-        # CandidatePath is a dataclass; convert to plain dicts for JSON serialization
-        print(json.dumps([asdict(c) for c in batch_candidates]))
+        # CandidatePath is a dataclass; orjson serializes it directly, without asdict copies
+        print(orjson.dumps(batch_candidates).decode())
 
         skills = extract_skills_from_tools(llm, batch_candidates)
         print(skills)
@@ -1,5 +1,5 @@
 from typing import Dict, Any, Optional, List
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Header
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 import os
@@ -219,17 +219,19 @@ async def get_mcp_tools_for_agent_endpoint(
 async def get_all_mcp_tools_admin_endpoint(
     tool_query: Optional[str] = Query(None, description="Tool description query for vector search"),
     k: int = Query(10, description="Number of results to return for vector search", ge=1, le=100),
+    x_tenant: str = Header(..., alias="X-Tenant"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(validate_token)
 ):
     """
     Admin endpoint that gets all MCP tools across all agents.
-    This endpoint is intended for administrative use.
+    This endpoint is intended for administrative use; the caller must be an administrator
+    of the tenant given in the X-Tenant header, whose realm the token was validated against.
     """
     try:
         logger.info(f"Admin MCP tools request from user {current_user.get('preferred_username', 'unknown')}")
         response_data = []
-        is_admin=is_admin_user(db, current_user)
+        is_admin=is_admin_user(db, current_user, x_tenant)
         if not is_admin: 
             return response_data
         
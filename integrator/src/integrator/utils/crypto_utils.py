@@ -23,6 +23,9 @@ else:
     # but this should be handled robustly in a real application.
     # For example, by preventing the application from starting.
 
+# The cipher only depends on the key, so build it once instead of per encrypt/decrypt call.
+_AESGCM = AESGCM(SECRET_KEY_BYTES) if SECRET_KEY_BYTES is not None else None
+
 
 def encrypt(text: str) -> dict:
     """
@@ -34,10 +37,9 @@ def encrypt(text: str) -> dict:
         raise EnvironmentError("Encryption cannot proceed: SECRET_KEY is not configured properly.")
 
     iv = os.urandom(12)  # AES-GCM standard IV size is 12 bytes (96 bits)
-    aesgcm = AESGCM(SECRET_KEY_BYTES)
     text_bytes = text.encode('utf-8')
 
-    encrypted_bytes_with_tag = aesgcm.encrypt(iv, text_bytes, None) # No associated data (AAD)
+    encrypted_bytes_with_tag = _AESGCM.encrypt(iv, text_bytes, None) # No associated data (AAD)
 
     return {
         "encryptedData": encrypted_bytes_with_tag.hex(),
@@ -61,10 +63,8 @@ def decrypt(encrypted_hex: str, iv_hex: str) -> str:
         raise ValueError(f"Invalid hex string for IV or encrypted data: {e}")
 
 
-    aesgcm = AESGCM(SECRET_KEY_BYTES)
-
     try:
-        decrypted_bytes = aesgcm.decrypt(iv, encrypted_bytes_with_tag, None) # No AAD
+        decrypted_bytes = _AESGCM.decrypt(iv, encrypted_bytes_with_tag, None) # No AAD
         return decrypted_bytes.decode('utf-8')
     except InvalidTag:
         raise ValueError("Decryption failed: Invalid authentication tag. Data may be tampered or key/IV incorrect.")
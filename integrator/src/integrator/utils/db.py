@@ -1,5 +1,7 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker
 import os
 
 from integrator.utils.env import load_env
@@ -13,13 +15,64 @@ load_env()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Pool settings shared by the sync and async engines. LIFO checkout keeps a few hot
+# connections busy under bursty load and lets the rest idle out; connections are recycled
+# after 30 minutes instead of being pre-pinged (one SELECT 1 round trip) on every checkout,
+# and ReconnectingSession re-runs a first statement that hits a connection dropped meanwhile.
+POOL_OPTIONS = dict(
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
+    pool_use_lifo=True,
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    pool_pre_ping=False,
+)
+
+# values_plus_batch: psycopg2 sends executemany INSERTs as multi-row VALUES and batches
+# executemany UPDATE/DELETE, instead of one round trip per parameter set.
+engine = create_engine(DATABASE_URL, executemany_mode="values_plus_batch", **POOL_OPTIONS)
+
+
+class ReconnectingSession(Session):
+    """Session that retries the first statement of a transaction once on a dropped connection.
+
+    Without pre-ping, a pooled connection the server closed while it sat idle fails on its
+    first statement. SQLAlchemy then invalidates it (and every older pooled connection), so
+    the statement is re-run once on a fresh connection. Only a clean session's first statement
+    is retried: nothing has run in the transaction yet, so the retry cannot replay or lose work.
+    """
+
+    def _retry_on_disconnect(self, method, *args, **kw):
+        fresh = not self.in_transaction() and self._is_clean()
+        try:
+            return method(*args, **kw)
+        except OperationalError as e:
+            if not (fresh and e.connection_invalidated):
+                raise
+            self.rollback()
+            return method(*args, **kw)
+
+    def execute(self, *args, **kw):
+        return self._retry_on_disconnect(super().execute, *args, **kw)
+
+    def scalar(self, *args, **kw):
+        return self._retry_on_disconnect(super().scalar, *args, **kw)
+
+    def scalars(self, *args, **kw):
+        return self._retry_on_disconnect(super().scalars, *args, **kw)
+
+
+SessionLocal = sessionmaker(class_=ReconnectingSession, autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
+    except OperationalError as e:
+        # A connection dropped after the first statement cannot be retried transparently; it is
+        # already invalidated, so just release the session's transaction before propagating.
+        if e.connection_invalidated:
+            db.rollback()
+        raise
     finally:
         db.close()
 
@@ -28,6 +81,46 @@ from contextlib import contextmanager
 
 get_db_cm = contextmanager(get_db)
 
+# Async engine on the same database via asyncpg, for `async def` endpoints that must not
+# block the event loop on DB I/O. Created on first use, so sync scripts and tools that only
+# import this module need neither asyncpg nor greenlet.
+_async_session_factory = None
+
+
+def AsyncSessionLocal():
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+        async_engine = create_async_engine(make_url(DATABASE_URL).set(drivername="postgresql+asyncpg"), **POOL_OPTIONS)
+        _async_session_factory = async_sessionmaker(
+            async_engine, class_=AsyncSession, sync_session_class=ReconnectingSession,
+            expire_on_commit=False, autoflush=False,
+        )
+    return _async_session_factory()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except OperationalError as e:
+            if e.connection_invalidated:
+                await db.rollback()
+            raise
+
+async def transactional_db():
+    """Async session scoped to one unit of work: commits once the endpoint returns, rolls back
+    on SQLAlchemyError. Endpoints using it do not commit or roll back themselves; other
+    exceptions (e.g. HTTPException) leave the transaction uncommitted and it is discarded on
+    close. Unhandled database errors are turned into a 500 by the app-level handler."""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except SQLAlchemyError:
+            await db.rollback()
+            raise
+
 import os # Added for environment variables
 from sqlalchemy.engine.url import URL as SQLAlchemyURL # For constructing DB URL
 
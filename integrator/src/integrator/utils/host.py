@@ -1,4 +1,5 @@
 
+from functools import lru_cache
 from urllib.parse import urlparse, urlunparse
 
 def parse_url_to_structure(url_string):
@@ -102,11 +103,13 @@ def generate_host_id(url):
 
     return host_id, base_url, path_with_query
 
+@lru_cache(maxsize=2048)
 def generate_host_id_from_url(url_string):
     """
     Convenience function to generate host_id, base_url, and path directly from a URL string.
     
     This function combines parse_url_to_structure and generate_host_id into a single call.
+    Results are memoized per URL string; the returned tuple is immutable.
     
     Args:
         url_string (str): A URL string like "http://www.localhost:9000/path1/path2?obj=1"
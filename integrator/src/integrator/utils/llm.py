@@ -193,7 +193,8 @@ class Embedder:
         else:    
             response = self.model.embed_documents(texts)
 
-        return np.array(response, dtype=float)
+        # float32 matches pgvector's storage type so vectors can be bound as-is
+        return np.asarray(response, dtype=np.float32)
 
 
 
@@ -0,0 +1,20 @@
+"""Shared helpers for the integrator test scripts."""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+@contextmanager
+def count_queries(sess):
+    """Count statements executed on the session's connection while the block runs."""
+    statements = []
+    conn = sess.connection()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(conn, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(conn, "before_cursor_execute", before_cursor_execute)
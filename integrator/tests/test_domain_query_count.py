@@ -0,0 +1,36 @@
+"""Test script asserting the domain read helpers issue a bounded number of SQL queries."""
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sqlalchemy import select
+
+from integrator.domains.domain_service_apis import get_user_capabilities
+from integrator.iam.iam_db_model import User
+from integrator.utils.db import get_db_cm
+
+from conftest import count_queries
+
+
+def test_user_capabilities_query_count():
+    """get_user_capabilities must load capabilities without lazy loads."""
+    print("\n=== Testing get_user_capabilities() query count ===")
+
+    with get_db_cm() as sess:
+        user = sess.execute(select(User).limit(1)).scalar_one_or_none()
+
+        if not user:
+            print("No users found in the database. Skipping query count test.")
+            return
+
+        with count_queries(sess) as statements:
+            capabilities = get_user_capabilities(sess, user.username)
+
+        print(f"Loaded {len(capabilities)} capabilities with {len(statements)} queries")
+        assert len(statements) <= 2
+
+
+if __name__ == "__main__":
+    test_user_capabilities_query_count()
@@ -12,6 +12,8 @@ import logging
 from integrator.utils.db import get_db_cm
 from integrator.iam.iam_db_crud import get_roles_with_domains_and_tool_counts
 
+from conftest import count_queries
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -96,6 +98,20 @@ def test_agent_specific_roles(agent_id: str):
             raise
 
 
+def test_roles_single_query():
+    """Roles, their domains and all tool counts must come back in a single SQL statement."""
+    logger.info("\n" + "=" * 80)
+    logger.info("TEST 3: Query count for get_roles_with_domains_and_tool_counts")
+    logger.info("=" * 80)
+
+    with get_db_cm() as sess:
+        with count_queries(sess) as statements:
+            roles = get_roles_with_domains_and_tool_counts(sess, agent_id=None)
+
+        logger.info(f"Loaded {len(roles)} roles with {len(statements)} queries")
+        assert len(statements) == 1
+
+
 def get_sample_agent_id():
     """Get a sample agent_id from the database for testing."""
     from integrator.iam.iam_db_crud import get_all_agents
@@ -117,6 +133,9 @@ def main():
         # Test 1: Get all roles
         all_roles = test_all_roles()
         
+        # Test 3: Everything is loaded with one query
+        test_roles_single_query()
+        
         # Test 2: Get roles for a specific agent
         sample_agent_id = get_sample_agent_id()
         if sample_agent_id:
@@ -377,16 +377,35 @@ def test_get_provider_tokens_list():
 
     # --- Test Case 3: Get tokens with no specific user/agent identifier (general list for tenant/provider) ---
     print(f"\n--- List Tokens Case 3: General list for TENANT: {tenant_name}, PROVIDER: {TEST_PROVIDER_ID} ---")
+    # The list is paged (100 tokens by default): follow the cursor until the last page
+    general_tokens = []
     params_general = {"tenant_name": tenant_name, "provider_id": TEST_PROVIDER_ID}
-    response_general = requests.get(PROVIDER_TOKENS_API_URL, headers=headers, params=params_general)
-    print(f"General List Response: {response_general.status_code}, {response_general.text}")
-    assert response_general.status_code == 200
-    general_tokens = response_general.json()
-    assert isinstance(general_tokens, list)
+    while True:
+        response_general = requests.get(PROVIDER_TOKENS_API_URL, headers=headers, params=params_general)
+        print(f"General List Response: {response_general.status_code}, {response_general.text}")
+        assert response_general.status_code == 200
+        page = response_general.json()
+        assert isinstance(page, list)
+        assert len(page) <= 100
+        general_tokens.extend(page)
+        if len(page) < 100:
+            break
+        params_general = {**params_general, "cursor": page[-1]["id"]}
     # Check if our setup token is in the general list
     assert any(t["agent_id"] == agent_id_from_login and t["username"] == username_for_list_test for t in general_tokens)
     print(f"✅ Received {len(general_tokens)} tokens for tenant/provider.")
 
+    # --- Test Case 3b: limit caps both a page and a stream ---
+    params_limited = {"tenant_name": tenant_name, "provider_id": TEST_PROVIDER_ID, "limit": 1}
+    response_page = requests.get(PROVIDER_TOKENS_API_URL, headers=headers, params=params_limited)
+    assert response_page.status_code == 200
+    assert len(response_page.json()) == 1
+    response_stream = requests.get(PROVIDER_TOKENS_API_URL, headers=headers, params={**params_limited, "stream": "true"})
+    assert response_stream.status_code == 200
+    streamed = [json.loads(line) for line in response_stream.text.splitlines() if line]
+    assert [t["id"] for t in streamed] == [t["id"] for t in response_page.json()]
+    print(f"✅ limit=1 returned one token as a page and as a stream.")
+
     # --- Test Case 4: Get tokens for a non-existent agent_id (should return empty list) ---
     print(f"\n--- List Tokens Case 4: Get for non-existent agent_id ---")
     params_non_existent = {"agent_id": "agent_does_not_exist_456", "tenant_name": tenant_name}
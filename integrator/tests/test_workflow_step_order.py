@@ -0,0 +1,57 @@
+"""Test script for workflow step ordering with non-numeric step_order values."""
+
+import sys
+import os
+import uuid
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from integrator.utils.db import get_db_cm
+from integrator.iam.iam_db_model import Tenant
+from integrator.domains.domain_db_model import Workflow, WorkflowStep
+from integrator.domains.domain_db_crud import (
+    get_all_workflow_steps_grouped_by_workflow,
+    get_workflows_with_tool_count,
+)
+
+
+def test_non_numeric_step_order():
+    """Numeric orders sort numerically; a non-numeric order sorts last instead of failing."""
+
+    tenant_name = f"step-order-test-{uuid.uuid4().hex[:8]}"
+    workflow_name = "step_order_workflow"
+
+    with get_db_cm() as sess:
+        try:
+            sess.add(Tenant(name=tenant_name, description="step_order test tenant"))
+            sess.flush()
+            sess.add(Workflow(name=workflow_name, tenant_name=tenant_name, label="Step order workflow"))
+            for name, order in [("wrap_up", "final"), ("second", "2"), ("tenth", "10"), ("first", "1")]:
+                sess.add(WorkflowStep(
+                    name=name,
+                    tenant_name=tenant_name,
+                    label=name,
+                    step_order=order,
+                    workflow_name=workflow_name,
+                ))
+            sess.flush()
+
+            grouped = get_all_workflow_steps_grouped_by_workflow(sess, tenant_name)
+            orders = [step["step_order"] for step in grouped[workflow_name]]
+            print(f"Grouped step orders: {orders}")
+            assert orders == ["1", "2", "10", "final"], orders
+
+            workflows = get_workflows_with_tool_count(sess, tenant_name)
+            workflow = next(w for w in workflows["workflows"] if w["name"] == workflow_name)
+            orders = [step["step_order"] for step in workflow["workflow_steps"]]
+            print(f"Workflow step orders: {orders}")
+            assert orders == ["1", "2", "10", "final"], orders
+        finally:
+            sess.rollback()
+
+    print("✓ Non-numeric step_order sorts last")
+
+
+if __name__ == "__main__":
+    test_non_numeric_step_order()